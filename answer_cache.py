@@ -0,0 +1,111 @@
+import re, threading, time
+from collections import OrderedDict
+import numpy as np
+
+# ---------------------------
+# Semantic answer cache
+# ---------------------------
+def normalize_question(question):
+    question = re.sub(r"\s+", " ", question.strip().lower())
+    return question.rstrip("?!. ")
+
+
+class AnswerCache:
+    """
+    LRU/TTL cache of final answers keyed by the normalized question, the query
+    parameters and a corpus version. Near-duplicate questions (cosine similarity
+    of their embeddings >= `threshold`) with the same parameters also hit.
+    `invalidate()` must be called whenever the corpus changes.
+    """
+
+    def __init__(self, embeddings=None, max_entries=256, ttl=3600, threshold=0.95):
+        self.embeddings = embeddings
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.threshold = threshold
+        self.version = 0
+        self.entries = OrderedDict()   # key -> (answer, unit vector or None, created)
+        self.recent_vectors = OrderedDict()
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def _key(self, question, params):
+        return (normalize_question(question), tuple(sorted(params.items())), self.version)
+
+    def _vector(self, question):
+        if self.embeddings is None:
+            return None
+        text = normalize_question(question)
+        # get() on a miss is followed by put() for the same question; embed it only once
+        with self.lock:
+            vector = self.recent_vectors.get(text)
+        if vector is not None:
+            return vector
+        vector = np.asarray(self.embeddings.embed_query(text), dtype="float32")
+        norm = np.linalg.norm(vector)
+        vector = vector / norm if norm else vector
+        with self.lock:
+            self.recent_vectors[text] = vector
+            while len(self.recent_vectors) > 64:
+                self.recent_vectors.popitem(last=False)
+        return vector
+
+    def _expired(self, created):
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def get(self, question, **params):
+        key = self._key(question, params)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and not self._expired(entry[2]):
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+        vector = self._vector(question)
+        if vector is not None:
+            with self.lock:
+                best_key, best_score = None, self.threshold
+                for other_key, (_, other_vector, created) in self.entries.items():
+                    if other_key[1:] != key[1:] or other_vector is None or self._expired(created):
+                        continue
+                    score = float(np.dot(vector, other_vector))
+                    if score >= best_score:
+                        best_key, best_score = other_key, score
+                if best_key is not None:
+                    self.entries.move_to_end(best_key)
+                    self.near_hits += 1
+                    return self.entries[best_key][0]
+
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def put(self, question, answer, version, **params):
+        """Stores `answer` unless the corpus changed since `version` was read."""
+        vector = self._vector(question)
+        with self.lock:
+            if version != self.version:
+                return
+            key = self._key(question, params)
+            self.entries[key] = (answer, vector, time.time())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self):
+        """Drops every entry and bumps the corpus version so in-flight answers are discarded."""
+        with self.lock:
+            self.entries.clear()
+            self.version += 1
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "near_hits": self.near_hits,
+            "misses": self.misses,
+            "entries": len(self.entries),
+            "version": self.version,
+        }
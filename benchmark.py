@@ -0,0 +1,445 @@
+import argparse, asyncio, hashlib, json, os, platform, random, re, sys, tempfile, threading, time, types
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+# ---------------------------
+# Benchmark harness
+# ---------------------------
+# python benchmark.py --sizes 100 1000 10000 --llm-latency 0.2 --output bench.json
+#
+# Runs the real pipeline (rag_engine, via graph_rag_app_streamlit) against
+# deterministic stand-ins: hash-seeded embeddings, a fake chat LLM with
+# configurable latency, and either an in-memory Neo4j stand-in (round trips
+# cost --db-latency seconds, rows are counted) or a real Neo4j started with
+# testcontainers (--neo4j testcontainer).
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+VOCAB = ("graph retrieval vector index query node edge document chunk entity relation "
+         "embedding model answer context traversal database cluster schema").split()
+ENTITIES = [f"Entity{i}" for i in range(5000)]
+
+
+# ---------------------------
+# Stand-ins
+# ---------------------------
+class FakeEmbeddings(Embeddings):
+    """Deterministic unit vectors seeded by a hash of the text."""
+
+    def __init__(self, size=64):
+        self.size = size
+        self.model = f"fake-embeddings-{size}"
+
+    def embed_query(self, text):
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+        vector = np.random.default_rng(seed).standard_normal(self.size).astype("float32")
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+
+class FakeMessage:
+    def __init__(self, content):
+        self.content = content
+
+
+class FakeLLM:
+    """Chat-model stand-in: extraction prompts get triples built from the entity names in the text."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.model_name = f"fake-llm-{latency}"
+
+    def _reply(self, messages):
+        prompt = messages[-1]["content"]
+        if "subject, relation, object" in prompt:
+            names = [w.strip('".,') for w in prompt.split() if w.startswith("Entity")]
+            triples = [{"subject": a, "relation": "related to", "object": b} for a, b in zip(names, names[1:])]
+            return json.dumps(triples)
+        return "This is a synthetic answer built from the provided context."
+
+    def invoke(self, messages):
+        time.sleep(self.latency)
+        return FakeMessage(self._reply(messages))
+
+    async def ainvoke(self, messages):
+        await asyncio.sleep(self.latency)
+        return FakeMessage(self._reply(messages))
+
+    def stream(self, messages):
+        time.sleep(self.latency)
+        for word in self._reply(messages).split(" "):
+            yield FakeMessage(word + " ")
+
+
+class FakeRecord(dict):
+    def data(self):
+        return dict(self)
+
+
+class FakeResult:
+    def __init__(self, records=()):
+        self.records = [FakeRecord(record) for record in records]
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def single(self):
+        return self.records[0] if self.records else {"names": [], "deleted": 0}
+
+    def consume(self):
+        return None
+
+
+class FakeTx:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def run(self, query, parameters=None, **params):
+        return self.driver.run(query, dict(parameters or {}, **params))
+
+
+class FakeSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, parameters=None, **params):
+        return self.driver.run(query, dict(parameters or {}, **params))
+
+    def execute_write(self, fn, *args, **kwargs):
+        return fn(FakeTx(self.driver), *args, **kwargs)
+
+    execute_read = execute_write
+
+
+class FakeGraph:
+    """
+    Documents, chunks, entities and MENTIONS kept from the chunk and triple writes,
+    so the full-text seed lookup, the hop-by-hop expansion, the document lookup
+    and the hot-entity query return what a real graph would.
+    """
+
+    def __init__(self):
+        self.doc_of_chunk = {}    # chunk id -> document name
+        self.mentions = {}        # entity name -> {chunk ids}
+        self.neighbours = {}      # entity name -> {entity names}
+
+    def write(self, query, rows):
+        if "MERGE (d:Document" in query:
+            for row in rows:
+                self.doc_of_chunk[row["chunk_id"]] = row["doc_name"]
+        elif "[:MENTIONS]->(s)" in query:
+            for row in rows:
+                subj, obj = row["subj"], row["obj"]
+                self.neighbours.setdefault(subj, set()).add(obj)
+                self.neighbours.setdefault(obj, set()).add(subj)
+                for name in (subj, obj):
+                    self.mentions.setdefault(name, set())
+                    # The chunk is MATCHed, not merged: unknown chunk ids get no MENTIONS
+                    if row["chunk_id"] in self.doc_of_chunk:
+                        self.mentions[name].add(row["chunk_id"])
+
+    def fulltext(self, search, limit):
+        terms = set(re.findall(r'"((?:[^"\\]|\\.)*)"', search))
+        return [{"name": name} for name in sorted(self.mentions) if terms & set(name.lower().split())][:limit]
+
+    def expand(self, frontier, fanout):
+        return {name: sorted(self.neighbours.get(name, ()))[:fanout] for name in frontier}
+
+    def documents(self, names, limit):
+        found = {}
+        for name in names:
+            for chunk_id in sorted(self.mentions.get(name, ())):
+                doc = self.doc_of_chunk.get(chunk_id)
+                if doc is not None:
+                    entities = found.setdefault(doc, [])
+                    if name not in entities:
+                        entities.append(name)
+        return [{"doc_name": doc, "related_entities": names} for doc, names in list(found.items())[:limit]]
+
+    def top_entities(self, limit):
+        ranked = sorted(self.mentions, key=lambda name: (-len(self.mentions[name]), name))[:limit]
+        return [{"name": name, "mentions": len(self.mentions[name]), "degree": len(self.neighbours.get(name, ()))}
+                for name in ranked]
+
+    def read(self, query, params):
+        if "db.index.fulltext.queryNodes" in query:
+            return self.fulltext(params["search"], params["limit"])
+        if "AS neighbours" in query:
+            return [{"name": name, "neighbours": names}
+                    for name, names in self.expand(params["frontier"], params["fanout"]).items()]
+        if "AS names" in query and "frontier" in params:
+            expanded = self.expand(params["frontier"], params["fanout"])
+            return [{"names": list(dict.fromkeys(n for names in expanded.values() for n in names))}]
+        if "AS doc_name" in query:
+            return self.documents(params["names"], params["limit"])
+        if "AS mentions" in query:
+            return self.top_entities(params["limit"])
+        return []
+
+
+class FakeDriver:
+    """
+    In-memory Neo4j stand-in: every round trip costs `latency` seconds, written
+    rows are counted and kept in a FakeGraph that answers the graph retrievers'
+    reads. Vector index queries return nothing, so main() only runs the neo4j_*
+    retrievers with --neo4j testcontainer.
+    """
+
+    def __init__(self, latency=0.0005):
+        self.latency = latency
+        self.round_trips = 0
+        self.rows = 0
+        self.graph = FakeGraph()
+        self.lock = threading.Lock()
+
+    def session(self, **kwargs):
+        return FakeSession(self)
+
+    def run(self, query, params):
+        time.sleep(self.latency)
+        with self.lock:
+            self.round_trips += 1
+            rows = params.get("rows", [])
+            self.rows += len(rows) or 1
+            if rows:
+                self.graph.write(query, rows)
+                return FakeResult()
+            return FakeResult(self.graph.read(query, params))
+
+    def close(self):
+        pass
+
+
+def start_testcontainer():
+    from testcontainers.neo4j import Neo4jContainer
+    container = Neo4jContainer("neo4j:5")
+    container.start()
+    return container, container.get_driver()
+
+
+def install_config(driver, embeddings, llm):
+    # graph_rag_app_streamlit does `from config import driver, embeddings, llm`
+    config = types.ModuleType("config")
+    config.driver, config.embeddings, config.llm = driver, embeddings, llm
+    sys.modules["config"] = config
+
+
+# ---------------------------
+# Measurement helpers
+# ---------------------------
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except OSError:
+        import resource
+        scale = 1e6 if sys.platform == "darwin" else 1e3
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+class PeakRSS:
+    """Samples RSS in a background thread to get the peak while a stage runs."""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.peak = 0.0
+        self.stop = threading.Event()
+
+    def __enter__(self):
+        self.peak = rss_mb()
+        self.thread = threading.Thread(target=self._sample, daemon=True)
+        self.thread.start()
+        return self
+
+    def _sample(self):
+        while not self.stop.wait(self.interval):
+            self.peak = max(self.peak, rss_mb())
+
+    def __exit__(self, *exc):
+        self.stop.set()
+        self.thread.join()
+        self.peak = max(self.peak, rss_mb())
+        return False
+
+
+def percentiles(latencies):
+    values = np.asarray(latencies)
+    return {f"p{p}_ms": round(float(np.percentile(values, p)) * 1000, 3) for p in (50, 95, 99)}
+
+
+def timed_stage(name, items, fn):
+    print(f"⏱️ {name} ({items} items)...")
+    with PeakRSS() as rss:
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+    return {
+        "items": items,
+        "elapsed_s": round(elapsed, 4),
+        "throughput_per_s": round(items / elapsed, 2) if elapsed else None,
+        "peak_rss_mb": round(rss.peak, 1),
+    }
+
+
+# ---------------------------
+# Synthetic corpus
+# ---------------------------
+def synthetic_pages(n_chunks, docs=100, seed=0):
+    """
+    About one 450-character page per chunk, spread over `docs` source files.
+    Yields pages one at a time so only the split chunks are held in memory.
+    """
+    rng = random.Random(seed)
+    for i in range(n_chunks):
+        words, length = [], 0
+        while length < 450:
+            word = rng.choice(ENTITIES) if rng.random() < 0.08 else rng.choice(VOCAB)
+            words.append(word)
+            length += len(word) + 1
+        yield Document(page_content=" ".join(words), metadata={"source": f"uploads/doc_{i % docs}.txt"})
+
+
+# ---------------------------
+# Runner
+# ---------------------------
+def run_size(rag, n_chunks, args, driver):
+    result = {"chunks": n_chunks, "stages": {}}
+    pages = synthetic_pages(n_chunks, docs=max(1, min(args.docs, n_chunks)))
+    # neo4j_* retrievers search vectors stored in Neo4j, so they have to be written during ingestion
+    rag.engine.neo4j_vectors = any(name.startswith("neo4j_") for name in args.retrievers)
+    chunks = []
+
+    def split():
+        chunks.extend(rag.split_documents(pages))
+    result["stages"]["split_documents"] = timed_stage("split_documents", n_chunks, split)
+    result["chunks"] = len(chunks)
+
+    if "store" in args.stages:
+        trips_before = getattr(driver, "round_trips", None)
+        result["stages"]["store_in_neo4j"] = timed_stage(
+            "store_in_neo4j", len(chunks),
+            lambda: rag.store_in_neo4j(chunks, bulk=True, batch_size=args.batch_size, max_workers=args.workers))
+        # With --hot-entities the store schedules a background refresh: let it finish
+        # outside the timers so it isn't billed to whichever stage runs next
+        wait_for_neighbourhoods(rag)
+        if trips_before is not None:
+            result["stages"]["store_in_neo4j"]["round_trips"] = driver.round_trips - trips_before
+
+    if "vectors" in args.stages or "query" in args.stages:
+        result["stages"]["build_vectorstore"] = timed_stage(
+            "build_vectorstore", len(chunks), lambda: rag.build_vectorstore(chunks))
+
+    if "query" in args.stages:
+        rng = random.Random(1)
+        questions = [f"How is {rng.choice(ENTITIES)} related to {rng.choice(VOCAB)}?" for _ in range(args.queries)]
+        # Same corpus and questions for every retriever so their latencies are comparable
+        for name in args.retrievers:
+            rag.engine.use_retriever(name)
+            latencies = []
+
+            def query():
+                for question in questions:
+                    start = time.perf_counter()
+                    rag.graph_rag_query(question, topic=question, hops=args.hops, use_cache=False)
+                    latencies.append(time.perf_counter() - start)
+            stage = timed_stage(f"graph_rag_query[{name}]", len(questions), query)
+            stage.update(percentiles(latencies))
+            result["stages"][f"graph_rag_query[{name}]"] = stage
+        rag.engine.use_retriever("hybrid")
+
+    return result
+
+
+def wait_for_neighbourhoods(rag):
+    if rag.engine.neighbourhoods is not None:
+        rag.engine.neighbourhoods.wait()
+
+
+def reset_state(rag, driver):
+    """Every size starts from an empty graph, index and caches, so sizes are comparable."""
+    wait_for_neighbourhoods(rag)
+    rag.delete_all_docs()
+    if isinstance(driver, FakeDriver):
+        # The stand-in doesn't interpret the delete statements
+        driver.graph = FakeGraph()
+    rag.extraction_cache.clear()
+    rag.embeddings.clear()
+    # One-off schema setup (and the refresh it starts) shouldn't count toward the first size
+    rag.prepare_schema()
+    wait_for_neighbourhoods(rag)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark ingestion and query stages with local stand-ins")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000],
+                        help="chunk counts (e.g. 100 10000 1000000 for the full sweep)")
+    parser.add_argument("--stages", nargs="+", default=["store", "vectors", "query"],
+                        choices=["store", "vectors", "query"])
+    parser.add_argument("--neo4j", choices=["fake", "testcontainer"], default="fake")
+    parser.add_argument("--db-latency", type=float, default=0.0005, help="fake Neo4j round-trip latency (s)")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="fake LLM latency per call (s)")
+    parser.add_argument("--embedding-size", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=8, help="extraction worker threads")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--hops", type=int, default=2)
+    parser.add_argument("--retrievers", nargs="+", default=["hybrid"],
+                        choices=["vector", "graph", "hybrid", "neo4j_vector", "neo4j_hybrid", "neo4j_expand"],
+                        help="retrievers to compare in the query stage")
+    parser.add_argument("--docs", type=int, default=100, help="number of synthetic source files")
+    parser.add_argument("--hot-entities", type=int, default=0,
+                        help="materialized hot entity neighbourhoods (refreshed after the store stage, untimed)")
+    parser.add_argument("--output", default="benchmark_results.json")
+    args = parser.parse_args(argv)
+    neo4j_retrievers = [name for name in args.retrievers if name.startswith("neo4j_")]
+    if neo4j_retrievers and args.neo4j == "fake":
+        # The stand-in has no vector index, so these would time a no-op against FAISS
+        parser.error(f"--retrievers {' '.join(neo4j_retrievers)} need a real vector index: use --neo4j testcontainer")
+    output = os.path.abspath(args.output)
+
+    container = None
+    if args.neo4j == "testcontainer":
+        container, driver = start_testcontainer()
+    else:
+        driver = FakeDriver(args.db_latency)
+    install_config(driver, FakeEmbeddings(args.embedding_size), FakeLLM(args.llm_latency))
+
+    # Caches, manifests and saved indexes go to a scratch directory, not the working tree
+    workdir = tempfile.mkdtemp(prefix="graph_rag_bench_")
+    os.chdir(workdir)
+    sys.path.insert(0, ROOT)
+    os.environ["RAG_HOT_ENTITIES"] = str(args.hot_entities)
+    import graph_rag_app_streamlit as rag
+
+    report = {
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": vars(args),
+        "runs": [],
+    }
+    try:
+        for size in args.sizes:
+            print(f"\n📊 {size} chunks")
+            reset_state(rag, driver)
+            report["runs"].append(run_size(rag, size, args, driver))
+    finally:
+        driver.close()
+        if container is not None:
+            container.stop()
+
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import argparse, asyncio, json, os, sys, time
+
+# ---------------------------
+# Headless CLI
+# ---------------------------
+# python cli.py ingest [folder] [--workers N]
+# python cli.py query "question" [--hops 3] [--topic TEXT] [--general] [--stream] [--retriever hybrid] [--global]
+# python cli.py batch-query questions.jsonl answers.jsonl [--concurrency 8]
+# python cli.py reindex [folder] [--vectors-only]
+# python cli.py communities [--algorithm louvain|leiden]
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def cmd_ingest(rag, args):
+    result = rag.sync_uploads(args.folder, dry_run=args.dry_run, workers=args.workers)
+    print(json.dumps(result, indent=2))
+
+
+def cmd_query(rag, args):
+    if args.global_:
+        start = time.perf_counter()
+        print(rag.graph_rag_query_global(args.question, use_cache=not args.no_cache))
+        print(f"⏱️ {time.perf_counter() - start:.2f}s", file=sys.stderr)
+        return
+    rag.engine.use_retriever(args.retriever)
+    kwargs = dict(topic=args.topic, hops=args.hops, use_docs_only=not args.general, use_cache=not args.no_cache)
+    start = time.perf_counter()
+    if args.stream:
+        _, tokens = rag.graph_rag_query_stream(args.question, **kwargs)
+        for token in tokens:
+            print(token, end="", flush=True)
+        print()
+    else:
+        print(rag.graph_rag_query(args.question, **kwargs))
+    print(f"⏱️ {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+
+async def run_batch(rag, questions, concurrency, use_cache, write=None):
+    """Answers `questions` concurrently; `write(record)` is called as each one completes."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(i, item):
+        async with semaphore:
+            start = time.perf_counter()
+            record = {"id": item.get("id", i), "question": item["question"]}
+            try:
+                record["answer"] = await rag.graph_rag_query_async(
+                    item["question"],
+                    topic=item.get("topic"),
+                    hops=item.get("hops", 3),
+                    use_docs_only=item.get("use_docs_only", True),
+                    use_cache=use_cache,
+                )
+            except Exception as e:
+                record["error"] = f"{type(e).__name__}: {e}"
+            record["latency_s"] = round(time.perf_counter() - start, 4)
+            if write is not None:
+                write(record)
+            return record
+
+    try:
+        return await asyncio.gather(*(run_one(i, item) for i, item in enumerate(questions)))
+    finally:
+        # Close on the loop that opened its connections
+        if rag.async_driver is not None:
+            await rag.async_driver.close()
+
+
+def cmd_batch_query(rag, args):
+    rag.engine.use_retriever(args.retriever)
+    with open(args.input, encoding="utf-8") as f:
+        questions = [json.loads(line) for line in f if line.strip()]
+
+    # Records are written in completion order as they finish, so an interrupted run keeps its answers
+    start = time.perf_counter()
+    with open(args.output, "w", encoding="utf-8") as f:
+        def write(record):
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+        records = asyncio.run(run_batch(rag, questions, args.concurrency, not args.no_cache, write))
+    elapsed = time.perf_counter() - start
+
+    latencies = [r["latency_s"] for r in records if "error" not in r]
+    errors = len(records) - len(latencies)
+    print(f"✅ {len(records)} questions in {elapsed:.1f}s ({len(records) / elapsed:.2f} q/s), {errors} errors")
+    if latencies:
+        print(f"⏱️ p50={percentile(latencies, 50):.2f}s p95={percentile(latencies, 95):.2f}s "
+              f"p99={percentile(latencies, 99):.2f}s")
+
+
+def cmd_reindex(rag, args):
+    rag.reindex(args.folder, vectors_only=args.vectors_only, workers=args.workers)
+
+
+def cmd_communities(rag, args):
+    counts = rag.build_communities(args.algorithm, resolution=args.resolution, max_workers=args.workers)
+    print(json.dumps(counts, indent=2))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Graph + Vector RAG without the Streamlit UI")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("ingest", help="ingest added/modified files and clean up removed ones")
+    p.add_argument("folder", nargs="?", default="uploads")
+    p.add_argument("--workers", type=int, default=None, help="document parsing processes")
+    p.add_argument("--dry-run", action="store_true", help="only print what would change")
+    p.set_defaults(func=cmd_ingest)
+
+    p = sub.add_parser("query", help="answer a single question")
+    p.add_argument("question")
+    p.add_argument("--topic", help="seed the graph search with this instead of the question")
+    p.add_argument("--hops", type=int, default=3)
+    p.add_argument("--general", action="store_true", help="allow general knowledge")
+    p.add_argument("--stream", action="store_true", help="print tokens as they arrive")
+    p.add_argument("--no-cache", action="store_true", help="bypass the answer cache")
+    p.add_argument("--retriever", default="hybrid",
+                   choices=["vector", "graph", "hybrid", "neo4j_vector", "neo4j_hybrid", "neo4j_expand"])
+    p.add_argument("--global", dest="global_", action="store_true",
+                   help="answer from community summaries (run `communities` first)")
+    p.set_defaults(func=cmd_query)
+
+    p = sub.add_parser("batch-query", help="answer a JSONL file of questions")
+    p.add_argument("input", help='JSONL with {"question": ...} and optional id/topic/hops/use_docs_only')
+    p.add_argument("output", help="JSONL of answers with latency_s")
+    p.add_argument("--concurrency", type=int, default=8)
+    p.add_argument("--no-cache", action="store_true", help="bypass the answer cache")
+    p.add_argument("--retriever", default="hybrid",
+                   choices=["vector", "graph", "hybrid", "neo4j_vector", "neo4j_hybrid", "neo4j_expand"])
+    p.set_defaults(func=cmd_batch_query)
+
+    p = sub.add_parser("reindex", help="rebuild Neo4j and FAISS from the files on disk")
+    p.add_argument("folder", nargs="?", default="uploads")
+    p.add_argument("--vectors-only", action="store_true", help="only rebuild the FAISS index")
+    p.add_argument("--workers", type=int, default=None, help="document parsing processes")
+    p.set_defaults(func=cmd_reindex)
+
+    p = sub.add_parser("communities", help="detect entity communities and summarize them for --global")
+    p.add_argument("--algorithm", choices=["louvain", "leiden"], default="louvain")
+    p.add_argument("--resolution", type=float, default=1.0, help="higher gives more, smaller communities")
+    p.add_argument("--workers", type=int, default=4, help="concurrent summary LLM calls")
+    p.set_defaults(func=cmd_communities)
+
+    args = parser.parse_args(argv)
+
+    # Imported after parsing so --help works without a database
+    # A one-shot command would throw the background neighbourhood refresh away
+    os.environ.setdefault("RAG_HOT_ENTITIES", "0")
+    import graph_rag_app_streamlit as rag
+    try:
+        args.func(rag, args)
+    finally:
+        rag.driver.close()
+        # batch-query closes the async driver itself, on its own event loop
+        if rag.async_driver is not None and args.func is not cmd_batch_query:
+            asyncio.run(rag.async_driver.close())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+import hashlib, re, time
+from concurrent.futures import ThreadPoolExecutor
+from neo4j_batch import write_batches
+from neo4j_delete import delete_communities
+from extraction import model_id
+from tracing import span
+
+# ---------------------------
+# Entity communities
+# ---------------------------
+# An offline stage partitions the Entity graph (Louvain/Leiden), stores one
+# :Community node per partition with an LLM summary, and links members with
+# IN_COMMUNITY. Global questions are then answered map-reduce style over the
+# summaries, so their cost depends on the number of communities rather than
+# on the size of the corpus. Each build writes its layer under a new `run`
+# before the previous layer is deleted, and readers only use the latest run,
+# so a failed build leaves the old summaries in place.
+EDGES_QUERY = """
+    MATCH (a:Entity)-[r]->(b:Entity)
+    RETURN a.name AS source, b.name AS target, collect(DISTINCT type(r)) AS rels, count(r) AS weight
+"""
+
+COMMUNITY_QUERY = """
+    MERGE (c:Community {id: row.id})
+    SET c.title = row.title, c.summary = row.summary, c.size = row.size,
+        c.hash = row.hash, c.algorithm = row.algorithm, c.run = row.run
+    WITH c, row
+    UNWIND row.members AS name
+    MATCH (e:Entity {name: name})
+    MERGE (e)-[:IN_COMMUNITY]->(c)
+"""
+
+SUMMARY_PROMPT = """
+You are given a group of closely related entities from a knowledge graph and the
+relationships between them.
+
+Entities: {entities}
+
+Relationships:
+{relationships}
+
+Write a short title on the first line, then a summary of 3-5 sentences describing
+what this group is about, naming the most important entities and how they relate.
+"""
+
+MAP_PROMPT = """
+Below are summaries of topic communities from a document collection.
+
+{summaries}
+
+Question: {question}
+
+Using only these summaries, write the part of the answer they support. Then rate
+how helpful they are for the question from 0 (irrelevant) to 100.
+Reply exactly in this format:
+SCORE: <0-100>
+ANSWER: <answer>
+"""
+
+REDUCE_PROMPT = """
+Several analysts each answered the question below from different parts of a
+document collection, most helpful first.
+
+{partials}
+
+Question: {question}
+
+Combine them into one complete answer. Drop anything irrelevant or repeated and
+do not add facts that are not in the partial answers.
+"""
+
+
+# ---------------------------
+# 1️⃣ Partition the entity graph
+# ---------------------------
+def entity_edges(driver):
+    """(source, target, relationship types, weight) for every connected entity pair."""
+    with driver.session() as session:
+        return session.execute_read(
+            lambda tx: [(r["source"], r["target"], r["rels"], r["weight"]) for r in tx.run(EDGES_QUERY)])
+
+
+def gds_available(driver):
+    try:
+        with driver.session() as session:
+            session.run("RETURN gds.version() AS version").consume()
+        return True
+    except Exception:
+        return False
+
+
+def detect_with_gds(driver, algorithm="louvain", graph_name="entity_communities"):
+    """Runs gds.louvain / gds.leiden on an undirected in-memory projection of :Entity."""
+    with driver.session() as session:
+        session.run("CALL gds.graph.drop($name, false) YIELD graphName", name=graph_name).consume()
+        session.run("""
+            CALL gds.graph.project($name, 'Entity', {ALL: {type: '*', orientation: 'UNDIRECTED'}})
+            YIELD graphName
+        """, name=graph_name).consume()
+        try:
+            result = session.run(f"""
+                CALL gds.{algorithm}.stream($name) YIELD nodeId, communityId
+                RETURN communityId, collect(gds.util.asNode(nodeId).name) AS members
+            """, name=graph_name)
+            return [record["members"] for record in result]
+        finally:
+            session.run("CALL gds.graph.drop($name, false) YIELD graphName", name=graph_name).consume()
+
+
+def detect_local(edges, algorithm="louvain", resolution=1.0, seed=42):
+    """Leiden through python-igraph when installed, otherwise networkx Louvain."""
+    if algorithm == "leiden":
+        try:
+            import igraph
+        except ImportError:
+            print("⚠️ python-igraph not installed; using networkx Louvain instead of Leiden")
+        else:
+            graph = igraph.Graph.TupleList(((s, t, w) for s, t, _, w in edges), weights=True)
+            clusters = graph.community_leiden(objective_function="modularity", weights="weight",
+                                              resolution=resolution, n_iterations=-1)
+            return [[graph.vs[i]["name"] for i in cluster] for cluster in clusters]
+
+    import networkx as nx
+    graph = nx.Graph()
+    for source, target, _, weight in edges:
+        if graph.has_edge(source, target):
+            graph[source][target]["weight"] += weight
+        else:
+            graph.add_edge(source, target, weight=weight)
+    return [list(members) for members in nx.community.louvain_communities(
+        graph, weight="weight", resolution=resolution, seed=seed)]
+
+
+# ---------------------------
+# 2️⃣ Summarize
+# ---------------------------
+def community_relationships(partitions, edges, max_edges=50):
+    """Per partition, its heaviest internal edges as 'a -[rel]-> b' lines (one pass over the edges)."""
+    membership = {name: idx for idx, members in enumerate(partitions) for name in members}
+    inside = [[] for _ in partitions]
+    for edge in edges:
+        idx = membership.get(edge[0])
+        if idx is not None and membership.get(edge[1]) == idx:
+            inside[idx].append(edge)
+    lines = []
+    for bucket in inside:
+        bucket.sort(key=lambda e: (-e[3], e[0], e[1]))
+        lines.append([f"{s} -[{'|'.join(sorted(rels))}]-> {t}" for s, t, rels, _ in bucket[:max_edges]])
+    return lines
+
+
+def community_hash(members, relationships, model):
+    digest = hashlib.sha256()
+    for part in [model, *sorted(members), *relationships]:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def summarize(llm, members, relationships, max_entities=100):
+    prompt = SUMMARY_PROMPT.format(entities=", ".join(sorted(members)[:max_entities]),
+                                   relationships="\n".join(relationships) or "(none)")
+    text = llm.invoke([{"role": "user", "content": prompt}]).content.strip()
+    title, _, summary = text.partition("\n")
+    return title.strip("# *").strip(), summary.strip() or title
+
+
+def existing_summaries(driver):
+    """hash -> (title, summary) of the stored communities, so unchanged ones skip the LLM."""
+    with driver.session() as session:
+        result = session.run("MATCH (c:Community) RETURN c.hash AS hash, c.title AS title, c.summary AS summary")
+        return {record["hash"]: (record["title"], record["summary"]) for record in result}
+
+
+def build_communities(driver, llm, algorithm="louvain", resolution=1.0, min_size=2, max_workers=4,
+                      use_gds=None, batch_size=500):
+    """
+    Partitions the Entity graph, summarizes each community and replaces the stored
+    :Community layer. Summaries are reused for communities whose members and
+    internal edges haven't changed. Returns counts.
+    """
+    if algorithm not in ("louvain", "leiden"):
+        raise ValueError(f"Unknown community algorithm '{algorithm}' (choose louvain or leiden)")
+    with span("community_detection", algorithm=algorithm):
+        edges = entity_edges(driver)
+        if use_gds is None:
+            use_gds = gds_available(driver)
+        partitions = detect_with_gds(driver, algorithm) if use_gds else detect_local(edges, algorithm, resolution)
+    partitions = sorted((p for p in partitions if len(p) >= min_size), key=len, reverse=True)
+    print(f"🧩 Found {len(partitions)} communities with {'GDS' if use_gds else 'local'} {algorithm}")
+
+    previous = existing_summaries(driver)
+    model = model_id(llm)
+    run = time.time_ns()   # orders builds; the latest complete one is served
+    rows = []
+    for idx, (members, relationships) in enumerate(zip(partitions, community_relationships(partitions, edges))):
+        rows.append({"id": f"{run}-{idx}", "run": run, "members": members, "size": len(members), "algorithm": algorithm,
+                     "relationships": relationships, "hash": community_hash(members, relationships, model)})
+
+    todo = [row for row in rows if row["hash"] not in previous]
+    with span("community_summaries", communities=len(todo)), ThreadPoolExecutor(max_workers=max_workers) as pool:
+        summaries = pool.map(lambda row: summarize(llm, row["members"], row["relationships"]), todo)
+        for row, (title, summary) in zip(todo, summaries):
+            previous[row["hash"]] = (title, summary)
+    for row in rows:
+        row["title"], row["summary"] = previous[row["hash"]]
+        del row["relationships"]
+
+    try:
+        write_batches(driver, COMMUNITY_QUERY, rows, batch_size, label="communities")
+    except Exception:
+        # Keep serving the previous layer rather than a partial new one
+        delete_communities(driver, batch_size, run=run)
+        raise
+    delete_communities(driver, batch_size, keep_run=run)
+    print(f"✅ Stored {len(rows)} communities ({len(todo)} summarized, {len(rows) - len(todo)} reused)")
+    return {"communities": len(rows), "summarized": len(todo), "reused": len(rows) - len(todo)}
+
+
+# ---------------------------
+# 3️⃣ Global question answering
+# ---------------------------
+def load_summaries(driver, limit=200):
+    """
+    Largest communities of the latest build first; `limit` caps the map step of
+    every global query.
+    """
+    with driver.session() as session:
+        return session.execute_read(lambda tx: [record.data() for record in tx.run("""
+            MATCH (c:Community)
+            WITH max(c.run) AS latest
+            MATCH (c:Community)
+            WHERE latest IS NULL OR c.run = latest
+            RETURN c.id AS id, c.title AS title, c.summary AS summary, c.size AS size
+            ORDER BY c.size DESC
+            LIMIT $limit
+        """, limit=limit)])
+
+
+def pack_summaries(summaries, max_chars=6000):
+    """Groups summaries into map batches of at most `max_chars` characters each."""
+    batches, current, size = [], [], 0
+    for community in summaries:
+        text = f"[{community['title']}] {community['summary']}"
+        if current and size + len(text) > max_chars:
+            batches.append(current)
+            current, size = [], 0
+        current.append(text)
+        size += len(text)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def parse_partial(text):
+    match = re.search(r"SCORE:\s*(\d+)", text)
+    score = min(100, int(match.group(1))) if match else 0
+    answer = text.split("ANSWER:", 1)[1].strip() if "ANSWER:" in text else text.strip()
+    return score, answer
+
+
+def global_answer(llm, question, summaries, max_chars=6000, max_workers=4, top_partials=8):
+    """
+    Map: each batch of community summaries gives a scored partial answer. Reduce:
+    the best-scoring partials are merged into one answer. Returns None when no
+    batch found anything relevant.
+    """
+    batches = pack_summaries(summaries, max_chars)
+
+    def partial(batch):
+        prompt = MAP_PROMPT.format(summaries="\n\n".join(batch), question=question)
+        return parse_partial(llm.invoke([{"role": "user", "content": prompt}]).content)
+
+    with span("global_map", batches=len(batches)), ThreadPoolExecutor(max_workers=max_workers) as pool:
+        partials = [p for p in pool.map(partial, batches) if p[0] > 0]
+    if not partials:
+        return None
+
+    partials.sort(key=lambda p: p[0], reverse=True)
+    with span("global_reduce", partials=min(len(partials), top_partials)):
+        prompt = REDUCE_PROMPT.format(
+            partials="\n\n".join(f"Analyst {i + 1} (helpfulness {score}):\n{answer}"
+                                 for i, (score, answer) in enumerate(partials[:top_partials])),
+            question=question)
+        return llm.invoke([{"role": "user", "content": prompt}]).content
@@ -0,0 +1,89 @@
+import os, signal, threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from langchain_community.document_loaders import PyPDFLoader, TextLoader
+
+# ---------------------------
+# Parallel document loading
+# ---------------------------
+DEFAULT_FILE_TIMEOUT = 300   # seconds per file
+
+
+def load_file(path):
+    if path.endswith(".pdf"):
+        return PyPDFLoader(path).load()
+    if path.endswith(".txt"):
+        return TextLoader(path).load()
+    return []
+
+
+def _raise_timeout(signum, frame):
+    raise TimeoutError("parsing took too long")
+
+
+def _load_file_safe(path, timeout=None):
+    # Runs in a worker process: never raise, so one bad file can't take the batch down.
+    # The timeout uses SIGALRM, so it only applies on Unix and in a main thread.
+    alarm = bool(timeout) and hasattr(signal, "SIGALRM") and threading.current_thread() is threading.main_thread()
+    if alarm:
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return path, load_file(path), None
+    except Exception as e:
+        return path, [], f"{type(e).__name__}: {e}"
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+
+def list_files(folder_path="uploads", filenames=None):
+    filenames = filenames if filenames is not None else sorted(os.listdir(folder_path))
+    return [os.path.join(folder_path, f) for f in filenames if f.endswith((".pdf", ".txt"))]
+
+
+def iter_documents(folder_path="uploads", filenames=None, workers=None, timeout=DEFAULT_FILE_TIMEOUT):
+    """
+    Parses files in a process pool of `workers` processes (default: CPU count) and
+    yields their Documents as each file finishes. A file that fails to parse or
+    takes longer than `timeout` seconds is reported and skipped. workers=1 loads
+    in-process.
+    """
+    paths = list_files(folder_path, filenames)
+    if workers == 1 or len(paths) <= 1:
+        results = (_load_file_safe(path, timeout) for path in paths)
+        for path, docs, error in results:
+            if error:
+                print(f"⚠️ Could not load {path}: {error}")
+            yield from docs
+        return
+
+    # A worker that dies (e.g. a parser crash on a malformed PDF) breaks the whole
+    # pool. The files it left unfinished are then reloaded in a one-process pool,
+    # where the first unfinished file is the one that crashed it.
+    remaining, isolate = paths, False
+    while remaining:
+        broken = set()
+        with ProcessPoolExecutor(max_workers=1 if isolate else workers) as pool:
+            futures = {pool.submit(_load_file_safe, path, timeout): path for path in remaining}
+            for future in as_completed(futures):
+                try:
+                    path, docs, error = future.result()
+                except BrokenProcessPool:
+                    broken.add(futures[future])
+                    continue
+                except Exception as e:
+                    path, docs, error = futures[future], [], f"{type(e).__name__}: {e}"
+                if error:
+                    print(f"⚠️ Could not load {path}: {error}")
+                    continue
+                yield from docs
+
+        remaining = [path for path in remaining if path in broken]
+        if remaining and isolate:
+            print(f"⚠️ Could not load {remaining[0]}: worker process crashed")
+            remaining = remaining[1:]
+        elif remaining:
+            print(f"⚠️ Worker process crashed; reloading {len(remaining)} unfinished files one at a time")
+            isolate = True
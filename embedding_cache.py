@@ -0,0 +1,141 @@
+import asyncio, hashlib, os, sqlite3, threading
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from sqlite_lru import SQLITE_MAX_PARAMS, LRUTable
+from vector_index import embeddings_id
+
+# ---------------------------
+# Persistent embedding cache
+# ---------------------------
+DEFAULT_CACHE_PATH = os.path.join(".cache", "embedding_cache.sqlite")
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Wraps an embeddings object with a SQLite cache of float32 vectors keyed by
+    model id and a hash of the text. Misses from one embed_documents call are
+    de-duplicated and sent to the wrapped model in a single batch. Query and
+    document vectors are cached separately since some models embed them
+    differently. Least-recently-used vectors are evicted past `max_bytes`.
+    """
+
+    def __init__(self, embeddings, path=DEFAULT_CACHE_PATH, max_bytes=1024 * 1024 * 1024):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.embeddings = embeddings
+        # Same identity as the wrapped model, so saved indexes and manifests stay valid
+        self.model = embeddings_id(embeddings)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.counts = {"document": [0, 0], "query": [0, 0]}   # kind -> [hits, misses]
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS vectors (
+                key TEXT PRIMARY KEY,
+                vector BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS vectors_last_access ON vectors(last_access)")
+        self.conn.commit()
+        self.lru = LRUTable(self.conn, "vectors", "vector", max_bytes, "embeddings")
+
+    def make_key(self, text, kind):
+        digest = hashlib.sha256()
+        for part in (self.model, kind, text):
+            digest.update(str(part).encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    # ---------------------------
+    # Storage
+    # ---------------------------
+    def _lookup(self, keys):
+        found = {}
+        with self.lock:
+            for i in range(0, len(keys), SQLITE_MAX_PARAMS):
+                batch = keys[i:i + SQLITE_MAX_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                for key, blob in self.conn.execute(
+                        f"SELECT key, vector FROM vectors WHERE key IN ({placeholders})", batch):
+                    found[key] = np.frombuffer(blob, dtype="float32").tolist()
+            self.lru.touch(found)
+        return found
+
+    def _store(self, items):
+        rows = []
+        for key, vector in items:
+            blob = np.asarray(vector, dtype="float32").tobytes()
+            rows.append((key, blob, len(blob)))
+        with self.lock:
+            self.lru.put_many(rows)
+            self.conn.commit()
+
+    def _split(self, texts, kind):
+        """Returns (keys, cached vectors by key, texts still to embed by key)."""
+        keys = [self.make_key(text, kind) for text in texts]
+        found = self._lookup(list(dict.fromkeys(keys)))
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                missing.setdefault(key, text)
+        hits = sum(key in found for key in keys)
+        with self.lock:
+            self.counts[kind][0] += hits
+            self.counts[kind][1] += len(keys) - hits
+        return keys, found, missing
+
+    # ---------------------------
+    # Embeddings interface
+    # ---------------------------
+    def embed_documents(self, texts):
+        keys, found, missing = self._split(texts, "document")
+        if missing:
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            fresh = dict(zip(missing, vectors))
+            self._store(fresh.items())
+            found.update(fresh)
+        return [found[key] for key in keys]
+
+    def embed_query(self, text):
+        keys, found, missing = self._split([text], "query")
+        if missing:
+            found[keys[0]] = self.embeddings.embed_query(text)
+            self._store([(keys[0], found[keys[0]])])
+        return found[keys[0]]
+
+    async def aembed_documents(self, texts):
+        keys, found, missing = await asyncio.to_thread(self._split, texts, "document")
+        if missing:
+            vectors = await self.embeddings.aembed_documents(list(missing.values()))
+            fresh = dict(zip(missing, vectors))
+            await asyncio.to_thread(self._store, fresh.items())
+            found.update(fresh)
+        return [found[key] for key in keys]
+
+    async def aembed_query(self, text):
+        keys, found, missing = await asyncio.to_thread(self._split, [text], "query")
+        if missing:
+            found[keys[0]] = await self.embeddings.aembed_query(text)
+            await asyncio.to_thread(self._store, [(keys[0], found[keys[0]])])
+        return found[keys[0]]
+
+    # ---------------------------
+    # Maintenance
+    # ---------------------------
+    def clear(self):
+        with self.lock:
+            self.lru.clear()
+            self.conn.commit()
+
+    def stats(self):
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+            size = self.lru.total
+            counts = {kind: list(c) for kind, c in self.counts.items()}
+        result = {"entries": entries, "bytes": size}
+        for kind, (hits, misses) in counts.items():
+            lookups = hits + misses
+            result[kind] = {"hits": hits, "misses": misses, "hit_rate": hits / lookups if lookups else 0.0}
+        return result
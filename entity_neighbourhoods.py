@@ -0,0 +1,180 @@
+import threading, time
+from array import array
+from graph_retrieval import _expand
+
+# ---------------------------
+# Hot-entity neighbourhoods
+# ---------------------------
+# The few entities that most chunks mention are the seeds of most questions.
+# Their k-hop neighbourhoods are computed once, kept in process as per-hop
+# arrays of interned name ids, and merged into expand_entities() by dict
+# lookup instead of one _expand round trip per hop.
+TOP_ENTITIES_QUERY = """
+    MATCH (e:Entity)
+    WITH e, COUNT { (e)<-[:MENTIONS]-() } AS mentions
+    ORDER BY mentions DESC
+    LIMIT $limit
+    RETURN e.name AS name, mentions, COUNT { (e)--(:Entity) } AS degree
+"""
+
+
+def _top_entities(tx, limit):
+    return [record.data() for record in tx.run(TOP_ENTITIES_QUERY, limit=limit)]
+
+
+def _hop_levels(tx, name, hops, fanout):
+    """Same per-hop fan-out cap as expand_entities, from a single seed."""
+    levels, seen, frontier = [], {name}, [name]
+    for _ in range(hops):
+        frontier = [n for n in _expand(tx, frontier, fanout) if n not in seen] if frontier else []
+        seen.update(frontier)
+        levels.append(frontier)
+    return levels
+
+
+class NeighbourhoodIndex:
+    """
+    Materialized neighbourhoods of the `top_n` most-mentioned entities, up to
+    `hops` hops with `fanout` neighbours per node, plus their mention count and
+    entity degree. Refreshes run on a background thread; a refresh with touched
+    entity names only recomputes hot entities whose neighbourhood contains one
+    of them (or that just became hot).
+    """
+
+    def __init__(self, driver, top_n=100, hops=3, fanout=25):
+        self.driver = driver
+        self.top_n = top_n
+        self.hops = hops
+        self.fanout = fanout
+        # (id -> entity name, entity name -> id,
+        #  entity name -> {"mentions", "degree", "levels": [array of ids per hop]}),
+        # swapped as one tuple so readers never pair entries with another name table
+        self.table = ([], {}, {})
+        self.generation = 0    # bumped by clear(); refreshes started before it are dropped
+        self.served = 0
+        self.refreshes = 0
+        self.last_refresh_s = None
+        self.pending = set()
+        self.full_refresh = False
+        self.worker = None
+        self.lock = threading.Lock()
+
+    @property
+    def entries(self):
+        return self.table[2]
+
+    # ---------------------------
+    # Query path
+    # ---------------------------
+    def lookup(self, names, hops, fanout):
+        """
+        {name: [[names at hop 1], ...]} for the hot entities among `names`. Only
+        answers when the materialization covers `hops` with the same `fanout`, so
+        results match a live expansion.
+        """
+        if hops > self.hops or fanout != self.fanout:
+            return {}
+        id_names, _, entries = self.table
+        found = {}
+        for name in names:
+            entry = entries.get(name)
+            if entry is not None:
+                found[name] = [[id_names[i] for i in level] for level in entry["levels"][:hops]]
+        self.served += len(found)
+        return found
+
+    def entity_stats(self, name):
+        entry = self.entries.get(name)
+        return None if entry is None else {"mentions": entry["mentions"], "degree": entry["degree"]}
+
+    # ---------------------------
+    # Refresh
+    # ---------------------------
+    def refresh(self, touched=None):
+        """
+        Recomputes neighbourhoods now; touched=None rebuilds every entry. The name
+        table is rebuilt from the entries kept, so names of entities that are no
+        longer hot (or no longer exist) are dropped with them.
+        """
+        start = time.perf_counter()
+        generation = self.generation
+        old_names, old_ids, old_entries = self.table
+        names, ids = [], {}
+
+        def intern(name):
+            if name not in ids:
+                ids[name] = len(names)
+                names.append(name)
+            return ids[name]
+
+        touched_ids = None if touched is None else {old_ids[n] for n in touched if n in old_ids}
+        with self.driver.session() as session:
+            top = session.execute_read(_top_entities, self.top_n)
+            entries = {}
+            recomputed = 0
+            for row in top:
+                name = row["name"]
+                old = old_entries.get(name)
+                if (touched_ids is not None and old is not None and name not in touched
+                        and not any(i in touched_ids for level in old["levels"] for i in level)):
+                    levels = [array("I", (intern(old_names[i]) for i in level)) for level in old["levels"]]
+                else:
+                    levels = [array("I", map(intern, level))
+                              for level in session.execute_read(_hop_levels, name, self.hops, self.fanout)]
+                    recomputed += 1
+                entries[name] = {"mentions": row["mentions"], "degree": row["degree"], "levels": levels}
+        with self.lock:
+            if self.generation != generation:
+                # clear() ran meanwhile: these entries may name deleted entities
+                print("⏭️ Dropped a hot entity refresh that started before the graph was cleared")
+                return 0
+            # Readers see either the old or the new table, never a partial one
+            self.table = (names, ids, entries)
+        self.refreshes += 1
+        self.last_refresh_s = round(time.perf_counter() - start, 3)
+        print(f"🔥 Materialized {recomputed} of {len(entries)} hot entity neighbourhoods in {self.last_refresh_s:.2f}s")
+        return recomputed
+
+    def schedule(self, touched=None):
+        """Queues a background refresh; calls made while one runs are merged into the next round."""
+        with self.lock:
+            if touched is None:
+                self.full_refresh = True
+            else:
+                self.pending.update(touched)
+            if self.worker is None:
+                self.worker = threading.Thread(target=self._run, daemon=True, name="neighbourhood-refresh")
+                self.worker.start()
+
+    def _run(self):
+        while True:
+            with self.lock:
+                if not self.full_refresh and not self.pending:
+                    self.worker = None
+                    return
+                touched = None if self.full_refresh or not self.entries else self.pending
+                self.full_refresh, self.pending = False, set()
+            try:
+                self.refresh(touched)
+            except Exception as e:
+                print(f"⚠️ Hot entity refresh failed: {e}")
+
+    def wait(self, timeout=None):
+        worker = self.worker
+        if worker is not None:
+            worker.join(timeout)
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.pending = set()
+            self.full_refresh = False
+            self.table = ([], {}, {})
+
+    def stats(self):
+        return {
+            "hot_entities": len(self.entries),
+            "served": self.served,
+            "refreshes": self.refreshes,
+            "last_refresh_s": self.last_refresh_s,
+        }
@@ -0,0 +1,140 @@
+import json, random, re, threading, time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from config import llm as default_llm
+from extraction_cache import ExtractionCache
+
+# ---------------------------
+# Prompt & parsing
+# ---------------------------
+EXTRACTION_PROMPT = """
+            Extract factual relationships in JSON format (subject, relation, object) from the text:
+            \"\"\"{text}\"\"\"
+            Example:
+            [
+              {{"subject": "Barack Obama", "relation": "born in", "object": "Honolulu"}}
+            ]
+            """
+
+
+def parse_triples(chunk_id, triples_text):
+    """Pulls the JSON list out of the LLM reply; returns None if there is none."""
+    match = re.search(r'\[.*\]', triples_text, re.DOTALL)
+    if not match:
+        print(f"⚠️ No JSON found for chunk {chunk_id}")
+        return None
+
+    try:
+        return json.loads(match.group(0))
+    except json.JSONDecodeError as e:
+        print(f"⚠️ JSON decode error in chunk {chunk_id}: {e}")
+        return None
+
+
+def model_id(model):
+    return getattr(model, "model_name", None) or getattr(model, "model", None) or type(model).__name__
+
+
+# Shared on-disk cache: unchanged chunks never go back to the LLM. Opened on
+# first use so importing this module doesn't create .cache/
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ExtractionCache()
+        return _cache
+
+
+# ---------------------------
+# Rate limiting
+# ---------------------------
+class RateLimiter:
+    """Thread-safe limiter allowing at most `rate` calls per second (None = unlimited)."""
+
+    def __init__(self, rate=None):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# ---------------------------
+# Single-chunk extraction
+# ---------------------------
+def extract_triples(chunk_id, text, retries=3, backoff=1.0, rate_limiter=None, use_cache=True, llm=None):
+    """
+    Asks `llm` (config.llm by default) for (subject, relation, object) triples.
+    Cached results for the same text, prompt and model are returned without an
+    LLM call. LLM errors are retried with exponential backoff; returns None once
+    retries are exhausted or the reply can't be parsed.
+    """
+    llm = default_llm if llm is None else llm
+    key = ExtractionCache.make_key(text, EXTRACTION_PROMPT, model_id(llm))
+    cache = get_cache() if use_cache else None
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    prompt = EXTRACTION_PROMPT.format(text=text)
+    for attempt in range(retries + 1):
+        if rate_limiter:
+            rate_limiter.acquire()
+        try:
+            response = llm.invoke([{"role": "user", "content": prompt}])
+            triples = parse_triples(chunk_id, response.content.strip())
+            if cache is not None and triples is not None:
+                cache.put(key, triples)
+            return triples
+        except Exception as e:
+            if attempt == retries:
+                print(f"⚠️ LLM extraction failed for chunk {chunk_id}: {e}")
+                return None
+            delay = backoff * (2 ** attempt) * (1 + random.random())
+            print(f"🔁 Retrying chunk {chunk_id} in {delay:.1f}s ({e})")
+            time.sleep(delay)
+
+
+# ---------------------------
+# Concurrent extraction stage
+# ---------------------------
+def extract_concurrently(items, max_workers=4, requests_per_second=None, retries=3, backoff=1.0, llm=None):
+    """
+    Runs extract_triples over `items` ((chunk_id, text) pairs) in a bounded thread
+    pool and yields (chunk_id, triples) in completion order, so the caller can
+    write results while the remaining chunks are still with the LLM. At most
+    2 * max_workers chunks are in flight at once.
+    """
+    limiter = RateLimiter(requests_per_second)
+    items = iter(items)
+    pending = set()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        def submit_next():
+            for chunk_id, text in items:
+                future = pool.submit(extract_triples, chunk_id, text, retries, backoff, limiter, llm=llm)
+                future.chunk_id = chunk_id
+                pending.add(future)
+                return True
+            return False
+
+        while len(pending) < 2 * max_workers and submit_next():
+            pass
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                submit_next()
+                yield future.chunk_id, future.result()
@@ -0,0 +1,77 @@
+import hashlib, json, os, sqlite3, threading
+from sqlite_lru import LRUTable
+
+# ---------------------------
+# Persistent triple-extraction cache
+# ---------------------------
+DEFAULT_CACHE_PATH = os.path.join(".cache", "extraction_cache.sqlite")
+
+
+class ExtractionCache:
+    """
+    SQLite-backed cache of parsed extraction triples, keyed by a hash of the chunk
+    text, the extraction prompt and the model. Least-recently-used entries are
+    evicted once the stored payloads exceed `max_bytes`.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=256 * 1024 * 1024):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS triples (
+                key TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS triples_last_access ON triples(last_access)")
+        self.conn.commit()
+        self.lru = LRUTable(self.conn, "triples", "payload", max_bytes, "extractions")
+
+    @staticmethod
+    def make_key(text, prompt, model):
+        digest = hashlib.sha256()
+        for part in (model, prompt, text):
+            digest.update(str(part).encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key):
+        with self.lock:
+            row = self.conn.execute("SELECT payload FROM triples WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.lru.touch([key])
+        return json.loads(row[0])
+
+    def put(self, key, triples):
+        payload = json.dumps(triples)
+        with self.lock:
+            self.lru.put_many([(key, payload, len(payload))])
+            self.conn.commit()
+
+    def clear(self):
+        with self.lock:
+            self.lru.clear()
+            self.conn.commit()
+
+    def stats(self):
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM triples").fetchone()[0]
+            size = self.lru.total
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+        }
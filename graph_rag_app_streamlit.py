@@ -1,178 +1,81 @@
-import os, json, re
-from langchain_community.document_loaders import PyPDFLoader, TextLoader
-from langchain_community.vectorstores import FAISS
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+import os
 from config import driver, embeddings, llm
-
-vectorstore = None
+try:
+    from config import async_driver
+except ImportError:
+    async_driver = None
+from rag_engine import RagEngine
 
 # ---------------------------
-# 1️⃣ Load & split documents
+# Graph + Vector RAG backend
 # ---------------------------
-def load_documents(folder_path="uploads"):
-    docs = []
-    for filename in os.listdir(folder_path):
-        path = os.path.join(folder_path, filename)
-        if filename.endswith(".pdf"):
-            loader = PyPDFLoader(path)
-        elif filename.endswith(".txt"):
-            loader = TextLoader(path)
-        else:
-            continue
-        docs.extend(loader.load())
-    print(f"✅ Loaded {len(docs)} documents")
-    return docs
+# The pipeline lives in rag_engine; this module keeps the names that the
+# Streamlit apps, cli.py and benchmark.py use. Switch retrievers at runtime
+# with engine.use_retriever("vector" | "graph" | "hybrid" | "neo4j_vector" |
+# "neo4j_hybrid" | "neo4j_expand"). RAG_RETRIEVER sets the default,
+# RAG_NEO4J_VECTORS=1 also writes chunk embeddings to the Neo4j vector index,
+# RAG_CONTEXT_TOKENS caps the context sent to the LLM (0 = no cap), and
+# RAG_HOT_ENTITIES sets how many hot entity neighbourhoods to materialize (0 = off).
+INDEX_DIR = os.path.join("vector_store", "graph_rag")
+RETRIEVER = os.getenv("RAG_RETRIEVER", "hybrid")
+CONTEXT_TOKENS = int(os.getenv("RAG_CONTEXT_TOKENS", "3000"))
+HOT_ENTITIES = int(os.getenv("RAG_HOT_ENTITIES", "100"))
+NEO4J_VECTORS = os.getenv("RAG_NEO4J_VECTORS", "").lower() in ("1", "true", "yes") or RETRIEVER.startswith("neo4j_")
+
+engine = RagEngine(embeddings, llm, driver=driver, async_driver=async_driver,
+                   retriever=RETRIEVER, prompt="docs", index_dir=INDEX_DIR, neo4j_vectors=NEO4J_VECTORS,
+                   context_tokens=CONTEXT_TOKENS, hot_entities=HOT_ENTITIES)
+
+driver = engine.driver
+embeddings = engine.embeddings
+index_manager = engine.index_manager
+answer_cache = engine.answer_cache
+manifest = engine.manifest
+extraction_cache = engine.extraction_cache
+
+
+def __getattr__(name):
+    # `vectorstore` follows the engine's index instead of being a stale module global
+    if name == "vectorstore":
+        return engine.vectorstore
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-def split_documents(docs):
-    splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=100)
-    return splitter.split_documents(docs)
 
 # ---------------------------
-# 2️⃣ Store in Neo4j
+# 1️⃣ Load & split documents
 # ---------------------------
-def store_in_neo4j(chunks):
-    with driver.session() as session:
-        for idx, chunk in enumerate(chunks):
-            text = chunk.page_content
-            doc_name = chunk.metadata.get("source", "unknown")
-            chunk_id = f"{doc_name}_{idx}"
-
-            # Create document and chunk nodes
-            session.run("""
-                MERGE (d:Document {name: $doc_name})
-                MERGE (c:Chunk {id: $chunk_id})
-                SET c.text = $text
-                MERGE (d)-[:HAS_CHUNK]->(c)
-            """, doc_name=doc_name, chunk_id=chunk_id, text=text)
-
-            # Extract entities via LLM
-            extraction_prompt = f"""
-            Extract factual relationships in JSON format (subject, relation, object) from the text:
-            \"\"\"{text}\"\"\"
-            Example:
-            [
-              {{"subject": "Barack Obama", "relation": "born in", "object": "Honolulu"}}
-            ]
-            """
-            try:
-                response = llm.invoke([{"role": "user", "content": extraction_prompt}])
-                triples_text = response.content.strip()
-            except Exception as e:
-                print(f"⚠️ LLM extraction failed for chunk {chunk_id}: {e}")
-                continue
-
-            match = re.search(r'\[.*\]', triples_text, re.DOTALL)
-            if not match:
-                print(f"⚠️ No JSON found for chunk {chunk_id}")
-                continue
-
-            try:
-                triples = json.loads(match.group(0))
-            except json.JSONDecodeError as e:
-                print(f"⚠️ JSON decode error in chunk {chunk_id}: {e}")
-                continue
-
-            # Store entities and relationships
-            for triple in triples:
-                subj = triple.get("subject")
-                rel = triple.get("relation", "RELATED_TO")
-                obj = triple.get("object")
-
-                if subj and obj:
-                    rel_clean = re.sub(r'[^A-Z0-9_]', '_', rel.upper())
-                    try:
-                        session.run(f"""
-                            MERGE (s:Entity {{name: $subj}})
-                            MERGE (o:Entity {{name: $obj}})
-                            MERGE (s)-[r:{rel_clean}]->(o)
-                            MERGE (c:Chunk {{id: $chunk_id}})-[:MENTIONS]->(s)
-                            MERGE (c)-[:MENTIONS]->(o)
-                        """, subj=subj, obj=obj, chunk_id=chunk_id)
-                    except Exception as e:
-                        print(f"⚠️ Neo4j write error for relation '{rel_clean}' in chunk {chunk_id}: {e}")
-
-        print("✅ Stored chunks and extracted entities in Neo4j")
+load_documents = engine.load_documents
+split_documents = engine.split_documents
+document_source = engine.document_source
 
 # ---------------------------
-# 3️⃣ Build FAISS vectorstore
+# 2️⃣ Store in Neo4j
 # ---------------------------
-def build_vectorstore(chunks):
-    global vectorstore
-    print("🔧 Building vector index...")
-    vectorstore = FAISS.from_documents(chunks, embeddings)
-    return vectorstore
+prepare_schema = engine.prepare_schema
+store_in_neo4j = engine.store_in_neo4j
+store_in_neo4j_bulk = engine.store_in_neo4j_bulk
 
 # ---------------------------
-# 4️⃣ Graph + Vector RAG query
+# 3️⃣ Build FAISS vectorstore & ingestion
 # ---------------------------
-def graph_rag_query(question, topic="Neo4j", k_graph=5, k_vector=3, hops=3, use_docs_only=True):
-    global vectorstore
-    if vectorstore is None:
-        raise ValueError("Vectorstore not built yet!")
-
-    with driver.session() as session:
-        cypher_query = f"""
-            MATCH path=(start:Entity)-[*1..{hops}]-(related)
-            WHERE ANY(node IN nodes(path) WHERE toLower(node.name) CONTAINS toLower($topic))
-            WITH DISTINCT related
-            MATCH (related)<-[:HAS_CHUNK]-(d:Document)
-            RETURN d.name AS doc_name, collect(DISTINCT related.name) AS related_entities
-            LIMIT $limit
-        """
-        result = session.run(cypher_query, topic=topic, limit=k_graph)
-        graph_contexts = [
-            f"{record['doc_name']} mentions: {', '.join(record['related_entities'])}"
-            for record in result
-        ]
-        graph_context = "\n".join(graph_contexts)
-
-    vector_docs = vectorstore.similarity_search(question, k=k_vector)
-    vector_context = "\n".join([doc.page_content for doc in vector_docs])
-    context = f"GRAPH CONTEXT:\n{graph_context}\n\nVECTOR CONTEXT:\n{vector_context}".strip()
-
-    if use_docs_only and not graph_context.strip() and not vector_context.strip():
-        return f"⚠️ No info about '{question}' in uploaded docs.\n💡 Uncheck 'Use only uploaded documents' for general knowledge."
-
-    system_prompt = "You are a helpful assistant. " + \
-        ("Answer using **only provided document context**." if use_docs_only else "Use docs + general knowledge if needed.")
-    
-    response = llm.invoke([
-        {"role": "system", "content": system_prompt},
-        {"role": "user", "content": f"Context:\n{context}\n\nQuestion: {question}"}
-    ])
-    answer = response.content
-    if use_docs_only:
-        answer += "\n💡 Uncheck to include general knowledge."
-    return answer
+build_vectorstore = engine.build_vectorstore
+ingest_streaming = engine.ingest_streaming
+model_version = engine.model_version
+sync_uploads = engine.sync_uploads
+reindex = engine.reindex
 
 # ---------------------------
-# 5️⃣ Delete all docs & entities
+# 4️⃣ Graph + Vector RAG query
 # ---------------------------
-def delete_all_docs():
-    with driver.session() as session:
-        session.run("MATCH ()-[r]->() DELETE r")
-        session.run("MATCH (n) WHERE n:Document OR n:Chunk OR n:Entity DELETE n")
-    print("🗑️ All documents, chunks, and entities deleted from Neo4j.")
+graph_rag_query = engine.query
+graph_rag_query_stream = engine.query_stream
+graph_rag_query_async = engine.query_async
+graph_paths = engine.graph_paths
+build_communities = engine.build_communities
+graph_rag_query_global = engine.query_global
 
 # ---------------------------
-# 6️⃣ Delete a specific document
+# 5️⃣ Delete all docs & entities / 6️⃣ a specific document
 # ---------------------------
-def delete_doc(doc_name):
-    with driver.session() as session:
-        # Delete relationships of document & chunks
-        session.run("""
-            MATCH (d:Document {name: $doc_name})-[:HAS_CHUNK]->(c:Chunk)
-            OPTIONAL MATCH (c)-[r:MENTIONS]->(e:Entity)
-            DELETE r, c
-        """, doc_name=doc_name)
-
-        # Delete the document node itself
-        session.run("MATCH (d:Document {name: $doc_name}) DELETE d", doc_name=doc_name)
-
-        # Optionally delete orphan entities (not linked to any chunk)
-        session.run("""
-            MATCH (e:Entity)
-            WHERE NOT (e)<-[:MENTIONS]-(:Chunk)
-            DELETE e
-        """)
-    print(f"🗑️ Document '{doc_name}' and associated data deleted.")
\ No newline at end of file
+delete_all_docs = engine.delete_all_docs
+delete_doc = engine.delete_doc
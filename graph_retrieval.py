@@ -0,0 +1,206 @@
+from neo4j_schema import ENTITY_FULLTEXT_INDEX
+
+# ---------------------------
+# Index-backed graph retrieval
+# ---------------------------
+# Two phases: resolve seed entities through the full-text index, then expand
+# from those seeds only, one hop at a time with a per-node fan-out cap.
+STOPWORDS = frozenset("""
+    a an and are as at be by can did do does for from how i in is it its me my not of on or
+    the their there this to was were what when where which who why will with you your
+""".split())
+
+
+def fulltext_query(text):
+    """
+    Turns free text into an OR query for the Lucene index. Each term is lowercased
+    and quoted, so words like AND/OR/NOT and characters like + - : ( ) are matched
+    as text rather than parsed as operators; stopwords are dropped.
+    """
+    terms = []
+    for term in text.lower().split():
+        word = term.strip(".,;:!?'\"()[]{}")
+        if word and word not in STOPWORDS and any(ch.isalnum() for ch in word):
+            terms.append('"' + word.replace("\\", "\\\\").replace('"', '\\"') + '"')
+    return " OR ".join(dict.fromkeys(terms))
+
+
+SEED_QUERY = """
+    CALL db.index.fulltext.queryNodes($index, $search) YIELD node, score
+    RETURN node.name AS name
+    LIMIT $limit
+"""
+
+# At most $fanout distinct neighbours per frontier entity
+NEIGHBOURS_MATCH = """
+    UNWIND $frontier AS name
+    MATCH (e:Entity {name: name})
+    CALL {
+        WITH e
+        MATCH (e)--(n:Entity)
+        RETURN DISTINCT n
+        LIMIT $fanout
+    }
+"""
+EXPAND_QUERY = NEIGHBOURS_MATCH + "RETURN collect(DISTINCT n.name) AS names"
+NEIGHBOURS_QUERY = NEIGHBOURS_MATCH + "RETURN e.name AS name, collect(n.name) AS neighbours"
+
+DOCUMENTS_QUERY = """
+    UNWIND $names AS name
+    MATCH (e:Entity {name: name})<-[:MENTIONS]-(:Chunk)<-[:HAS_CHUNK]-(d:Document)
+    RETURN d.name AS doc_name, collect(DISTINCT e.name) AS related_entities
+    LIMIT $limit
+"""
+
+
+def _find_seeds(tx, topic, limit):
+    query = fulltext_query(topic)
+    if not query:
+        return []
+    result = tx.run(SEED_QUERY, index=ENTITY_FULLTEXT_INDEX, search=query, limit=limit)
+    return [record["name"] for record in result]
+
+
+def _expand(tx, frontier, fanout):
+    return tx.run(EXPAND_QUERY, frontier=frontier, fanout=fanout).single()["names"]
+
+
+def _neighbours(tx, frontier, fanout):
+    """Like _expand, but keeps which frontier entity each neighbour was reached from."""
+    result = tx.run(NEIGHBOURS_QUERY, frontier=frontier, fanout=fanout)
+    return {record["name"]: record["neighbours"] for record in result}
+
+
+def _documents_for(tx, names, limit):
+    result = tx.run(DOCUMENTS_QUERY, names=names, limit=limit)
+    return [(record["doc_name"], record["related_entities"]) for record in result]
+
+
+def _next_level(hot, hop, expanded, seen, room):
+    """
+    Entities first reached at `hop`: precomputed levels of hot seeds first, then
+    the freshly expanded ones. Returns (reached, frontier); only names found by
+    expansion are expanded again, the hot seeds' later levels cover the rest.
+    """
+    cached = dict.fromkeys(name for levels in hot.values() for name in levels[hop] if name not in seen)
+    expanded = [name for name in dict.fromkeys(expanded) if name not in seen and name not in cached]
+    reached = (list(cached) + expanded)[:room]
+    kept = set(reached)
+    return reached, [name for name in expanded if name in kept]
+
+
+class BoundedExpansion:
+    """
+    Bookkeeping of the bounded BFS, shared by the sync and async drivers: the
+    caller runs EXPAND_QUERY on `frontier` (when non-empty) and passes the result
+    to advance() until done().
+    """
+
+    def __init__(self, seeds, hops=3, fanout=25, max_entities=500, neighbourhoods=None):
+        self.hops = hops
+        self.max_entities = max_entities
+        self.hop = 0
+        self.visited = list(seeds)
+        self.seen = set(seeds)
+        self.hot = neighbourhoods.lookup(seeds, hops, fanout) if neighbourhoods is not None else {}
+        self.frontier = [name for name in seeds if name not in self.hot]
+
+    def done(self):
+        return self.hop >= self.hops or not (self.frontier or self.hot) or len(self.visited) >= self.max_entities
+
+    def advance(self, expanded):
+        reached, self.frontier = _next_level(self.hot, self.hop, expanded, self.seen,
+                                             self.max_entities - len(self.visited))
+        self.seen.update(reached)
+        self.visited.extend(reached)
+        self.hop += 1
+
+
+def expand_entities(tx, topic, hops=3, max_seeds=10, fanout=25, max_entities=500, neighbourhoods=None):
+    """
+    Bounded BFS from the seed entities for `topic`; returns entity names in visit
+    order. Seeds materialized in `neighbourhoods` (entity_neighbourhoods) are not
+    expanded here; their precomputed hop levels are merged in instead.
+    """
+    bfs = BoundedExpansion(_find_seeds(tx, topic, max_seeds), hops, fanout, max_entities, neighbourhoods)
+    while not bfs.done():
+        bfs.advance(_expand(tx, bfs.frontier, fanout) if bfs.frontier else [])
+    return bfs.visited
+
+
+def related_documents(driver, topic, hops=3, limit=5, max_seeds=10, fanout=25, neighbourhoods=None):
+    """Returns (doc_name, [entity names]) for documents mentioning entities near `topic`."""
+    def work(tx):
+        names = expand_entities(tx, topic, hops, max_seeds, fanout, neighbourhoods=neighbourhoods)
+        return _documents_for(tx, names, limit) if names else []
+
+    with driver.session() as session:
+        return session.execute_read(work)
+
+
+def graph_paths(driver, entity, hops=3, limit=10, max_seeds=5, fanout=25):
+    """
+    Paths of up to `hops` relationships starting at the seed entities for `entity`,
+    shortest first. Walks the same bounded BFS as expand_entities (at most `fanout`
+    neighbours per node, each entity reached once) instead of matching every
+    variable-length path.
+    """
+    def work(tx):
+        frontier = [[name] for name in _find_seeds(tx, entity, max_seeds)]
+        seen = {path[0] for path in frontier}
+        paths = []
+        for _ in range(hops):
+            if not frontier or len(paths) >= limit:
+                break
+            neighbours = _neighbours(tx, [path[-1] for path in frontier], fanout)
+            extended = []
+            for path in frontier:
+                for name in neighbours.get(path[-1], []):
+                    if name not in seen:
+                        seen.add(name)
+                        extended.append(path + [name])
+            paths.extend(extended)
+            frontier = extended[:limit]
+        return paths[:limit]
+
+    with driver.session() as session:
+        return session.execute_read(work)
+
+
+# ---------------------------
+# Async variants (neo4j.AsyncDriver)
+# ---------------------------
+async def _find_seeds_async(tx, topic, limit):
+    query = fulltext_query(topic)
+    if not query:
+        return []
+    result = await tx.run(SEED_QUERY, index=ENTITY_FULLTEXT_INDEX, search=query, limit=limit)
+    return [record["name"] async for record in result]
+
+
+async def _expand_async(tx, frontier, fanout):
+    result = await tx.run(EXPAND_QUERY, frontier=frontier, fanout=fanout)
+    return (await result.single())["names"]
+
+
+async def _documents_for_async(tx, names, limit):
+    result = await tx.run(DOCUMENTS_QUERY, names=names, limit=limit)
+    return [(record["doc_name"], record["related_entities"]) async for record in result]
+
+
+async def expand_entities_async(tx, topic, hops=3, max_seeds=10, fanout=25, max_entities=500, neighbourhoods=None):
+    bfs = BoundedExpansion(await _find_seeds_async(tx, topic, max_seeds), hops, fanout, max_entities, neighbourhoods)
+    while not bfs.done():
+        bfs.advance(await _expand_async(tx, bfs.frontier, fanout) if bfs.frontier else [])
+    return bfs.visited
+
+
+async def related_documents_async(async_driver, topic, hops=3, limit=5, max_seeds=10, fanout=25, max_entities=500,
+                                  neighbourhoods=None):
+    """Async counterpart of related_documents for use with neo4j.AsyncGraphDatabase drivers."""
+    async def work(tx):
+        names = await expand_entities_async(tx, topic, hops, max_seeds, fanout, max_entities, neighbourhoods)
+        return await _documents_for_async(tx, names, limit) if names else []
+
+    async with async_driver.session() as session:
+        return await session.execute_read(work)
@@ -0,0 +1,87 @@
+import argparse, hashlib, json, os
+
+# ---------------------------
+# Ingestion manifest
+# ---------------------------
+DEFAULT_MANIFEST_PATH = os.path.join(".cache", "ingest_manifest.json")
+
+
+def sha256_file(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class IngestManifest:
+    """
+    Records size, mtime, SHA-256, chunk count and model version for every
+    ingested file, and diffs that record against a folder. Files whose size and
+    mtime are unchanged are not re-hashed.
+    """
+
+    def __init__(self, path=DEFAULT_MANIFEST_PATH):
+        self.path = path
+        self.files = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.files = json.load(f).get("files", {})
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"files": self.files}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def diff(self, folder_path="uploads", model_version=None):
+        """Returns (added, modified, removed) filenames plus the fresh stat/hash records."""
+        current = {}
+        added, modified = [], []
+        filenames = sorted(f for f in os.listdir(folder_path) if f.endswith((".pdf", ".txt"))) \
+            if os.path.isdir(folder_path) else []
+
+        for filename in filenames:
+            stat = os.stat(os.path.join(folder_path, filename))
+            record = {"size": stat.st_size, "mtime": stat.st_mtime}
+            old = self.files.get(filename)
+            if old and old["size"] == record["size"] and old["mtime"] == record["mtime"]:
+                record["sha256"] = old["sha256"]
+            else:
+                record["sha256"] = sha256_file(os.path.join(folder_path, filename))
+            current[filename] = record
+
+            if old is None:
+                added.append(filename)
+            elif old["sha256"] != record["sha256"] or old.get("model") != model_version:
+                modified.append(filename)
+
+        removed = sorted(set(self.files) - set(current))
+        return added, modified, removed, current
+
+    def record(self, filename, stat_record, chunks, model_version):
+        self.files[filename] = dict(stat_record, chunks=chunks, model=model_version)
+
+    def forget(self, filename):
+        self.files.pop(filename, None)
+
+    def clear(self):
+        self.files = {}
+        self.save()
+
+
+# ---------------------------
+# CLI: python ingest_manifest.py sync
+# ---------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Diff-based sync of an uploads folder into Neo4j + FAISS")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sync_parser = sub.add_parser("sync", help="ingest added/modified files and clean up removed ones")
+    sync_parser.add_argument("folder", nargs="?", default="uploads")
+    sync_parser.add_argument("--dry-run", action="store_true", help="only print what would change")
+    args = parser.parse_args()
+
+    import graph_rag_app_streamlit as rag
+    result = rag.sync_uploads(args.folder, dry_run=args.dry_run)
+    print(json.dumps(result, indent=2))
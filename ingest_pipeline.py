@@ -0,0 +1,120 @@
+import queue, threading, time
+
+# ---------------------------
+# Streaming ingestion pipeline
+# ---------------------------
+# page -> chunk -> embedding -> sinks, one thread per stage, connected by
+# bounded queues. A full queue blocks the stage feeding it (back-pressure), so
+# at most `queue_size` items wait between any two stages no matter how large
+# the corpus is.
+DONE = object()
+
+
+class PipelineError(RuntimeError):
+    pass
+
+
+def _put(q, item, stop):
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(q, stop):
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return DONE
+
+
+def run_pipeline(documents, split, embed, sinks, queue_size=32, batch_size=64):
+    """
+    documents: iterable of page Documents (consumed lazily)
+    split:     page -> list of chunk Documents
+    embed:     list of texts -> list of vectors
+    sinks:     callables taking (chunks, vectors), each fed every embedded batch
+
+    Returns a stats dict with counts, total time and time until the first batch
+    reached every sink. The first exception raised by any stage stops the
+    pipeline and is re-raised here.
+    """
+    stop = threading.Event()
+    errors = []
+    stats = {"pages": 0, "chunks": 0, "batches": 0, "first_batch_s": None}
+    start = time.perf_counter()
+
+    pages_q = queue.Queue(maxsize=queue_size)
+    chunks_q = queue.Queue(maxsize=queue_size * batch_size)
+    sink_qs = [queue.Queue(maxsize=queue_size) for _ in sinks]
+    sink_done = [0] * len(sinks)
+
+    def guarded(fn):
+        def run():
+            try:
+                fn()
+            except Exception as e:
+                errors.append(e)
+                stop.set()
+        return run
+
+    def load_stage():
+        for page in documents:
+            if not _put(pages_q, page, stop):
+                return
+            stats["pages"] += 1
+        _put(pages_q, DONE, stop)
+
+    def split_stage():
+        while (page := _get(pages_q, stop)) is not DONE:
+            for chunk in split(page):
+                if not _put(chunks_q, chunk, stop):
+                    return
+        _put(chunks_q, DONE, stop)
+
+    def embed_stage():
+        def flush(batch):
+            vectors = embed([chunk.page_content for chunk in batch])
+            for q in sink_qs:
+                if not _put(q, (batch, vectors), stop):
+                    return
+            stats["chunks"] += len(batch)
+            stats["batches"] += 1
+
+        batch = []
+        while (chunk := _get(chunks_q, stop)) is not DONE:
+            batch.append(chunk)
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+        for q in sink_qs:
+            _put(q, DONE, stop)
+
+    def sink_stage(i):
+        def run():
+            while (item := _get(sink_qs[i], stop)) is not DONE:
+                sinks[i](*item)
+                sink_done[i] += 1
+                if stats["first_batch_s"] is None and min(sink_done) > 0:
+                    stats["first_batch_s"] = time.perf_counter() - start
+        return run
+
+    stages = [load_stage, split_stage, embed_stage] + [sink_stage(i) for i in range(len(sinks))]
+    threads = [threading.Thread(target=guarded(stage), daemon=True) for stage in stages]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        raise PipelineError(f"Ingestion pipeline failed: {errors[0]}") from errors[0]
+
+    stats["elapsed_s"] = time.perf_counter() - start
+    return stats
@@ -0,0 +1,41 @@
+import time
+
+# ---------------------------
+# Batched UNWIND writes
+# ---------------------------
+DEFAULT_BATCH_SIZE = 500
+
+
+def _write_batch(tx, query, rows):
+    tx.run(f"UNWIND $rows AS row\n{query}", rows=rows).consume()
+
+
+def write_batches(driver, query, rows, batch_size=DEFAULT_BATCH_SIZE, label="rows"):
+    """
+    Writes `rows` (a list of dicts) with `UNWIND $rows AS row` followed by `query`,
+    one explicit write transaction per batch. Returns the number of rows written
+    and prints the throughput so the batch size can be tuned.
+    """
+    if not rows:
+        return 0
+
+    start = time.perf_counter()
+    written = 0
+    with driver.session() as session:
+        for i in range(0, len(rows), batch_size):
+            batch = rows[i:i + batch_size]
+            session.execute_write(_write_batch, query, batch)
+            written += len(batch)
+
+    elapsed = time.perf_counter() - start
+    rate = written / elapsed if elapsed > 0 else float("inf")
+    print(f"⚡ Wrote {written} {label} in {elapsed:.2f}s ({rate:.0f} rows/s, batch_size={batch_size})")
+    return written
+
+
+def group_by(rows, key):
+    """Groups rows by `row[key]`, e.g. triples by relationship type."""
+    groups = {}
+    for row in rows:
+        groups.setdefault(row[key], []).append(row)
+    return groups
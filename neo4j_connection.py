@@ -0,0 +1,185 @@
+import os, threading
+
+# ---------------------------
+# Neo4j connection management
+# ---------------------------
+# config.py builds its drivers here so pool size, timeouts, keep-alive and
+# fetch size are set in one place (or from NEO4J_* environment variables):
+#
+#   from neo4j_connection import build_driver, build_async_driver
+#   driver = build_driver("neo4j://localhost:7687", ("neo4j", "neo4j123"))
+#   async_driver = build_async_driver("neo4j://localhost:7687", ("neo4j", "neo4j123"))
+#
+# Sessions stay short-lived (one per unit of work, as the driver recommends);
+# they borrow connections from the shared pool, so opening one is cheap. Use a
+# neo4j:// URI against a cluster so execute_read() work is routed to followers.
+POOL_SETTINGS = {
+    # driver keyword: (environment variable, type, default)
+    "max_connection_pool_size": ("NEO4J_MAX_POOL_SIZE", int, 50),
+    "connection_acquisition_timeout": ("NEO4J_ACQUISITION_TIMEOUT", float, 30.0),
+    "connection_timeout": ("NEO4J_CONNECTION_TIMEOUT", float, 15.0),
+    "max_connection_lifetime": ("NEO4J_MAX_CONNECTION_LIFETIME", float, 3600.0),
+    "max_transaction_retry_time": ("NEO4J_MAX_RETRY_TIME", float, 30.0),
+    "keep_alive": ("NEO4J_KEEP_ALIVE", lambda v: v.lower() not in ("0", "false", "no"), True),
+    "fetch_size": ("NEO4J_FETCH_SIZE", int, 1000),
+}
+
+
+def pool_settings(**overrides):
+    """Driver keyword arguments: explicit overrides, then NEO4J_* variables, then defaults."""
+    settings = {}
+    for key, (var, cast, default) in POOL_SETTINGS.items():
+        if key in overrides:
+            settings[key] = overrides.pop(key)
+        elif var in os.environ:
+            settings[key] = cast(os.environ[var])
+        else:
+            settings[key] = default
+    settings.update(overrides)
+    return settings
+
+
+def _connection_args(uri, auth):
+    uri = uri or os.environ.get("NEO4J_URI", "bolt://localhost:7687")
+    if auth is None:
+        auth = (os.environ.get("NEO4J_USER", "neo4j"), os.environ.get("NEO4J_PASSWORD", "neo4j123"))
+    return uri, auth
+
+
+def build_driver(uri=None, auth=None, database=None, **overrides):
+    from neo4j import GraphDatabase
+    uri, auth = _connection_args(uri, auth)
+    settings = pool_settings(**overrides)
+    return InstrumentedDriver(GraphDatabase.driver(uri, auth=auth, **settings), database=database,
+                              fetch_size=settings["fetch_size"], max_pool_size=settings["max_connection_pool_size"])
+
+
+def build_async_driver(uri=None, auth=None, **overrides):
+    from neo4j import AsyncGraphDatabase
+    uri, auth = _connection_args(uri, auth)
+    return AsyncGraphDatabase.driver(uri, auth=auth, **pool_settings(**overrides))
+
+
+# ---------------------------
+# Instrumented driver
+# ---------------------------
+class _TrackedSession:
+    def __init__(self, session, owner):
+        self.session = session
+        self.owner = owner
+        self.closed = False
+
+    def __enter__(self):
+        self.session.__enter__()
+        return self.session
+
+    def __exit__(self, *exc):
+        try:
+            return self.session.__exit__(*exc)
+        finally:
+            self._release()
+
+    def close(self):
+        try:
+            self.session.close()
+        finally:
+            self._release()
+
+    def _release(self):
+        if not self.closed:
+            self.closed = True
+            self.owner._session_closed()
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+
+class InstrumentedDriver:
+    """
+    Wraps a neo4j.Driver: applies the default database and fetch size to every
+    session, counts open sessions, and reports pool utilisation via metrics().
+    Everything else is passed through to the wrapped driver.
+    """
+
+    def __init__(self, driver, database=None, fetch_size=None, max_pool_size=None):
+        self.driver = driver
+        self.database = database
+        self.fetch_size = fetch_size
+        self.max_pool_size = max_pool_size
+        self.lock = threading.Lock()
+        self.sessions_open = 0
+        self.sessions_peak = 0
+        self.sessions_total = 0
+
+    def session(self, **kwargs):
+        if self.database:
+            kwargs.setdefault("database", self.database)
+        if self.fetch_size:
+            kwargs.setdefault("fetch_size", self.fetch_size)
+        with self.lock:
+            self.sessions_open += 1
+            self.sessions_total += 1
+            self.sessions_peak = max(self.sessions_peak, self.sessions_open)
+        return _TrackedSession(self.driver.session(**kwargs), self)
+
+    def _session_closed(self):
+        with self.lock:
+            self.sessions_open -= 1
+
+    def read(self, work, *args, **kwargs):
+        """Runs `work(tx, ...)` in a managed read transaction (routed to followers on a cluster)."""
+        with self.session() as session:
+            return session.execute_read(work, *args, **kwargs)
+
+    def write(self, work, *args, **kwargs):
+        with self.session() as session:
+            return session.execute_write(work, *args, **kwargs)
+
+    def metrics(self):
+        with self.lock:
+            metrics = {
+                "sessions_open": self.sessions_open,
+                "sessions_peak": self.sessions_peak,
+                "sessions_total": self.sessions_total,
+            }
+        metrics.update(pool_metrics(self))
+        return metrics
+
+    def __getattr__(self, name):
+        return getattr(self.driver, name)
+
+
+def pool_metrics(driver):
+    """
+    Pool utilisation. Per-server connection counts come from the neo4j driver's
+    pool internals when this driver version has them; otherwise the open
+    session count of an InstrumentedDriver (each session holds at most one
+    connection) stands in for connections in use. {} when neither is available.
+    """
+    inner = getattr(driver, "driver", driver)
+    try:
+        pool = inner._pool
+        max_size = pool.pool_config.max_connection_pool_size
+        servers = {}
+        for address in list(pool.connections):
+            in_use = pool.in_use_connection_count(address)
+            total = len(pool.connections.get(address, ()))
+            servers[str(address)] = {
+                "in_use": in_use,
+                "idle": total - in_use,
+                "utilization": in_use / max_size if max_size else 0.0,
+            }
+        return {"max_pool_size": max_size, "servers": servers}
+    except Exception:
+        # Private API: absent or changed in this driver version, or a stand-in driver
+        pass
+
+    sessions_open = getattr(driver, "sessions_open", None)
+    if sessions_open is None:
+        return {}
+    max_size = getattr(driver, "max_pool_size", None)
+    return {
+        "max_pool_size": max_size,
+        "in_use": sessions_open,
+        "utilization": sessions_open / max_size if max_size else None,
+    }
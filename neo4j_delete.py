@@ -0,0 +1,105 @@
+import time
+
+# ---------------------------
+# Batched deletes
+# ---------------------------
+# Every delete runs as `CALL { ... } IN TRANSACTIONS OF n ROWS` so no single
+# transaction has to hold more than `batch_size` rows, and only touches this
+# app's labels (Document, Chunk, Entity and relationships between entities).
+# The outer loop takes `batch_size * batches_per_round` rows per round trip so
+# progress can be printed while a large delete is still running.
+# CALL ... IN TRANSACTIONS needs an auto-commit transaction, hence session.run.
+DEFAULT_DELETE_BATCH_SIZE = 1000
+BATCHES_PER_ROUND = 10
+
+
+def _delete_rounds(session, match, delete, label, batch_size, batches_per_round=BATCHES_PER_ROUND, **params):
+    """
+    Repeats `match` (which must bind `x`) + batched `delete` until nothing
+    matches. Returns the total number of rows deleted.
+    """
+    query = f"""
+        {match}
+        WITH x LIMIT $round_size
+        CALL {{ WITH x {delete} }} IN TRANSACTIONS OF {int(batch_size)} ROWS
+        RETURN count(*) AS deleted
+    """
+    total = 0
+    start = time.perf_counter()
+    while True:
+        deleted = session.run(query, round_size=batch_size * batches_per_round, **params).single()["deleted"]
+        if not deleted:
+            break
+        total += deleted
+        print(f"   🗑️ {label}: {total} deleted ({time.perf_counter() - start:.1f}s)")
+    return total
+
+
+def delete_communities(driver, batch_size=DEFAULT_DELETE_BATCH_SIZE, run=None, keep_run=None):
+    """
+    Deletes :Community nodes (rebuilt by communities.build_communities): all of
+    them, only those of build `run`, or all except those of build `keep_run`.
+    """
+    if run is not None:
+        match = "MATCH (x:Community {run: $run})"
+    elif keep_run is not None:
+        match = "MATCH (x:Community) WHERE x.run IS NULL OR x.run <> $keep_run"
+    else:
+        match = "MATCH (x:Community)"
+    with driver.session() as session:
+        return _delete_rounds(session, match, "DETACH DELETE x", "communities", batch_size,
+                              run=run, keep_run=keep_run)
+
+
+def delete_all(driver, batch_size=DEFAULT_DELETE_BATCH_SIZE):
+    """Deletes every Document, Chunk, Entity and Community node. Returns per-label counts."""
+    counts = {}
+    with driver.session() as session:
+        # Chunks first: their MENTIONS/HAS_CHUNK relationships go with them
+        counts["chunks"] = _delete_rounds(
+            session, "MATCH (x:Chunk)", "DETACH DELETE x", "chunks", batch_size)
+        # Entity-to-entity relationships before entities, so a highly connected
+        # entity doesn't drag thousands of relationships into one transaction
+        counts["relationships"] = _delete_rounds(
+            session, "MATCH (:Entity)-[x]->(:Entity)", "DELETE x", "entity relationships", batch_size)
+        counts["entities"] = _delete_rounds(
+            session, "MATCH (x:Entity)", "DETACH DELETE x", "entities", batch_size)
+        counts["documents"] = _delete_rounds(
+            session, "MATCH (x:Document)", "DETACH DELETE x", "documents", batch_size)
+        counts["communities"] = _delete_rounds(
+            session, "MATCH (x:Community)", "DETACH DELETE x", "communities", batch_size)
+    return counts
+
+
+def delete_document(driver, doc_name, batch_size=DEFAULT_DELETE_BATCH_SIZE):
+    """
+    Deletes one Document, its chunks, and the entities that only its chunks
+    mentioned. Orphan checks are limited to entities the deleted chunks touched.
+    Returns per-label counts.
+    """
+    counts = {}
+    with driver.session() as session:
+        touched = session.run("""
+            MATCH (:Document {name: $doc_name})-[:HAS_CHUNK]->(:Chunk)-[:MENTIONS]->(e:Entity)
+            RETURN collect(DISTINCT e.name) AS names
+        """, doc_name=doc_name).single()["names"]
+
+        counts["chunks"] = _delete_rounds(
+            session, "MATCH (:Document {name: $doc_name})-[:HAS_CHUNK]->(x:Chunk)", "DETACH DELETE x",
+            "chunks", batch_size, doc_name=doc_name)
+        session.run("MATCH (d:Document {name: $doc_name}) DETACH DELETE d", doc_name=doc_name).consume()
+
+        # Orphans among the touched entities only; the name list is sent in
+        # slices so a document that mentions millions of entities stays bounded
+        counts["entities"] = 0
+        for i in range(0, len(touched), batch_size * BATCHES_PER_ROUND):
+            counts["entities"] += _delete_rounds(
+                session,
+                """
+                UNWIND $names AS name
+                MATCH (x:Entity {name: name})
+                WHERE NOT (x)<-[:MENTIONS]-(:Chunk)
+                """,
+                "DETACH DELETE x", "orphan entities", batch_size,
+                names=touched[i:i + batch_size * BATCHES_PER_ROUND])
+    return counts
@@ -0,0 +1,72 @@
+# ---------------------------
+# Constraints & indexes
+# ---------------------------
+# Uniqueness constraints give MERGE on these keys an index seek instead of a label scan
+SCHEMA_STATEMENTS = [
+    "CREATE CONSTRAINT document_name IF NOT EXISTS FOR (d:Document) REQUIRE d.name IS UNIQUE",
+    "CREATE CONSTRAINT chunk_id IF NOT EXISTS FOR (c:Chunk) REQUIRE c.id IS UNIQUE",
+    "CREATE CONSTRAINT entity_name IF NOT EXISTS FOR (e:Entity) REQUIRE e.name IS UNIQUE",
+    "CREATE CONSTRAINT community_id IF NOT EXISTS FOR (c:Community) REQUIRE c.id IS UNIQUE",
+    "CREATE FULLTEXT INDEX entity_name_fulltext IF NOT EXISTS FOR (e:Entity) ON EACH [e.name]",
+]
+
+ENTITY_FULLTEXT_INDEX = "entity_name_fulltext"
+CHUNK_VECTOR_INDEX = "chunk_embedding"
+
+
+def index_status(driver):
+    """Returns name, type, state and population percentage for every index."""
+    with driver.session() as session:
+        result = session.run("""
+            SHOW INDEXES
+            YIELD name, type, labelsOrTypes, properties, state, populationPercent
+            RETURN name, type, labelsOrTypes, properties, state, populationPercent
+            ORDER BY name
+        """)
+        return [record.data() for record in result]
+
+
+def ensure_schema(driver, wait=True, timeout=300):
+    """
+    Idempotently creates the constraints and the full-text index used by ingestion
+    and retrieval, optionally waits for them to come online, and prints their
+    population status.
+    """
+    with driver.session() as session:
+        for statement in SCHEMA_STATEMENTS:
+            try:
+                session.run(statement).consume()
+            except Exception as e:
+                # Usually duplicate nodes created before the constraint existed
+                print(f"⚠️ Could not apply schema statement '{statement}': {e}")
+
+        if wait:
+            try:
+                session.run("CALL db.awaitIndexes($timeout)", timeout=timeout).consume()
+            except Exception as e:
+                print(f"⚠️ Indexes still populating after {timeout}s: {e}")
+
+    statuses = index_status(driver)
+    for index in statuses:
+        print(f"📇 {index['name']} ({index['type']}): {index['state']}, {index['populationPercent']:.0f}% populated")
+    return statuses
+
+
+def ensure_vector_index(driver, dimensions, similarity="cosine", timeout=300):
+    """
+    Creates the Neo4j 5 vector index over Chunk.embedding (dimensions are only
+    known once the first batch is embedded) and waits for it to come online.
+    """
+    with driver.session() as session:
+        session.run(f"""
+            CREATE VECTOR INDEX {CHUNK_VECTOR_INDEX} IF NOT EXISTS
+            FOR (c:Chunk) ON (c.embedding)
+            OPTIONS {{indexConfig: {{
+                `vector.dimensions`: {int(dimensions)},
+                `vector.similarity_function`: '{similarity}'
+            }}}}
+        """).consume()
+        try:
+            session.run("CALL db.awaitIndex($name, $timeout)", name=CHUNK_VECTOR_INDEX, timeout=timeout).consume()
+        except Exception as e:
+            print(f"⚠️ Vector index still populating after {timeout}s: {e}")
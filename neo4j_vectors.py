@@ -0,0 +1,131 @@
+from langchain_core.documents import Document
+from graph_retrieval import _documents_for, expand_entities
+from neo4j_batch import DEFAULT_BATCH_SIZE, write_batches
+from neo4j_schema import CHUNK_VECTOR_INDEX
+
+# ---------------------------
+# Chunk embeddings in Neo4j
+# ---------------------------
+# Vectors are stored on the :Chunk nodes themselves (as float32 via
+# db.create.setNodeVectorProperty) and searched with the Neo4j 5 vector index,
+# so every app replica sees the same index and vector hits can be joined with
+# the graph in the same transaction.
+EMBEDDING_QUERY = """
+    MATCH (c:Chunk {id: row.chunk_id})
+    CALL db.create.setNodeVectorProperty(c, 'embedding', row.embedding)
+"""
+
+VECTOR_SEARCH_QUERY = """
+    CALL db.index.vector.queryNodes($index, $k, $vector) YIELD node, score
+    OPTIONAL MATCH (d:Document)-[:HAS_CHUNK]->(node)
+    RETURN node.id AS chunk_id, node.text AS text, d.name AS source, score
+    ORDER BY score DESC
+"""
+
+# Vector hits seed the graph: entities they MENTION are expanded up to `hops`
+# entity-to-entity hops, and chunks mentioning the reached entities join the
+# candidates. proximity = hit score / (distance + 1); a chunk's final score is
+# its own vector score plus graph_weight * its best proximity. Hits are not
+# their own neighbours, so only chunks the graph adds get a graph_score. The
+# hop count can't be a parameter in a variable-length pattern, so it is
+# interpolated.
+EXPANDED_SEARCH_QUERY = """
+    CALL db.index.vector.queryNodes($index, $k, $vector) YIELD node, score
+    WITH collect({{chunk: node, score: score}}) AS hits
+    CALL {{
+        WITH hits
+        WITH hits, [h IN hits | h.chunk] AS hit_chunks
+        UNWIND hits AS hit
+        WITH hit_chunks, hit.chunk AS chunk, hit.score AS score
+        MATCH (chunk)-[:MENTIONS]->(seed:Entity)
+        CALL {{
+            WITH seed
+            MATCH p = (seed)-[*0..{hops}]-(e:Entity)
+            WHERE all(n IN nodes(p) WHERE n:Entity)
+            WITH e, length(p) AS dist
+            LIMIT $max_paths
+            WITH e, min(dist) AS dist
+            ORDER BY dist
+            LIMIT $fanout
+            RETURN e, dist
+        }}
+        WITH hit_chunks, e, max(score / (dist + 1.0)) AS proximity
+        ORDER BY proximity DESC
+        LIMIT $max_entities
+        MATCH (e)<-[:MENTIONS]-(c:Chunk)
+        WHERE NOT c IN hit_chunks
+        WITH c, max(proximity) AS proximity, collect(e.name)[..5] AS via
+        ORDER BY proximity DESC, size(via) DESC
+        LIMIT $max_neighbours
+        RETURN collect({{chunk: c, vector_score: 0.0, graph_score: proximity, via: via}}) AS neighbours
+    }}
+    UNWIND [h IN hits | {{chunk: h.chunk, vector_score: h.score, graph_score: 0.0, via: []}}] + neighbours AS candidate
+    WITH candidate.chunk AS c, max(candidate.vector_score) AS vector_score,
+         max(candidate.graph_score) AS graph_score, collect(candidate.via) AS via
+    WITH c, vector_score, graph_score, reduce(names = [], v IN via | names + v) AS via,
+         vector_score + $graph_weight * graph_score AS score
+    ORDER BY score DESC
+    LIMIT $limit
+    OPTIONAL MATCH (d:Document)-[:HAS_CHUNK]->(c)
+    RETURN c.id AS chunk_id, c.text AS text, d.name AS source, score, vector_score, graph_score, via
+"""
+
+
+def write_embeddings(driver, rows, batch_size=DEFAULT_BATCH_SIZE):
+    """rows: [{"chunk_id": ..., "embedding": [...]}]; chunks must already exist."""
+    return write_batches(driver, EMBEDDING_QUERY, rows, batch_size, label="chunk embeddings")
+
+
+def _vector_hits(tx, vector, k):
+    result = tx.run(VECTOR_SEARCH_QUERY, index=CHUNK_VECTOR_INDEX, k=k, vector=vector)
+    return [
+        Document(page_content=record["text"] or "",
+                 metadata={"source": record["source"], "chunk_id": record["chunk_id"], "score": record["score"]})
+        for record in result
+    ]
+
+
+def vector_search(driver, vector, k=3):
+    """Top-k chunks for a query vector as langchain Documents (score in metadata)."""
+    with driver.session() as session:
+        return session.execute_read(_vector_hits, vector, k)
+
+
+def vector_and_graph_search(driver, vector, topic, k_vector=3, k_graph=5, hops=3, fanout=25, neighbourhoods=None):
+    """
+    Vector hits and the bounded graph expansion for `topic` in one managed read
+    transaction (one pooled connection, follower-routable). Returns
+    (documents, [(doc_name, [entity names])]).
+    """
+    def work(tx):
+        docs = _vector_hits(tx, vector, k_vector)
+        names = expand_entities(tx, topic, hops, fanout=fanout, neighbourhoods=neighbourhoods)
+        return docs, (_documents_for(tx, names, k_graph) if names else [])
+
+    with driver.session() as session:
+        return session.execute_read(work)
+
+
+def expanded_search(driver, vector, k_vector=3, k_graph=5, hops=2, fanout=25, graph_weight=0.5,
+                    max_entities=200, max_paths=1000):
+    """
+    Top `k_vector` vector hits plus up to `k_graph` chunks reached from them through
+    MENTIONS and entity hops, ranked by the combined score, in one query. Documents
+    carry score, vector_score, graph_score and the linking entities (`via`) in metadata.
+    """
+    query = EXPANDED_SEARCH_QUERY.format(hops=int(hops))
+    params = dict(index=CHUNK_VECTOR_INDEX, k=k_vector, vector=vector, fanout=fanout, graph_weight=graph_weight,
+                  max_entities=max_entities, max_paths=max_paths, max_neighbours=k_vector + k_graph,
+                  limit=k_vector + k_graph)
+
+    def work(tx):
+        return [
+            Document(page_content=record["text"] or "",
+                     metadata={"source": record["source"], "chunk_id": record["chunk_id"], "score": record["score"],
+                               "vector_score": record["vector_score"], "graph_score": record["graph_score"],
+                               "via": record["via"]})
+            for record in tx.run(query, **params)
+        ]
+
+    with driver.session() as session:
+        return session.execute_read(work)
@@ -1,79 +1,57 @@
 import os
-from langchain_community.document_loaders import PyPDFLoader, TextLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_community.vectorstores import FAISS
 from config import embeddings, llm
-
-vectorstore = None
+from rag_engine import RagEngine
 
 # ---------------------------
-# 1️⃣ Load & split documents
+# Plain RAG backend (strict docs-only)
 # ---------------------------
-def load_documents(folder_path="uploads"):
-    docs = []
-    for filename in os.listdir(folder_path):
-        path = os.path.join(folder_path, filename)
-        if filename.endswith(".pdf"):
-            loader = PyPDFLoader(path)
-        elif filename.endswith(".txt"):
-            loader = TextLoader(path)
-        else:
-            continue
-        docs.extend(loader.load())
-    print(f"✅ Loaded {len(docs)} documents")
-    return docs
+# Vector-only engine with the strict prompt; see rag_engine for the pipeline.
+INDEX_DIR = os.path.join("vector_store", "plain_rag")
+
+engine = RagEngine(embeddings, llm, retriever="vector", prompt="strict", index_dir=INDEX_DIR,
+                   manifest_path=os.path.join(".cache", "plain_rag_manifest.json"))
+
+embeddings = engine.embeddings
+index_manager = engine.index_manager
+answer_cache = engine.answer_cache
 
 
-def split_documents(docs):
-    splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=100)
-    return splitter.split_documents(docs)
+def __getattr__(name):
+    # `vectorstore` follows the engine's index instead of being a stale module global
+    if name == "vectorstore":
+        return engine.vectorstore
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
+# ---------------------------
+# 1️⃣ Load & split documents
+# ---------------------------
+load_documents = engine.load_documents
+split_documents = engine.split_documents
+
 # ---------------------------
 # 2️⃣ Build FAISS vectorstore
 # ---------------------------
-def build_vectorstore(chunks):
-    global vectorstore
-    print("🔧 Building vector index...")
-    vectorstore = FAISS.from_documents(chunks, embeddings)
-    print("✅ Vectorstore built successfully")
-    return vectorstore
+build_vectorstore = engine.build_vectorstore
+delete_doc = engine.delete_doc
+delete_all_docs = engine.delete_all_docs
 
 
 # ---------------------------
 # 3️⃣ Strict docs-only RAG query
 # ---------------------------
-def rag_query_strict(question, k=3):
+def rag_query_strict(question, k=3, use_cache=True):
     """
     Returns an answer strictly based on uploaded documents.
     If no relevant chunks found, returns a warning.
     """
-    global vectorstore
-    if vectorstore is None:
-        raise ValueError("Vectorstore not built yet!")
+    return engine.query(question, k_vector=k, use_cache=use_cache)
 
-    # Retrieve top-k relevant chunks using vectorstore directly
-    docs = vectorstore.similarity_search(question, k=k)
 
-    if not docs:
-        return f"⚠️ No information about '{question}' found in the uploaded documents."
-
-    # Concatenate chunk texts
-    context = "\n\n".join([d.page_content for d in docs])
-
-    # Construct prompt
-    prompt = f"""
-You are a helpful assistant.
-Answer strictly based on the below context only.
-If the context does not contain the answer, say "Information not found in uploaded documents."
-
-Context:
-{context}
-
-Question: {question}
-Answer:
-"""
-
-    # Generate answer using LLM
-    response = llm.invoke([{"role": "user", "content": prompt}])
-    return response.content
\ No newline at end of file
+def rag_query_strict_stream(question, k=3, use_cache=True):
+    """
+    Streaming variant of rag_query_strict: returns the retrieved chunks up front
+    (metadata["docs"], also for a cached answer) and a generator yielding answer
+    tokens as the LLM produces them.
+    """
+    return engine.query_stream(question, k_vector=k, use_cache=use_cache)
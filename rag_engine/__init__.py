@@ -0,0 +1,4 @@
+from .engine import RagEngine, CHUNK_QUERY, TRIPLE_QUERY, TripleWriteError, chunk_id_of, triple_rows
+from .prompts import PROMPTS, DocsPrompt, StrictPrompt
+from .retrievers import (RETRIEVERS, Retrieval, VectorRetriever, GraphRetriever, HybridRetriever,
+                         Neo4jVectorRetriever, Neo4jHybridRetriever, Neo4jExpandRetriever, build_retriever)
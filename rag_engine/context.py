@@ -0,0 +1,203 @@
+import numpy as np
+from langchain_core.documents import Document
+from tracing import span
+from .retrievers import Retrieval
+
+# ---------------------------
+# Token-budgeted context assembly
+# ---------------------------
+# Sits between a retriever and the prompt: drops duplicate chunks, reranks
+# the rest (MMR over cached embeddings, with the retriever's own score as the
+# relevance term when it gives one, or a local cross-encoder), trims the
+# text neighbouring chunks share through chunk_overlap, and packs the best
+# candidates into a fixed token budget so prompt size doesn't grow with
+# k_graph / k_vector / hops.
+
+
+class Tokenizer:
+    """tiktoken when installed (model's encoding, else cl100k_base); otherwise ~4 characters per token."""
+
+    def __init__(self, model=None):
+        self.encoding = None
+        try:
+            import tiktoken
+            try:
+                self.encoding = tiktoken.encoding_for_model(model or "")
+            except KeyError:
+                self.encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            # Not installed, or the BPE file can't be fetched: estimate instead
+            self.encoding = None
+
+    def count(self, text):
+        if self.encoding is None:
+            return (len(text) + 3) // 4
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text, max_tokens):
+        if max_tokens <= 0:
+            return ""
+        if self.encoding is None:
+            return text[:max_tokens * 4]
+        tokens = self.encoding.encode(text, disallowed_special=())
+        return text if len(tokens) <= max_tokens else self.encoding.decode(tokens[:max_tokens])
+
+
+def overlap_length(left, right, min_overlap=20):
+    """Length of the longest suffix of `left` that is also a prefix of `right` (0 if < min_overlap)."""
+    for size in range(min(len(left), len(right)), min_overlap - 1, -1):
+        if left.endswith(right[:size]):
+            return size
+    return 0
+
+
+def unique_docs(docs):
+    """Drops repeats of the same chunk (by chunk id, else by text), keeping the first."""
+    seen, kept = set(), []
+    for doc in docs:
+        text = doc.page_content.strip()
+        key = doc.metadata.get("chunk_id") or text
+        if text and key not in seen:
+            seen.add(key)
+            kept.append(doc)
+    return kept
+
+
+def trim_overlaps(docs, min_overlap=20):
+    """
+    Removes text a document shares with an earlier (higher-ranked) one: a chunk
+    contained in another is merged into it (at the better rank, keeping that
+    rank's metadata), and spans repeated at either end through the splitter's
+    chunk_overlap are cut.
+    """
+    kept = []
+    for doc in docs:
+        text = doc.page_content.strip()
+        merged = None
+        for idx, other in enumerate(kept):
+            if text in other.page_content:
+                text = ""
+                break
+            if other.page_content in text:
+                merged = idx
+                break
+            text = text[overlap_length(other.page_content, text, min_overlap):].lstrip()
+            cut = overlap_length(text, other.page_content, min_overlap)
+            text = text[:len(text) - cut].rstrip()
+        if merged is not None:
+            kept[merged] = Document(page_content=text, metadata=kept[merged].metadata)
+            # The larger text may also contain chunks kept after that rank
+            kept = [other for idx, other in enumerate(kept) if idx == merged or other.page_content not in text]
+        elif text:
+            kept.append(Document(page_content=text, metadata=doc.metadata))
+    return kept
+
+
+def mmr_order(relevance, vectors, lambda_mult=0.7):
+    """
+    Maximal marginal relevance: repeatedly picks the document with the best
+    lambda * relevance - (1 - lambda) * similarity to those already picked.
+    """
+    vectors = np.asarray(vectors, dtype="float32")
+    vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    similarity = vectors @ vectors.T
+    relevance = np.asarray(relevance, dtype="float32")
+    order = [int(np.argmax(relevance))]
+    redundancy = similarity[order[0]].copy()
+    while len(order) < len(relevance):
+        scores = lambda_mult * relevance - (1 - lambda_mult) * redundancy
+        scores[order] = -np.inf
+        best = int(np.argmax(scores))
+        order.append(best)
+        redundancy = np.maximum(redundancy, similarity[best])
+    return order
+
+
+class ContextAssembler:
+    """
+    `max_tokens` bounds graph + vector context together; graph lines may use up
+    to `graph_share` of it and leave the rest to chunks. `reranker` is "mmr",
+    "cross-encoder" (sentence-transformers) or None to keep retrieval order.
+    """
+
+    def __init__(self, embeddings, max_tokens=3000, reranker="mmr", mmr_lambda=0.7, graph_share=0.25,
+                 min_overlap=20, model=None, cross_encoder_model="cross-encoder/ms-marco-MiniLM-L-6-v2"):
+        self.embeddings = embeddings
+        self.max_tokens = max_tokens
+        self.reranker = reranker
+        self.mmr_lambda = mmr_lambda
+        self.graph_share = graph_share
+        self.min_overlap = min_overlap
+        self.tokenizer = Tokenizer(model)
+        self.cross_encoder_model = cross_encoder_model
+        self.cross_encoder = None
+
+    # ---------------------------
+    # Rerank
+    # ---------------------------
+    def rerank(self, question, docs):
+        if len(docs) < 2 or self.reranker is None:
+            return docs
+        if self.reranker == "cross-encoder":
+            try:
+                return self.rerank_cross_encoder(question, docs)
+            except ImportError as e:
+                print(f"⚠️ Cross-encoder unavailable ({e}); falling back to MMR")
+                self.reranker = "mmr"
+        # Both embeddings come from the cache filled at ingestion and retrieval time
+        vectors = np.array(self.embeddings.embed_documents([doc.page_content for doc in docs]), dtype="float32")
+        scores = [doc.metadata.get("score") for doc in docs]
+        if all(score is not None for score in scores):
+            # The retriever already ranked these (e.g. vector + graph proximity): keep
+            # its score as relevance, scaled to the range of cosine similarity
+            relevance = np.array(scores, dtype="float32")
+            relevance /= max(float(np.abs(relevance).max()), 1e-12)
+        else:
+            query = np.array(self.embeddings.embed_query(question), dtype="float32")
+            relevance = vectors @ query / np.maximum(np.linalg.norm(vectors, axis=1) * np.linalg.norm(query), 1e-12)
+        order = mmr_order(relevance, vectors, self.mmr_lambda)
+        return [docs[i] for i in order]
+
+    def rerank_cross_encoder(self, question, docs):
+        if self.cross_encoder is None:
+            from sentence_transformers import CrossEncoder
+            self.cross_encoder = CrossEncoder(self.cross_encoder_model)
+        scores = self.cross_encoder.predict([(question, doc.page_content) for doc in docs])
+        return [doc for _, doc in sorted(zip(scores, docs), key=lambda pair: -pair[0])]
+
+    # ---------------------------
+    # Pack
+    # ---------------------------
+    def pack(self, texts, budget):
+        """
+        Greedily keeps `texts` in rank order while they fit `budget`, skipping ones
+        that don't so a shorter, lower-ranked text can use the space. Returns
+        (kept indices, kept texts, tokens used).
+        """
+        indices, kept, used = [], [], 0
+        for idx, text in enumerate(texts):
+            tokens = self.tokenizer.count(text) + 1   # + separator
+            if used + tokens > budget:
+                # An oversized best candidate is cut down rather than leaving the context empty
+                if idx == 0 and budget > 1:
+                    indices.append(idx)
+                    kept.append(self.tokenizer.truncate(text, budget - 1))
+                    used = budget
+                continue
+            indices.append(idx)
+            kept.append(text)
+            used += tokens
+        return indices, kept, used
+
+    def assemble(self, question, retrieval):
+        with span("assemble_context", max_tokens=self.max_tokens) as attributes:
+            docs = self.rerank(question, unique_docs(retrieval.docs))
+            docs = trim_overlaps(docs, self.min_overlap)
+
+            lines = [line for line in retrieval.graph_context.splitlines() if line.strip()]
+            _, lines, graph_tokens = self.pack(lines, int(self.max_tokens * self.graph_share))
+            indices, texts, doc_tokens = self.pack([doc.page_content for doc in docs], self.max_tokens - graph_tokens)
+            packed = [Document(page_content=text, metadata=docs[idx].metadata) for idx, text in zip(indices, texts)]
+
+            attributes.update(tokens=graph_tokens + doc_tokens, docs_in=len(retrieval.docs), docs_out=len(packed))
+        return Retrieval(docs=packed, graph_context="\n".join(lines))
@@ -0,0 +1,699 @@
+import asyncio, os, queue, re, threading
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+import communities, graph_retrieval
+import neo4j_delete
+from answer_cache import AnswerCache
+from document_loading import iter_documents
+from embedding_cache import CachedEmbeddings
+from entity_neighbourhoods import NeighbourhoodIndex
+from extraction import extract_triples, extract_concurrently, get_cache, model_id
+from ingest_manifest import DEFAULT_MANIFEST_PATH, IngestManifest
+from ingest_pipeline import run_pipeline
+from neo4j_batch import DEFAULT_BATCH_SIZE, write_batches, group_by
+from neo4j_connection import InstrumentedDriver
+from neo4j_schema import ensure_schema, ensure_vector_index
+from neo4j_vectors import write_embeddings
+from tracing import configure_from_env, span, traced
+from vector_index import (VectorIndexManager, assign_chunk_ids, document_hash, embeddings_id, folder_snapshot,
+                          group_by_source)
+from .context import ContextAssembler
+from .prompts import PROMPTS
+from .retrievers import build_retriever
+
+# Span exporters, e.g. RAG_TRACING=logging,prometheus:9464,otel
+configure_from_env()
+
+# ---------------------------
+# Neo4j writes
+# ---------------------------
+CHUNK_QUERY = """
+    MERGE (d:Document {name: row.doc_name})
+    MERGE (c:Chunk {id: row.chunk_id})
+    SET c.text = row.text
+    MERGE (d)-[:HAS_CHUNK]->(c)
+"""
+
+TRIPLE_QUERY = """
+    MERGE (s:Entity {{name: row.subj}})
+    MERGE (o:Entity {{name: row.obj}})
+    MERGE (s)-[r:{rel}]->(o)
+    WITH s, o, row
+    MATCH (c:Chunk {{id: row.chunk_id}})
+    MERGE (c)-[:MENTIONS]->(s)
+    MERGE (c)-[:MENTIONS]->(o)
+"""
+
+
+class TripleWriteError(RuntimeError):
+    """Raised after ingestion when some triples could not be written to Neo4j."""
+
+    def __init__(self, failures):
+        self.failures = failures
+        total = sum(count for _, count, _ in failures)
+        rel, _, error = failures[0]
+        super().__init__(f"Failed to write {total} triples in {len(failures)} writes "
+                         f"(first: relation '{rel}': {error})")
+
+
+def triple_rows(chunk_id, triples):
+    rows = []
+    for triple in triples:
+        subj = triple.get("subject")
+        rel = triple.get("relation", "RELATED_TO")
+        obj = triple.get("object")
+        if subj and obj:
+            rel_clean = re.sub(r'[^A-Z0-9_]', '_', rel.upper())
+            rows.append({"subj": subj, "obj": obj, "rel": rel_clean, "chunk_id": chunk_id})
+    return rows
+
+
+def chunk_id_of(chunk, idx):
+    return chunk.metadata.get("chunk_id") or f"{chunk.metadata.get('source', 'unknown')}_{idx}"
+
+
+class TripleStream:
+    """
+    Runs engine.extract_and_write on a background thread over items submitted
+    by the streaming Neo4j sink, so every batch shares one extraction pool.
+    `maxsize` bounds the queued chunks; a full queue blocks the sink.
+    """
+
+    DONE = object()
+
+    def __init__(self, engine, maxsize):
+        self.engine = engine
+        self.items = queue.Queue(maxsize=maxsize)
+        self.cancelled = threading.Event()
+        self.result = None
+        self.error = None
+        self.thread = threading.Thread(target=self._run, daemon=True, name="triple-extraction")
+
+    def start(self):
+        self.thread.start()
+
+    def _iter_items(self):
+        while not self.cancelled.is_set():
+            item = self.items.get()
+            if item is self.DONE:
+                return
+            yield item
+
+    def _run(self):
+        try:
+            self.result = self.engine.extract_and_write(self._iter_items())
+        except Exception as e:
+            self.error = e
+
+    def submit(self, items):
+        for item in items:
+            while True:
+                try:
+                    self.items.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    if not self.thread.is_alive():
+                        raise RuntimeError(f"Triple extraction stopped: {self.error}") from self.error
+
+    def finish(self):
+        """Waits for the queued chunks; returns (triples written, touched names, failed writes)."""
+        self.items.put(self.DONE)
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def cancel(self):
+        """Stops after the chunks already with the LLM; returns the entity names touched so far."""
+        self.cancelled.set()
+        try:
+            self.items.put_nowait(self.DONE)
+        except queue.Full:
+            pass
+        self.thread.join()
+        return self.result[1] if self.result else set()
+
+
+class RagEngine:
+    """
+    Load → split → store (Neo4j) → embed (FAISS) → retrieve → answer, shared by
+    every frontend. `retriever` picks how context is gathered ("vector", "graph"
+    or "hybrid", see retrievers.RETRIEVERS) and `prompt` how it is turned into
+    LLM messages ("docs" or "strict"). Without a driver the engine is vector-only
+    and every Neo4j step is skipped. With `neo4j_vectors` chunk embeddings are
+    also written to the Neo4j vector index, which the "neo4j_vector" and
+    "neo4j_hybrid" retrievers search instead of FAISS. The k-hop neighbourhoods
+    of the `hot_entities` most-mentioned entities are kept materialized for the
+    graph retrievers (0 turns this off). Retrieved context is deduplicated,
+    reranked (`reranker`: "mmr", "cross-encoder" or None) and packed into
+    `context_tokens` before it reaches the prompt (None sends it all).
+    """
+
+    def __init__(self, embeddings, llm, driver=None, async_driver=None, retriever="hybrid", prompt="docs",
+                 index_dir=os.path.join("vector_store", "graph_rag"), manifest_path=DEFAULT_MANIFEST_PATH,
+                 uploads="uploads", chunk_size=500, chunk_overlap=100, neo4j_vectors=False,
+                 hot_entities=100, context_tokens=3000, reranker="mmr"):
+        # Chunk and question vectors are cached on disk by model id + text hash
+        self.embeddings = embeddings if isinstance(embeddings, CachedEmbeddings) else CachedEmbeddings(embeddings)
+        # Session counts and pool utilisation for drivers not built by neo4j_connection.build_driver
+        if driver is not None and not isinstance(driver, InstrumentedDriver):
+            driver = InstrumentedDriver(driver)
+        self.driver = driver
+        self.async_driver = async_driver
+        self.llm = llm
+        self.index_dir = index_dir
+        self.uploads = uploads
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.schema_ready = False
+        self.neo4j_vectors = neo4j_vectors and driver is not None
+        self.vector_index_ready = False
+        self.neighbourhoods = None
+        if driver is not None and hot_entities:
+            self.neighbourhoods = NeighbourhoodIndex(driver, top_n=hot_entities)
+
+        self.index_manager = VectorIndexManager(self.embeddings)
+        # Invalidated on every ingestion/delete so answers never outlive the corpus they came from
+        self.answer_cache = AnswerCache(self.embeddings)
+        self.manifest = IngestManifest(manifest_path)
+        self.extraction_cache = get_cache()
+        self.prompt = PROMPTS[prompt]
+        self.assembler = None
+        if context_tokens:
+            self.assembler = ContextAssembler(self.embeddings, context_tokens, reranker, model=model_id(llm))
+        self.use_retriever(retriever)
+        # Reuse the index saved by a previous process if uploads/ hasn't changed since
+        self.index_manager.load(index_dir, folder_snapshot(uploads))
+
+    @property
+    def vectorstore(self):
+        return self.index_manager.vectorstore
+
+    def use_retriever(self, name):
+        if name != "vector" and self.driver is None:
+            raise ValueError(f"The '{name}' retriever needs a Neo4j driver")
+        if name.startswith("neo4j_") and not self.neo4j_vectors:
+            raise ValueError(f"The '{name}' retriever needs neo4j_vectors=True")
+        self.retriever = build_retriever(name, self)
+        return self.retriever
+
+    def model_version(self):
+        return f"{model_id(self.llm)}|{embeddings_id(self.embeddings)}"
+
+    def save_index(self, folder_path=None):
+        self.index_manager.save(self.index_dir, folder_snapshot(folder_path or self.uploads))
+
+    # ---------------------------
+    # 1️⃣ Load & split documents
+    # ---------------------------
+    @traced("load_documents")
+    def load_documents(self, folder_path="uploads", filenames=None, workers=None):
+        # Files are parsed in a process pool; see document_loading.iter_documents
+        docs = list(iter_documents(folder_path, filenames, workers))
+        print(f"✅ Loaded {len(docs)} documents")
+        return docs
+
+    def splitter(self):
+        return RecursiveCharacterTextSplitter(chunk_size=self.chunk_size, chunk_overlap=self.chunk_overlap)
+
+    @traced("split_documents")
+    def split_documents(self, docs):
+        return assign_chunk_ids(self.splitter().split_documents(docs))
+
+    def document_source(self, doc_name, folder_path=None):
+        folder_path = folder_path or self.uploads
+        # The UI passes bare filenames, while Document nodes and index entries use the loader's source path
+        if doc_name in self.index_manager or os.path.dirname(doc_name):
+            return doc_name
+        return os.path.join(folder_path, doc_name)
+
+    # ---------------------------
+    # 2️⃣ Store in Neo4j
+    # ---------------------------
+    def prepare_schema(self):
+        """Creates constraints/indexes once per process so every MERGE is an index seek."""
+        if not self.schema_ready:
+            ensure_schema(self.driver)
+            self.schema_ready = True
+            # First Neo4j use in this process: materialize hot entities from what is already stored
+            self.refresh_neighbourhoods()
+
+    def refresh_neighbourhoods(self, touched=None, wait=False):
+        """
+        Re-materializes hot entity neighbourhoods on a background thread; with
+        `touched` entity names only the entries that can have changed are redone.
+        """
+        if self.neighbourhoods is None:
+            return
+        self.neighbourhoods.schedule(touched)
+        if wait:
+            self.neighbourhoods.wait()
+
+    @traced("store_embeddings")
+    def store_embeddings(self, chunks, vectors, batch_size=DEFAULT_BATCH_SIZE):
+        """Writes chunk vectors onto their :Chunk nodes (the chunks must already be stored)."""
+        if not self.neo4j_vectors or not chunks:
+            return 0
+        if not self.vector_index_ready:
+            # Dimensions come from the embedding model, so the index is created on first write
+            ensure_vector_index(self.driver, len(vectors[0]))
+            self.vector_index_ready = True
+        rows = [{"chunk_id": chunk_id_of(chunk, idx), "embedding": list(vector)}
+                for idx, (chunk, vector) in enumerate(zip(chunks, vectors))]
+        return write_embeddings(self.driver, rows, batch_size)
+
+    @traced("store_in_neo4j")
+    def store_in_neo4j(self, chunks, bulk=False, batch_size=DEFAULT_BATCH_SIZE, max_workers=4, requests_per_second=None):
+        if self.driver is None:
+            return 0
+        self.prepare_schema()
+        if bulk:
+            return self.store_in_neo4j_bulk(chunks, batch_size, max_workers, requests_per_second)
+
+        touched, failures = set(), []
+        try:
+            with self.driver.session() as session:
+                for idx, chunk in enumerate(chunks):
+                    text = chunk.page_content
+                    doc_name = chunk.metadata.get("source", "unknown")
+                    chunk_id = chunk_id_of(chunk, idx)
+
+                    # Create document and chunk nodes
+                    session.run(f"WITH $row AS row {CHUNK_QUERY}",
+                                row={"doc_name": doc_name, "chunk_id": chunk_id, "text": text})
+
+                    # Extract entities via LLM
+                    triples = extract_triples(chunk_id, text, llm=self.llm)
+                    if triples is None:
+                        continue
+
+                    # Store entities and relationships
+                    for row in triple_rows(chunk_id, triples):
+                        touched.update((row["subj"], row["obj"]))
+                        try:
+                            session.run(f"WITH $row AS row {TRIPLE_QUERY.format(rel=row['rel'])}", row=row)
+                        except Exception as e:
+                            print(f"⚠️ Neo4j write error for relation '{row['rel']}' in chunk {chunk_id}: {e}")
+                            failures.append((row["rel"], 1, e))
+        finally:
+            # Writes already committed change answers even if a later one raised
+            self.answer_cache.invalidate()
+            self.refresh_neighbourhoods(touched)
+        if failures:
+            raise TripleWriteError(failures)
+        print("✅ Stored chunks and extracted entities in Neo4j")
+
+    def write_triples(self, rel_rows, batch_size=DEFAULT_BATCH_SIZE, failures=None):
+        """
+        Writes triples one UNWIND per relationship type. Failed types are appended
+        to `failures` as (rel, rows, error); without a list the first call raises.
+        """
+        collect = failures is not None
+        failures = failures if collect else []
+        written = 0
+        # Relationship types can't be parameters, so write one UNWIND per type
+        for rel, rows in group_by(rel_rows, "rel").items():
+            try:
+                written += write_batches(self.driver, TRIPLE_QUERY.format(rel=rel), rows, batch_size,
+                                         label=f"{rel} triples")
+            except Exception as e:
+                print(f"⚠️ Neo4j write error for relation '{rel}': {e}")
+                failures.append((rel, len(rows), e))
+        if failures and not collect:
+            raise TripleWriteError(failures)
+        return written
+
+    def store_in_neo4j_bulk(self, chunks, batch_size=DEFAULT_BATCH_SIZE, max_workers=4, requests_per_second=None):
+        """
+        Bulk variant of store_in_neo4j. Chunks are written first with batched UNWIND
+        transactions; triples are then extracted by a concurrent worker pool and
+        flushed to Neo4j every `batch_size` rows as extraction results come back.
+        """
+        try:
+            chunk_rows = self.write_chunks(chunks, batch_size)
+            items = ((row["chunk_id"], row["text"]) for row in chunk_rows)
+            written, touched, failures = self.extract_and_write(items, batch_size, max_workers, requests_per_second)
+        except BaseException:
+            # Earlier batches are committed: drop cached answers and rebuild hot entities
+            self.answer_cache.invalidate()
+            self.refresh_neighbourhoods()
+            raise
+        self.finish_store(touched, failures)
+        return len(chunk_rows) + written
+
+    def write_chunks(self, chunks, batch_size=DEFAULT_BATCH_SIZE):
+        """Writes Document and Chunk nodes; returns the rows written."""
+        chunk_rows = []
+        for idx, chunk in enumerate(chunks):
+            doc_name = chunk.metadata.get("source", "unknown")
+            chunk_rows.append({"doc_name": doc_name, "chunk_id": chunk_id_of(chunk, idx), "text": chunk.page_content})
+        write_batches(self.driver, CHUNK_QUERY, chunk_rows, batch_size, label="chunks")
+        return chunk_rows
+
+    def extract_and_write(self, items, batch_size=DEFAULT_BATCH_SIZE, max_workers=4, requests_per_second=None):
+        """
+        Extracts triples for (chunk_id, text) `items` on one worker pool and writes
+        them every `batch_size` rows. Returns (triples written, touched entity
+        names, failed writes).
+        """
+        written, pending, failures = 0, [], []
+        touched = set()
+        for chunk_id, triples in extract_concurrently(items, max_workers, requests_per_second, llm=self.llm):
+            if triples:
+                rows = triple_rows(chunk_id, triples)
+                touched.update(name for row in rows for name in (row["subj"], row["obj"]))
+                pending.extend(rows)
+            if len(pending) >= batch_size:
+                written += self.write_triples(pending, batch_size, failures)
+                pending = []
+        written += self.write_triples(pending, batch_size, failures)
+        return written, touched, failures
+
+    def finish_store(self, touched, failures):
+        """Once per ingestion: drop cached answers, refresh hot entities, report failed writes."""
+        stats = self.extraction_cache.stats()
+        print(f"📦 Extraction cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%})")
+        self.answer_cache.invalidate()
+        self.refresh_neighbourhoods(touched)
+        if failures:
+            raise TripleWriteError(failures)
+        print("✅ Stored chunks and extracted entities in Neo4j")
+
+    # ---------------------------
+    # 3️⃣ Build FAISS vectorstore
+    # ---------------------------
+    @traced("build_vectorstore")
+    def build_vectorstore(self, chunks):
+        """Adds new or changed documents in `chunks` to the index; unchanged ones are not re-embedded."""
+        print("🔧 Updating vector index...")
+        if self.neo4j_vectors:
+            # Same change detection as FAISS; vectors come back from the embedding cache
+            changed = [chunk for doc_name, doc_chunks in group_by_source(chunks).items()
+                       if self.index_manager.doc_hashes.get(doc_name) != document_hash(doc_chunks)
+                       for chunk in doc_chunks]
+        embedded = self.index_manager.update(chunks)
+        if self.neo4j_vectors and changed:
+            self.store_embeddings(changed, self.embeddings.embed_documents([c.page_content for c in changed]))
+        if embedded:
+            self.save_index()
+            self.answer_cache.invalidate()
+        print(f"✅ Embedded {embedded} new chunks ({len(self.index_manager.doc_chunks)} documents indexed)")
+        self.print_embedding_cache_stats()
+        return self.vectorstore
+
+    def print_embedding_cache_stats(self):
+        stats = self.embeddings.stats()["document"]
+        print(f"📦 Embedding cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%})")
+
+    # ---------------------------
+    # 3️⃣b Streaming ingestion (Neo4j + FAISS)
+    # ---------------------------
+    @traced("ingest_streaming")
+    def ingest_streaming(self, folder_path="uploads", filenames=None, workers=None, batch_size=64, queue_size=32):
+        """
+        Loads, splits, embeds and stores files as a pipeline of bounded queues instead
+        of materialising the whole corpus. Each embedded batch goes to Neo4j and into
+        the FAISS index as soon as it is ready, so early chunks are searchable while
+        later files are still being parsed. Returns the pipeline stats.
+        """
+        splitter = self.splitter()
+        counters = {}
+        # One extraction pool for the whole run, fed by the Neo4j sink
+        triples = None if self.driver is None else TripleStream(self, queue_size * batch_size)
+
+        def split(page):
+            return assign_chunk_ids(splitter.split_documents([page]), counters)
+
+        def neo4j_sink(chunks, vectors):
+            rows = self.write_chunks(chunks)
+            self.store_embeddings(chunks, vectors)
+            triples.submit((row["chunk_id"], row["text"]) for row in rows)
+
+        def faiss_sink(chunks, vectors):
+            self.index_manager.add_embedded(chunks, vectors)
+
+        sinks = [faiss_sink] if triples is None else [neo4j_sink, faiss_sink]
+        if triples is not None:
+            self.prepare_schema()
+            triples.start()
+        try:
+            stats = run_pipeline(
+                iter_documents(folder_path, filenames, workers),
+                split, self.embeddings.embed_documents, sinks,
+                queue_size=queue_size, batch_size=batch_size,
+            )
+            written, touched, failures = triples.finish() if triples is not None else (0, set(), [])
+        except BaseException:
+            # Partly streamed documents are dropped from FAISS so the next sync embeds them again
+            self.index_manager.abort_streaming()
+            touched = triples.cancel() if triples is not None else set()
+            self.answer_cache.invalidate()
+            self.refresh_neighbourhoods(touched)
+            raise
+
+        self.index_manager.finish_streaming()
+        if stats["chunks"]:
+            self.save_index(folder_path)
+        print(f"✅ Streamed {stats['pages']} pages / {stats['chunks']} chunks in {stats['elapsed_s']:.1f}s")
+        self.print_embedding_cache_stats()
+        if triples is None:
+            self.answer_cache.invalidate()
+        else:
+            stats["triples"] = written
+            self.finish_store(touched, failures)
+        return stats
+
+    # ---------------------------
+    # 3️⃣c Manifest-driven sync
+    # ---------------------------
+    def sync_uploads(self, folder_path="uploads", dry_run=False, workers=None):
+        """
+        Diffs `folder_path` against the ingestion manifest and only ingests added or
+        modified files; removed files are deleted from Neo4j and FAISS. Returns the
+        lists of added, modified and removed filenames.
+        """
+        version = self.model_version()
+        added, modified, removed, current = self.manifest.diff(folder_path, version)
+        # Files the manifest knows but the vector index lost (e.g. index deleted) are re-ingested too
+        modified += [f for f in current
+                     if f not in added and f not in modified and os.path.join(folder_path, f) not in self.index_manager]
+        result = {"added": added, "modified": modified, "removed": removed}
+        if dry_run:
+            return result
+
+        for filename in removed + modified:
+            self.delete_doc(filename, folder_path, save=False)
+            self.manifest.forget(filename)
+        if (removed or modified) and not added + modified:
+            # Otherwise ingest_streaming saves the index once it is rebuilt
+            self.save_index(folder_path)
+
+        to_ingest = added + modified
+        if to_ingest:
+            self.ingest_streaming(folder_path, to_ingest, workers)
+            for filename in to_ingest:
+                chunk_ids = self.index_manager.doc_chunks.get(os.path.join(folder_path, filename), [])
+                self.manifest.record(filename, current[filename], len(chunk_ids), version)
+        self.manifest.save()
+
+        print(f"🔄 Sync: {len(added)} added, {len(modified)} modified, {len(removed)} removed")
+        return result
+
+    def reindex(self, folder_path="uploads", vectors_only=False, workers=None):
+        """
+        Rebuilds from the files on disk. vectors_only re-embeds into a fresh FAISS index
+        and leaves Neo4j alone; otherwise everything is cleared and re-ingested (the
+        extraction cache keeps the LLM out of it for unchanged chunks).
+        """
+        if not vectors_only:
+            self.delete_all_docs()
+            return self.sync_uploads(folder_path, workers=workers)
+
+        self.index_manager.reset()
+        chunks = self.split_documents(self.load_documents(folder_path, workers=workers))
+        return self.build_vectorstore(chunks)
+
+    # ---------------------------
+    # 4️⃣ Query
+    # ---------------------------
+    def check_ready(self):
+        if self.retriever.requires_vectorstore and self.vectorstore is None:
+            raise ValueError("Vectorstore not built yet!")
+
+    def assemble_context(self, question, retrieval):
+        return retrieval if self.assembler is None else self.assembler.assemble(question, retrieval)
+
+    def query(self, question, topic=None, k_graph=5, k_vector=3, hops=3, use_docs_only=True, use_cache=True):
+        self.check_ready()
+        params = dict(retriever=self.retriever.name, topic=topic, k_graph=k_graph, k_vector=k_vector,
+                      hops=hops, use_docs_only=use_docs_only,
+                      context_tokens=self.assembler and self.assembler.max_tokens)
+        version = self.answer_cache.version
+        if use_cache:
+            with span("answer_cache"):
+                cached = self.answer_cache.get(question, **params)
+            if cached is not None:
+                return cached
+
+        retrieval = self.retriever.retrieve(question, topic=topic, k_graph=k_graph, k_vector=k_vector, hops=hops)
+        retrieval = self.assemble_context(question, retrieval)
+        messages = self.prompt.messages(question, retrieval, use_docs_only)
+        if messages is None:
+            return self.prompt.no_context(question)
+
+        with span("llm"):
+            response = self.llm.invoke(messages)
+        answer = self.prompt.finish(response.content, use_docs_only)
+        if use_cache:
+            self.answer_cache.put(question, answer, version, **params)
+        return answer
+
+    def query_stream(self, question, topic=None, k_graph=5, k_vector=3, hops=3, use_docs_only=True, use_cache=True):
+        """
+        Streaming variant of query. Retrieval runs up front and its results are
+        returned as metadata ({"cached", "graph_context", "docs"}), together with a
+        generator that yields answer tokens as the LLM produces them. A cached
+        answer is yielded as a single token; retrieval still runs for it, so the
+        metadata shows the chunks behind the answer and only the LLM call is skipped.
+        """
+        self.check_ready()
+        params = dict(retriever=self.retriever.name, topic=topic, k_graph=k_graph, k_vector=k_vector,
+                      hops=hops, use_docs_only=use_docs_only,
+                      context_tokens=self.assembler and self.assembler.max_tokens)
+        version = self.answer_cache.version
+        with span("answer_cache"):
+            cached = self.answer_cache.get(question, **params) if use_cache else None
+
+        retrieval = self.retriever.retrieve(question, topic=topic, k_graph=k_graph, k_vector=k_vector, hops=hops)
+        retrieval = self.assemble_context(question, retrieval)
+        metadata = {"cached": cached is not None, "graph_context": retrieval.graph_context, "docs": retrieval.docs}
+        if cached is not None:
+            return metadata, iter([cached])
+        messages = self.prompt.messages(question, retrieval, use_docs_only)
+
+        def tokens():
+            if messages is None:
+                yield self.prompt.no_context(question)
+                return
+            parts = []
+            with span("llm", streaming=True):
+                for chunk in self.llm.stream(messages):
+                    parts.append(chunk.content)
+                    yield chunk.content
+            hint = self.prompt.finish("", use_docs_only)
+            if hint:
+                yield hint
+            if use_cache:
+                self.answer_cache.put(question, "".join(parts) + hint, version, **params)
+
+        return metadata, tokens()
+
+    async def query_async(self, question, topic=None, k_graph=5, k_vector=3, hops=3, use_docs_only=True, use_cache=True):
+        """
+        Same as query, but with async retrieval (the hybrid retriever runs graph
+        traversal and vector search concurrently) and llm.ainvoke.
+        """
+        self.check_ready()
+        params = dict(retriever=self.retriever.name, topic=topic, k_graph=k_graph, k_vector=k_vector,
+                      hops=hops, use_docs_only=use_docs_only,
+                      context_tokens=self.assembler and self.assembler.max_tokens)
+        version = self.answer_cache.version
+        if use_cache:
+            with span("answer_cache"):
+                cached = await asyncio.to_thread(self.answer_cache.get, question, **params)
+            if cached is not None:
+                return cached
+
+        retrieval = await self.retriever.aretrieve(question, topic=topic, k_graph=k_graph, k_vector=k_vector, hops=hops)
+        # Reranking may embed on a cache miss, so keep it off the event loop
+        retrieval = await asyncio.to_thread(self.assemble_context, question, retrieval)
+        messages = self.prompt.messages(question, retrieval, use_docs_only)
+        if messages is None:
+            return self.prompt.no_context(question)
+
+        with span("llm"):
+            response = await self.llm.ainvoke(messages)
+        answer = self.prompt.finish(response.content, use_docs_only)
+        if use_cache:
+            await asyncio.to_thread(self.answer_cache.put, question, answer, version, **params)
+        return answer
+
+    # ---------------------------
+    # 4️⃣b Global questions over community summaries
+    # ---------------------------
+    @traced("build_communities")
+    def build_communities(self, algorithm="louvain", resolution=1.0, max_workers=4, use_gds=None):
+        """Offline stage: partition the Entity graph and (re)summarize changed communities."""
+        if self.driver is None:
+            raise ValueError("Community detection needs a Neo4j driver")
+        self.prepare_schema()
+        counts = communities.build_communities(self.driver, self.llm, algorithm, resolution,
+                                               max_workers=max_workers, use_gds=use_gds)
+        self.answer_cache.invalidate()
+        return counts
+
+    def query_global(self, question, max_communities=200, use_cache=True):
+        """
+        Map-reduce over the stored community summaries for corpus-wide questions
+        ("what are the main themes?"); at most `max_communities` summaries are read.
+        """
+        if self.driver is None:
+            raise ValueError("Global questions need a Neo4j driver")
+        params = dict(retriever="communities", max_communities=max_communities)
+        version = self.answer_cache.version
+        if use_cache:
+            with span("answer_cache"):
+                cached = self.answer_cache.get(question, **params)
+            if cached is not None:
+                return cached
+
+        with span("load_summaries"):
+            summaries = communities.load_summaries(self.driver, max_communities)
+        if not summaries:
+            return "⚠️ No community summaries yet. Run build_communities() after ingesting documents."
+        answer = communities.global_answer(self.llm, question, summaries)
+        if answer is None:
+            return f"⚠️ No info about '{question}' in the community summaries."
+        if use_cache:
+            self.answer_cache.put(question, answer, version, **params)
+        return answer
+
+    def graph_paths(self, entity, hops=3, limit=10):
+        self.prepare_schema()
+        return graph_retrieval.graph_paths(self.driver, entity, hops=hops, limit=limit)
+
+    # ---------------------------
+    # 5️⃣ Delete all docs & entities
+    # ---------------------------
+    def delete_all_docs(self):
+        self.index_manager.reset()
+        self.save_index()
+        self.answer_cache.invalidate()
+        self.manifest.clear()
+        if self.driver is not None:
+            counts = neo4j_delete.delete_all(self.driver)
+            if self.neighbourhoods is not None:
+                self.neighbourhoods.clear()
+            print(f"🗑️ All documents, chunks, and entities deleted from Neo4j: {counts}")
+
+    # ---------------------------
+    # 6️⃣ Delete a specific document
+    # ---------------------------
+    def delete_doc(self, doc_name, folder_path=None, save=True):
+        """
+        Removes a document from FAISS and Neo4j. The saved index is stamped with a
+        snapshot of `folder_path` (the engine's uploads folder by default); `save`
+        =False leaves saving to the caller, e.g. a sync removing several files.
+        """
+        folder_path = folder_path or self.uploads
+        doc_name = self.document_source(doc_name, folder_path)
+        removed = self.index_manager.delete_document(doc_name)
+        if save:
+            self.save_index(folder_path)
+        self.answer_cache.invalidate()
+        print(f"🧹 Removed {removed} vectors for '{doc_name}'")
+
+        if self.driver is not None:
+            counts = neo4j_delete.delete_document(self.driver, doc_name)
+            # Deletes don't report which neighbourhoods they cut, so rebuild them all
+            self.refresh_neighbourhoods()
+            print(f"🗑️ Document '{doc_name}' and associated data deleted: {counts}")
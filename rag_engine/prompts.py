@@ -0,0 +1,68 @@
+# ---------------------------
+# Prompt styles
+# ---------------------------
+# messages() returns the chat messages for the LLM, or None when there is
+# nothing to answer from; no_context() is the reply used instead.
+
+
+class DocsPrompt:
+    """Graph + vector context; general knowledge only when use_docs_only is off."""
+
+    name = "docs"
+
+    def messages(self, question, retrieval, use_docs_only=True):
+        vector_context = "\n".join([doc.page_content for doc in retrieval.docs])
+        context = f"GRAPH CONTEXT:\n{retrieval.graph_context}\n\nVECTOR CONTEXT:\n{vector_context}".strip()
+
+        if use_docs_only and retrieval.is_empty():
+            return None
+
+        system_prompt = "You are a helpful assistant. " + \
+            ("Answer using **only provided document context**." if use_docs_only else "Use docs + general knowledge if needed.")
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f"Context:\n{context}\n\nQuestion: {question}"}
+        ]
+
+    def no_context(self, question):
+        return f"⚠️ No info about '{question}' in uploaded docs.\n💡 Uncheck 'Use only uploaded documents' for general knowledge."
+
+    def finish(self, answer, use_docs_only=True):
+        if use_docs_only:
+            answer += "\n💡 Uncheck to include general knowledge."
+        return answer
+
+
+class StrictPrompt:
+    """Retrieved chunks only, always; the model is told to say when the answer isn't there."""
+
+    name = "strict"
+
+    def messages(self, question, retrieval, use_docs_only=True):
+        if not retrieval.docs:
+            return None
+        # Concatenate chunk texts
+        context = "\n\n".join([d.page_content for d in retrieval.docs])
+        return [{"role": "user", "content": f"""
+You are a helpful assistant.
+Answer strictly based on the below context only.
+If the context does not contain the answer, say "Information not found in uploaded documents."
+
+Context:
+{context}
+
+Question: {question}
+Answer:
+"""}]
+
+    def no_context(self, question):
+        return f"⚠️ No information about '{question}' found in the uploaded documents."
+
+    def finish(self, answer, use_docs_only=True):
+        return answer
+
+
+PROMPTS = {
+    "docs": DocsPrompt(),
+    "strict": StrictPrompt(),
+}
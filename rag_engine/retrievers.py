@@ -0,0 +1,207 @@
+import asyncio
+from graph_retrieval import related_documents, related_documents_async
+from neo4j_vectors import expanded_search, vector_and_graph_search, vector_search
+from tracing import span
+
+# ---------------------------
+# Pluggable retrievers
+# ---------------------------
+# A retriever turns a question into a Retrieval (context chunks plus a graph
+# summary). They read the engine's current resources (vectorstore, driver,
+# embeddings) on every call, so switching retrievers never re-ingests anything.
+
+
+class Retrieval:
+    def __init__(self, docs=(), graph_context=""):
+        self.docs = list(docs)              # langchain Documents
+        self.graph_context = graph_context  # "doc mentions: a, b" lines
+
+    def is_empty(self):
+        return not self.graph_context.strip() and not any(d.page_content.strip() for d in self.docs)
+
+
+class VectorRetriever:
+    """Top-k chunks by embedding similarity from the engine's FAISS index."""
+
+    name = "vector"
+    requires_vectorstore = True
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def retrieve(self, question, topic=None, k_graph=5, k_vector=3, hops=3, fanout=25):
+        # Embedding the question separately makes its cost visible next to the FAISS search
+        with span("embed_question"):
+            vector = self.engine.embeddings.embed_query(question)
+        with span("vector_search", k=k_vector):
+            docs = self.engine.vectorstore.similarity_search_by_vector(vector, k=k_vector)
+        return Retrieval(docs=docs)
+
+    async def aretrieve(self, question, topic=None, k_graph=5, k_vector=3, hops=3, fanout=25):
+        with span("embed_question"):
+            vector = await self.engine.embeddings.aembed_query(question)
+        with span("vector_search", k=k_vector):
+            docs = await self.engine.vectorstore.asimilarity_search_by_vector(vector, k=k_vector)
+        return Retrieval(docs=docs)
+
+
+class GraphRetriever:
+    """
+    Documents mentioning entities near `topic` (or the question when no topic is
+    given): full-text seed lookup, then a bounded BFS from those seeds only.
+    """
+
+    name = "graph"
+    requires_vectorstore = False
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def graph_context(self, topic, k_graph=5, hops=3, fanout=25):
+        self.engine.prepare_schema()
+        with span("graph_retrieval", hops=hops):
+            docs = related_documents(self.engine.driver, topic, hops=hops, limit=k_graph, fanout=fanout,
+                                     neighbourhoods=self.engine.neighbourhoods)
+        return format_graph_context(docs)
+
+    async def agraph_context(self, topic, k_graph=5, hops=3, fanout=25):
+        if self.engine.async_driver is None:
+            # No async driver configured: run the sync traversal off the event loop
+            return await asyncio.to_thread(self.graph_context, topic, k_graph, hops, fanout)
+        self.engine.prepare_schema()
+        with span("graph_retrieval", hops=hops):
+            docs = await related_documents_async(self.engine.async_driver, topic, hops=hops,
+                                                 limit=k_graph, fanout=fanout,
+                                                 neighbourhoods=self.engine.neighbourhoods)
+        return format_graph_context(docs)
+
+    def retrieve(self, question, topic=None, k_graph=5, k_vector=3, hops=3, fanout=25):
+        return Retrieval(graph_context=self.graph_context(topic or question, k_graph, hops, fanout))
+
+    async def aretrieve(self, question, topic=None, k_graph=5, k_vector=3, hops=3, fanout=25):
+        return Retrieval(graph_context=await self.agraph_context(topic or question, k_graph, hops, fanout))
+
+
+class HybridRetriever:
+    """Graph context and vector chunks side by side; the async path runs both concurrently."""
+
+    name = "hybrid"
+    requires_vectorstore = True
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.vector = VectorRetriever(engine)
+        self.graph = GraphRetriever(engine)
+
+    def retrieve(self, question, topic=None, k_graph=5, k_vector=3, hops=3, fanout=25):
+        graph_context = self.graph.graph_context(topic or question, k_graph, hops, fanout)
+        docs = self.vector.retrieve(question, k_vector=k_vector).docs
+        return Retrieval(docs=docs, graph_context=graph_context)
+
+    async def aretrieve(self, question, topic=None, k_graph=5, k_vector=3, hops=3, fanout=25):
+        # Retrieval costs the slower of the two instead of their sum
+        graph_context, vector = await asyncio.gather(
+            self.graph.agraph_context(topic or question, k_graph, hops, fanout),
+            self.vector.aretrieve(question, k_vector=k_vector),
+        )
+        return Retrieval(docs=vector.docs, graph_context=graph_context)
+
+
+class Neo4jVectorRetriever:
+    """Top-k chunks from the Neo4j vector index over Chunk.embedding (needs neo4j_vectors=True)."""
+
+    name = "neo4j_vector"
+    requires_vectorstore = False
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def retrieve(self, question, topic=None, k_graph=5, k_vector=3, hops=3, fanout=25):
+        with span("embed_question"):
+            vector = self.engine.embeddings.embed_query(question)
+        with span("vector_search", k=k_vector, backend="neo4j"):
+            docs = vector_search(self.engine.driver, vector, k_vector)
+        return Retrieval(docs=docs)
+
+    async def aretrieve(self, question, topic=None, k_graph=5, k_vector=3, hops=3, fanout=25):
+        return await asyncio.to_thread(self.retrieve, question, topic, k_graph, k_vector, hops, fanout)
+
+
+class Neo4jHybridRetriever:
+    """
+    Like HybridRetriever, but the vector search runs against the Neo4j vector
+    index in the same read transaction as the graph expansion, so one pooled
+    connection serves the whole retrieval and no FAISS index is needed.
+    """
+
+    name = "neo4j_hybrid"
+    requires_vectorstore = False
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def retrieve(self, question, topic=None, k_graph=5, k_vector=3, hops=3, fanout=25):
+        with span("embed_question"):
+            vector = self.engine.embeddings.embed_query(question)
+        self.engine.prepare_schema()
+        with span("graph_vector_search", k=k_vector, hops=hops):
+            docs, graph_docs = vector_and_graph_search(self.engine.driver, vector, topic or question,
+                                                       k_vector, k_graph, hops, fanout,
+                                                       neighbourhoods=self.engine.neighbourhoods)
+        return Retrieval(docs=docs, graph_context=format_graph_context(graph_docs))
+
+    async def aretrieve(self, question, topic=None, k_graph=5, k_vector=3, hops=3, fanout=25):
+        return await asyncio.to_thread(self.retrieve, question, topic, k_graph, k_vector, hops, fanout)
+
+
+class Neo4jExpandRetriever:
+    """
+    Graph context driven by the question itself: vector hits from the Neo4j index
+    are expanded through (:Chunk)-[:MENTIONS]->(:Entity) and entity hops, and the
+    hits plus neighbouring chunks come back ranked by a combined score from a
+    single Cypher statement. `topic` is not used.
+    """
+
+    name = "neo4j_expand"
+    requires_vectorstore = False
+
+    def __init__(self, engine, graph_weight=0.5):
+        self.engine = engine
+        self.graph_weight = graph_weight
+
+    def retrieve(self, question, topic=None, k_graph=5, k_vector=3, hops=3, fanout=25):
+        with span("embed_question"):
+            vector = self.engine.embeddings.embed_query(question)
+        with span("expanded_search", k=k_vector, hops=hops):
+            docs = expanded_search(self.engine.driver, vector, k_vector, k_graph, hops, fanout, self.graph_weight)
+        # Which entities pulled each document in, for the prompt's graph section
+        linked = {}
+        for doc in docs:
+            names = linked.setdefault(doc.metadata["source"], [])
+            names.extend(name for name in doc.metadata["via"] if name not in names)
+        return Retrieval(docs=docs, graph_context=format_graph_context(
+            (source, names) for source, names in linked.items() if names))
+
+    async def aretrieve(self, question, topic=None, k_graph=5, k_vector=3, hops=3, fanout=25):
+        return await asyncio.to_thread(self.retrieve, question, topic, k_graph, k_vector, hops, fanout)
+
+
+def format_graph_context(docs):
+    return "\n".join(f"{doc_name} mentions: {', '.join(entities)}" for doc_name, entities in docs)
+
+
+RETRIEVERS = {
+    "vector": VectorRetriever,
+    "graph": GraphRetriever,
+    "hybrid": HybridRetriever,
+    "neo4j_vector": Neo4jVectorRetriever,
+    "neo4j_hybrid": Neo4jHybridRetriever,
+    "neo4j_expand": Neo4jExpandRetriever,
+}
+
+
+def build_retriever(name, engine):
+    try:
+        return RETRIEVERS[name](engine)
+    except KeyError:
+        raise ValueError(f"Unknown retriever '{name}' (choose from {', '.join(RETRIEVERS)})") from None
@@ -0,0 +1,75 @@
+import time
+
+# ---------------------------
+# Size-bounded SQLite tables
+# ---------------------------
+# Shared by the extraction and embedding caches: rows are (key, value, size,
+# last_access), the byte total is kept as a running sum instead of a
+# SUM(size) scan on every write, and the least-recently-used rows are evicted
+# once it passes max_bytes.
+SQLITE_MAX_PARAMS = 500   # keys per SELECT ... IN (...)
+
+
+class LRUTable:
+    """
+    LRU bookkeeping for one cache table. Callers hold their own lock around
+    every call and commit afterwards. Reads only record access times in
+    memory; they are written together with the next insert.
+    """
+
+    def __init__(self, conn, table, value_column, max_bytes, label):
+        self.conn = conn
+        self.table = table
+        self.value_column = value_column
+        self.max_bytes = max_bytes
+        self.label = label
+        self.accessed = {}   # key -> last access time not yet written
+        self.total = conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table}").fetchone()[0]
+
+    def touch(self, keys):
+        now = time.time()
+        self.accessed.update((key, now) for key in keys)
+
+    def sizes(self, keys):
+        found = {}
+        for i in range(0, len(keys), SQLITE_MAX_PARAMS):
+            batch = keys[i:i + SQLITE_MAX_PARAMS]
+            placeholders = ",".join("?" * len(batch))
+            found.update(self.conn.execute(
+                f"SELECT key, size FROM {self.table} WHERE key IN ({placeholders})", batch))
+        return found
+
+    def put_many(self, items):
+        """Inserts or replaces (key, value, size) rows, then evicts down to max_bytes."""
+        rows = list({key: (key, value, size) for key, value, size in items}.values())
+        replaced = self.sizes([key for key, _, _ in rows])
+        if self.accessed:
+            self.conn.executemany(f"UPDATE {self.table} SET last_access = ? WHERE key = ?",
+                                  [(at, key) for key, at in self.accessed.items()])
+            self.accessed = {}
+        now = time.time()
+        self.conn.executemany(
+            f"INSERT OR REPLACE INTO {self.table} (key, {self.value_column}, size, last_access) VALUES (?, ?, ?, ?)",
+            [(key, value, size, now) for key, value, size in rows])
+        self.total += sum(size for _, _, size in rows) - sum(replaced.values())
+        self.evict()
+
+    def evict(self):
+        if self.total <= self.max_bytes:
+            return
+        # Drop the oldest entries until we're back under budget
+        freed = 0
+        stale = []
+        for key, size in self.conn.execute(f"SELECT key, size FROM {self.table} ORDER BY last_access"):
+            if self.total - freed <= self.max_bytes:
+                break
+            stale.append((key,))
+            freed += size
+        self.conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", stale)
+        self.total -= freed
+        print(f"🧹 Evicted {len(stale)} cached {self.label} ({freed} bytes)")
+
+    def clear(self):
+        self.conn.execute(f"DELETE FROM {self.table}")
+        self.accessed = {}
+        self.total = 0
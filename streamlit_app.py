@@ -1,5 +1,6 @@
 import os, streamlit as st
 import graph_rag_app_streamlit as rag
+import tracing
 from pyvis.network import Network
 import networkx as nx
 
@@ -26,8 +27,7 @@ if st.session_state.confirm_delete:
         try:
             for f in os.listdir("uploads"):
                 os.remove(os.path.join("uploads", f))
-            rag.delete_all_docs()
-            rag.vectorstore = None
+            rag.delete_all_docs()  # also resets the vector index
             st.success("✅ All uploaded documents and Neo4j data cleared!")
             st.session_state.confirm_delete = False
         except Exception as e:
@@ -45,8 +45,8 @@ if docs_list:
     if st.button(f"Delete '{doc_to_delete}'"):
         try:
             os.remove(os.path.join("uploads", doc_to_delete))
-            rag.delete_doc(doc_to_delete)
-            rag.vectorstore = None
+            # The sync sees the file is gone and removes it from Neo4j, FAISS and the manifest
+            rag.sync_uploads("uploads")
             st.success(f"✅ Document '{doc_to_delete}' deleted from local + Neo4j")
         except Exception as e:
             st.error(f"⚠️ Could not delete document: {e}")
@@ -63,10 +63,14 @@ new_files = []
 if uploaded_files:
     for file in uploaded_files:
         save_path = f"uploads/{file.name}"
-        if not os.path.exists(save_path):
-            with open(save_path, "wb") as f:
-                f.write(file.getbuffer())
-            new_files.append(file.name)
+        # Overwrite when the content changed; the manifest sync below re-ingests it
+        if os.path.exists(save_path):
+            with open(save_path, "rb") as f:
+                if f.read() == file.getvalue():
+                    continue
+        with open(save_path, "wb") as f:
+            f.write(file.getbuffer())
+        new_files.append(file.name)
 
 if new_files:
     st.success(f"✅ Uploaded {len(new_files)} new files: {', '.join(new_files)}")
@@ -79,17 +83,18 @@ if all_files:
 else:
     st.info("No documents uploaded yet.")
 
-# Process documents
-if new_files or rag.vectorstore is None:
+# Process documents: the manifest diff picks out added/modified/removed files. It runs
+# once per session (files may have changed while the app was down) and after uploads,
+# not on every rerun.
+if new_files or not st.session_state.get("synced"):
     try:
-        docs = rag.load_documents("uploads")
-        if docs:
-            with st.spinner("⏳ Processing documents..."):
-                chunks = rag.split_documents(docs)
-                rag.store_in_neo4j(chunks)
-                rag.build_vectorstore(chunks)
-            st.success(f"✅ Processed {len(chunks)} chunks and built/updated vectorstore")
-        else:
+        with st.spinner("⏳ Processing documents..."):
+            changes = rag.sync_uploads("uploads")
+        st.session_state.synced = True
+        changed = changes["added"] + changes["modified"]
+        if changed:
+            st.success(f"✅ Processed {len(changed)} files and built/updated vectorstore")
+        elif rag.vectorstore is None:
             st.info("No documents to process.")
     except Exception as e:
         st.error(f"⚠️ Error processing documents: {e}")
@@ -104,15 +109,31 @@ with st.form("question_form"):
     question = st.text_input("Ask a question about your documents:")
     hops = st.slider("Select number of hops (graph traversal depth)", min_value=1, max_value=5, value=3)
     use_docs_only = st.checkbox("Use only uploaded documents", value=True)
+    global_question = st.checkbox("Corpus-wide question (answer from community summaries)", value=False)
     show_paths = st.checkbox("Show traversed graph paths", value=False)
+    show_timings = st.checkbox("Show timing breakdown", value=False)
     submitted = st.form_submit_button("Get Answer")
 
 if submitted and question:
     with st.spinner("⏳ Processing your question..."):
         try:
-            answer = rag.graph_rag_query(question, hops=hops, use_docs_only=use_docs_only)
-            st.subheader("💡 Answer:")
-            st.write(answer)
+            with tracing.collect_timings() as timings:
+                if global_question:
+                    tokens = [rag.graph_rag_query_global(question)]
+                else:
+                    _, tokens = rag.graph_rag_query_stream(question, hops=hops, use_docs_only=use_docs_only)
+                st.subheader("💡 Answer:")
+                # Render tokens as they arrive instead of waiting for the whole answer
+                placeholder = st.empty()
+                answer = ""
+                for token in tokens:
+                    answer += token
+                    placeholder.markdown(answer + "▌")
+                placeholder.markdown(answer)
+
+            if show_timings:
+                st.subheader("⏱️ Timing Breakdown")
+                st.table([{"stage": name, "ms": round(seconds * 1000, 1)} for name, seconds in timings.items()])
 
             if show_paths:
                 st.subheader("🔍 Traversed Graph Visualization")
@@ -121,16 +142,8 @@ if submitted and question:
                     entity_candidates = [question]
 
                 all_paths = []
-                with rag.driver.session() as session:
-                    for entity in entity_candidates:
-                        query = f"""
-                            MATCH path=(start:Entity)-[*1..{hops}]-(related)
-                            WHERE ANY(node IN nodes(path) WHERE toLower(node.name) CONTAINS toLower($entity))
-                            RETURN [node IN nodes(path) | node.name] AS path_nodes
-                            LIMIT 10
-                        """
-                        result = session.run(query, {"entity": entity})
-                        all_paths.extend([record["path_nodes"] for record in result])
+                for entity in entity_candidates:
+                    all_paths.extend(rag.graph_paths(entity, hops=hops, limit=10))
 
                 if all_paths:
                     G = nx.Graph()
@@ -162,4 +175,23 @@ if submitted and question:
                 else:
                     st.info("No paths found for the current question.")
         except Exception as e:
-            st.error(f"⚠️ Something went wrong: {e}")
\ No newline at end of file
+            st.error(f"⚠️ Something went wrong: {e}")
+st.divider()
+
+# ---------------------------------
+# Neo4j connection pool
+# ---------------------------------
+with st.expander("🔌 Neo4j connection pool"):
+    st.json(rag.driver.metrics())
+
+# ---------------------------------
+# Community summaries (for corpus-wide questions)
+# ---------------------------------
+with st.expander("🧩 Community summaries"):
+    algorithm = st.selectbox("Algorithm", ["louvain", "leiden"])
+    if st.button("Rebuild communities"):
+        with st.spinner("⏳ Detecting and summarizing communities..."):
+            try:
+                st.json(rag.build_communities(algorithm))
+            except Exception as e:
+                st.error(f"⚠️ Could not build communities: {e}")
@@ -31,12 +31,9 @@ if st.session_state.confirm_delete:
             for f in os.listdir("uploads"):
                 os.remove(os.path.join("uploads", f))
 
-            # 🗑️ 2️⃣ Delete all docs/entities from Neo4j
+            # 🗑️ 2️⃣ Delete all docs/entities from Neo4j and reset the FAISS vectorstore
             rag.delete_all_docs()
 
-            # 🗑️ 3️⃣ Reset in-memory FAISS vectorstore
-            rag.vectorstore = None
-
             st.success("✅ All uploaded documents and Neo4j data cleared!")
             st.session_state.confirm_delete = False  # hide confirmation
         except Exception as e:
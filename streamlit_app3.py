@@ -30,8 +30,7 @@ if st.session_state.confirm_delete:
         try:
             for f in os.listdir("uploads"):
                 os.remove(os.path.join("uploads", f))
-            rag.delete_all_docs()
-            rag.vectorstore = None
+            rag.delete_all_docs()  # also resets the vector index
             st.success("✅ All uploaded documents and Neo4j data cleared!")
             st.session_state.confirm_delete = False
         except Exception as e:
@@ -115,17 +114,10 @@ if submitted and question:
                 # ---------------------------
                 # Fetch paths from Neo4j
                 # ---------------------------
+                # Bounded BFS from full-text seeds (same hop/fan-out limits as retrieval)
                 all_paths = []
-                with rag.driver.session() as session:
-                    for entity in entity_candidates:
-                        query = f"""
-                            MATCH path=(start:Entity)-[*1..{hops}]-(related)
-                            WHERE ANY(node IN nodes(path) WHERE toLower(node.name) CONTAINS toLower($entity))
-                            RETURN [node IN nodes(path) | node.name] AS path_nodes
-                            LIMIT 10
-                        """
-                        result = session.run(query, {"entity": entity})
-                        all_paths.extend([record["path_nodes"] for record in result])
+                for entity in entity_candidates:
+                    all_paths.extend(rag.graph_paths(entity, hops=hops, limit=10))
 
                 if all_paths:
                     # ---------------------------
@@ -37,7 +37,7 @@ if st.session_state.confirm_delete:
         try:
             for f in os.listdir("uploads"):
                 os.remove(os.path.join("uploads", f))
-            vectorstore = None  # reset vectorstore
+            rag.delete_all_docs()  # reset vectorstore
             st.success("✅ All uploaded documents cleared!")
             st.session_state.confirm_delete = False  # hide confirmation
         except Exception as e:
@@ -57,7 +57,7 @@ if st.session_state.uploaded_files:
             if st.button(f"Delete {f}", key=f"delete_{f}"):
                 try:
                     os.remove(os.path.join("uploads", f))
-                    rag.vectorstore = None
+                    rag.delete_doc(f)
                     updated_files.remove(f)
                     st.success(f"✅ Document '{f}' deleted")
                     st.session_state.uploaded_files = updated_files
@@ -95,7 +95,8 @@ if new_files:
 # ---------------------------------
 if new_files or rag.vectorstore is None:
     try:
-        docs = rag.load_documents("uploads")
+        # Only new uploads need embedding once the index exists
+        docs = rag.load_documents("uploads", None if rag.vectorstore is None else new_files)
         if docs:
             with st.spinner("⏳ Processing documents..."):
                 chunks = rag.split_documents(docs)
@@ -120,12 +121,18 @@ with st.form("question_form"):
 if submitted and question:
     with st.spinner("⏳ Processing your question..."):
         try:
-            answer = rag.rag_query_strict(question, k=3)
+            metadata, tokens = rag.rag_query_strict_stream(question, k=3)
             st.subheader("💡 Answer:")
-            st.write(answer)
-
-            if show_chunks and rag.vectorstore is not None:
-                docs = rag.vectorstore.similarity_search(question, k=3)
+            # Render tokens as they arrive instead of waiting for the whole answer
+            placeholder = st.empty()
+            answer = ""
+            for token in tokens:
+                answer += token
+                placeholder.markdown(answer + "▌")
+            placeholder.markdown(answer)
+
+            if show_chunks:
+                docs = metadata["docs"]
                 if docs:
                     st.subheader("📄 Retrieved Chunks (Top 3):")
                     for i, d in enumerate(docs):
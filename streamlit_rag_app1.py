@@ -30,7 +30,7 @@ if st.session_state.confirm_delete:
         try:
             for f in os.listdir("uploads"):
                 os.remove(os.path.join("uploads", f))
-            vectorstore = None  # reset vectorstore
+            rag.delete_all_docs()  # reset vectorstore
             st.success("✅ All uploaded documents cleared!")
             st.session_state.confirm_delete = False  # hide confirmation
         except Exception as e:
@@ -0,0 +1,43 @@
+import os, sys, tempfile
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import benchmark
+from benchmark import FakeDriver, FakeEmbeddings, FakeLLM
+
+# ---------------------------
+# Test setup
+# ---------------------------
+# Modules that do `from config import llm` get the benchmark stand-ins, and
+# caches/manifests/indexes created at import time land in a scratch directory.
+# Hot entity refreshes stay off so driver round trips are deterministic.
+benchmark.install_config(FakeDriver(latency=0), FakeEmbeddings(), FakeLLM())
+os.environ["RAG_HOT_ENTITIES"] = "0"
+os.chdir(tempfile.mkdtemp(prefix="graph_rag_tests_"))
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def embeddings():
+    return FakeEmbeddings(size=16)
+
+
+@pytest.fixture
+def make_engine(workdir, embeddings):
+    """RagEngine factory over a fake driver, without hot entities or context packing unless asked."""
+    from rag_engine import RagEngine
+
+    def make(driver=None, **kwargs):
+        kwargs.setdefault("hot_entities", 0)
+        kwargs.setdefault("context_tokens", None)
+        kwargs.setdefault("retriever", "vector" if driver is None else "hybrid")
+        return RagEngine(embeddings, FakeLLM(), driver=driver, index_dir=str(workdir / "index"),
+                         manifest_path=str(workdir / "manifest.json"), uploads=str(workdir / "uploads"), **kwargs)
+    return make
@@ -0,0 +1,110 @@
+import threading
+import pytest
+import answer_cache
+from answer_cache import AnswerCache, normalize_question
+from benchmark import FakeDriver
+
+
+class TopicEmbeddings:
+    """Questions about the same first word get nearly identical vectors."""
+
+    def embed_query(self, text):
+        return [1.0, 0.01 * len(text)] if text.startswith("graph") else [0.0, 1.0]
+
+
+def test_normalize_question():
+    assert normalize_question("  What IS   a graph?? ") == "what is a graph"
+
+
+def test_exact_hits_need_the_same_parameters():
+    cache = AnswerCache()
+    cache.put("What is a graph?", "nodes and edges", cache.version, k=3)
+    assert cache.get("what is a graph", k=3) == "nodes and edges"
+    assert cache.get("What is a graph?", k=5) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_near_duplicate_questions_hit():
+    cache = AnswerCache(TopicEmbeddings(), threshold=0.95)
+    cache.put("graph databases?", "Neo4j", cache.version, k=3)
+    assert cache.get("graph databases explained", k=3) == "Neo4j"
+    assert cache.get("vector databases explained", k=3) is None
+    assert cache.get("graph databases explained", k=4) is None
+    assert cache.near_hits == 1
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(answer_cache.time, "time", lambda: now[0])
+    cache = AnswerCache(TopicEmbeddings(), ttl=60)
+    cache.put("graph?", "answer", cache.version)
+    now[0] += 59
+    assert cache.get("graph?") == "answer"
+    now[0] += 2
+    assert cache.get("graph?") is None
+    assert cache.get("graph question") is None
+
+
+def test_invalidate_drops_entries_and_in_flight_answers():
+    cache = AnswerCache()
+    cache.put("q1", "a1", cache.version)
+    version = cache.version
+    cache.invalidate()
+    cache.put("q2", "stale", version)
+    assert cache.get("q1") is None and cache.get("q2") is None
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = AnswerCache(max_entries=2)
+    for question in ("q1", "q2"):
+        cache.put(question, question.upper(), cache.version)
+    cache.get("q1")
+    cache.put("q3", "Q3", cache.version)
+    assert cache.get("q2") is None
+    assert (cache.get("q1"), cache.get("q3")) == ("Q1", "Q3")
+
+
+class ChunkWriteFailsDriver(FakeDriver):
+    """Raises on the second chunk write, after the first one went through."""
+
+    chunk_writes = 0
+
+    def run(self, query, params):
+        if "MERGE (d:Document" in query:
+            self.chunk_writes += 1
+            if self.chunk_writes == 2:
+                raise ConnectionError("connection reset")
+        return super().run(query, params)
+
+
+@pytest.mark.parametrize("bulk", [True, False])
+def test_partial_ingest_still_invalidates_answers(make_engine, bulk):
+    from langchain_core.documents import Document
+    engine = make_engine(ChunkWriteFailsDriver(latency=0))
+    engine.schema_ready = True
+    engine.answer_cache.put("what is stored?", "old answer", engine.answer_cache.version)
+    chunks = [Document(page_content=f"Here Entity{i} works with Entity{i + 1}.",
+                       metadata={"source": "uploads/a.txt", "chunk_id": f"a_{i}"}) for i in range(3)]
+    with pytest.raises(ConnectionError):
+        engine.store_in_neo4j(chunks, bulk=bulk, batch_size=1)
+    assert engine.answer_cache.get("what is stored?") is None
+
+
+def test_concurrent_lookups_while_vectors_are_evicted():
+    cache = AnswerCache(TopicEmbeddings(), threshold=0.95)
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(200):
+                question = f"graph question {(n * 7 + i) % 100}"
+                if cache.get(question) is None:
+                    cache.put(question, "answer", cache.version)
+        except Exception as e:
+            errors.append(e)
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
@@ -0,0 +1,62 @@
+import json
+import pytest
+import benchmark
+from benchmark import FakeDriver, synthetic_pages
+from graph_retrieval import graph_paths, related_documents
+from neo4j_batch import write_batches
+from rag_engine import CHUNK_QUERY, TRIPLE_QUERY
+
+
+def seeded_driver():
+    driver = FakeDriver(latency=0)
+    write_batches(driver, CHUNK_QUERY, [{"doc_name": "a.txt", "chunk_id": "a_0", "text": "..."},
+                                        {"doc_name": "b.txt", "chunk_id": "b_0", "text": "..."}])
+    write_batches(driver, TRIPLE_QUERY.format(rel="RELATED_TO"),
+                  [{"subj": "Entity1", "obj": "Entity2", "rel": "RELATED_TO", "chunk_id": "a_0"},
+                   {"subj": "Entity2", "obj": "Entity3", "rel": "RELATED_TO", "chunk_id": "b_0"}])
+    return driver
+
+
+def test_fake_driver_answers_graph_reads_from_what_was_written():
+    driver = seeded_driver()
+    assert related_documents(driver, "How is Entity1 used?", hops=0) == [("a.txt", ["Entity1"])]
+    assert related_documents(driver, "How is Entity1 used?", hops=2) == [
+        ("a.txt", ["Entity1", "Entity2"]), ("b.txt", ["Entity2", "Entity3"])]
+    assert graph_paths(driver, "Entity1", hops=2) == [["Entity1", "Entity2"], ["Entity1", "Entity2", "Entity3"]]
+
+
+def test_synthetic_pages_mention_entities():
+    pages = list(synthetic_pages(50, docs=5))
+    assert len({page.metadata["source"] for page in pages}) == 5
+    assert sum("Entity" in page.page_content for page in pages) > 25
+
+
+def test_benchmark_runs_end_to_end(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    output = tmp_path / "bench.json"
+    benchmark.main(["--sizes", "50", "--queries", "5", "--retrievers", "vector", "graph",
+                    "--db-latency", "0", "--output", str(output)])
+    stages = json.loads(output.read_text())["runs"][0]["stages"]
+    assert {"store_in_neo4j", "graph_rag_query[vector]", "graph_rag_query[graph]"} <= set(stages)
+
+
+def test_neo4j_retrievers_need_a_real_neo4j(capsys):
+    with pytest.raises(SystemExit):
+        benchmark.main(["--retrievers", "vector", "neo4j_vector"])
+    assert "--neo4j testcontainer" in capsys.readouterr().err
+
+
+def test_reset_state_starts_each_size_from_an_empty_graph(workdir):
+    import graph_rag_app_streamlit as rag
+    driver = seeded_driver()
+    benchmark.reset_state(rag, driver)
+    assert related_documents(driver, "How is Entity1 used?", hops=2) == []
+    assert rag.vectorstore is None and not rag.manifest.files
+
+
+def test_equal_sizes_report_equal_store_round_trips(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    output = tmp_path / "bench.json"
+    benchmark.main(["--sizes", "40", "40", "--stages", "store", "--db-latency", "0", "--output", str(output)])
+    runs = json.loads(output.read_text())["runs"]
+    assert runs[0]["stages"]["store_in_neo4j"]["round_trips"] == runs[1]["stages"]["store_in_neo4j"]["round_trips"]
@@ -0,0 +1,45 @@
+import asyncio, json, types
+import cli
+
+
+class FakeAsyncDriver:
+    def __init__(self):
+        self.closed = 0
+
+    async def close(self):
+        self.closed += 1
+
+
+def fake_rag(delays):
+    async def graph_rag_query_async(question, **kwargs):
+        await asyncio.sleep(delays[question])
+        if question == "bad":
+            raise ValueError("no context")
+        return question.upper()
+
+    engine = types.SimpleNamespace(use_retriever=lambda name: None)
+    return types.SimpleNamespace(graph_rag_query_async=graph_rag_query_async, async_driver=FakeAsyncDriver(),
+                                 engine=engine)
+
+
+def test_records_are_written_as_they_complete_and_the_async_driver_is_closed():
+    rag = fake_rag({"slow": 0.2, "fast": 0.0, "bad": 0.1})
+    written = []
+    questions = [{"question": q} for q in ("slow", "fast", "bad")]
+    records = asyncio.run(cli.run_batch(rag, questions, concurrency=3, use_cache=False, write=written.append))
+
+    assert [r["question"] for r in written] == ["fast", "bad", "slow"]
+    assert [r["id"] for r in records] == [0, 1, 2]
+    assert written[1]["error"] == "ValueError: no context"
+    assert rag.async_driver.closed == 1
+
+
+def test_batch_query_writes_jsonl(tmp_path):
+    rag = fake_rag({"a": 0.0, "b": 0.0})
+    source, target = tmp_path / "questions.jsonl", tmp_path / "answers.jsonl"
+    source.write_text('{"id": "q1", "question": "a"}\n\n{"question": "b"}\n')
+    args = types.SimpleNamespace(input=str(source), output=str(target), concurrency=2, no_cache=True,
+                                 retriever="vector")
+    cli.cmd_batch_query(rag, args)
+    records = sorted((json.loads(line) for line in target.read_text().splitlines()), key=lambda r: str(r["id"]))
+    assert [(r["id"], r["answer"]) for r in records] == [(1, "B"), ("q1", "A")]
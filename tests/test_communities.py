@@ -0,0 +1,92 @@
+import pytest
+import communities
+from benchmark import FakeLLM
+from communities import community_relationships, detect_local, pack_summaries, parse_partial
+
+EDGES = [
+    ("a", "b", ["USES"], 3), ("b", "c", ["USES", "OWNS"], 1), ("a", "c", ["OWNS"], 2),
+    ("x", "y", ["KNOWS"], 5), ("y", "z", ["KNOWS"], 4), ("c", "x", ["LINKS"], 1),
+]
+
+
+def test_detect_local_splits_loosely_connected_groups():
+    partitions = sorted(sorted(p) for p in detect_local(EDGES))
+    assert partitions == [["a", "b", "c"], ["x", "y", "z"]]
+
+
+def test_community_relationships_keeps_internal_edges_heaviest_first():
+    lines = community_relationships([["a", "b", "c"], ["x", "y", "z"]], EDGES, max_edges=2)
+    assert lines == [["a -[USES]-> b", "a -[OWNS]-> c"], ["x -[KNOWS]-> y", "y -[KNOWS]-> z"]]
+    assert community_relationships([["a"], ["b"]], EDGES) == [[], []]
+
+
+def test_parse_partial():
+    assert parse_partial("SCORE: 80\nANSWER: Apple makes phones.") == (80, "Apple makes phones.")
+    assert parse_partial("SCORE: 250\nANSWER: x") == (100, "x")
+    assert parse_partial("no idea") == (0, "no idea")
+
+
+def test_pack_summaries_respects_max_chars():
+    summaries = [{"title": f"T{i}", "summary": "s" * 10} for i in range(5)]   # 15 characters each
+    batches = pack_summaries(summaries, max_chars=30)
+    assert [len(b) for b in batches] == [2, 2, 1]
+    assert batches[0][0] == "[T0] ssssssssss"
+    # A single summary longer than the limit still gets its own batch
+    assert pack_summaries([{"title": "T", "summary": "s" * 50}], max_chars=30) == [["[T] " + "s" * 50]]
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+    monkeypatch.setattr(communities, "entity_edges", lambda driver: EDGES)
+    monkeypatch.setattr(communities, "existing_summaries", lambda driver: {})
+    monkeypatch.setattr(communities, "write_batches",
+                        lambda driver, query, rows, batch_size, label: calls.append(("write", rows)))
+    monkeypatch.setattr(communities, "delete_communities",
+                        lambda driver, batch_size, run=None, keep_run=None: calls.append(("delete", run, keep_run)))
+    return calls
+
+
+def test_new_layer_is_written_before_the_old_one_is_deleted(calls):
+    result = communities.build_communities(None, FakeLLM(), use_gds=False)
+    assert result == {"communities": 2, "summarized": 2, "reused": 0}
+    (kind, rows), delete = calls
+    run = rows[0]["run"]
+    assert kind == "write" and all(row["id"].startswith(f"{run}-") and row["run"] == run for row in rows)
+    assert delete == ("delete", None, run)
+
+
+def test_failed_write_removes_only_the_partial_layer(calls, monkeypatch):
+    def failing_write(driver, query, rows, batch_size, label):
+        calls.append(("write", rows))
+        raise RuntimeError("connection lost")
+    monkeypatch.setattr(communities, "write_batches", failing_write)
+
+    with pytest.raises(RuntimeError):
+        communities.build_communities(None, FakeLLM(), use_gds=False)
+    (_, rows), delete = calls
+    assert delete == ("delete", rows[0]["run"], None)
+
+
+def test_delete_communities_selects_by_run():
+    from neo4j_delete import delete_communities
+
+    class Session:
+        queries = []
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def run(self, query, **params):
+            self.queries.append((query, params))
+            return type("Result", (), {"single": lambda self: {"deleted": 0}})()
+
+    driver = type("Driver", (), {"session": lambda self: Session()})()
+    delete_communities(driver, keep_run=7)
+    delete_communities(driver, run=7)
+    (keep, keep_params), (only, only_params) = Session.queries
+    assert "x.run <> $keep_run" in keep and keep_params["keep_run"] == 7
+    assert "{run: $run}" in only and only_params["run"] == 7
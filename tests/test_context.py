@@ -0,0 +1,66 @@
+from langchain_core.documents import Document
+from rag_engine.context import ContextAssembler, mmr_order, overlap_length, trim_overlaps, unique_docs
+
+A = "alpha " * 10
+B = "bravo " * 10
+C = "charlie " * 10
+
+
+def doc(text, **metadata):
+    return Document(page_content=text, metadata=metadata)
+
+
+def test_overlap_length():
+    assert overlap_length("the quick brown fox jumps", "fox jumps over the dog", min_overlap=5) == len("fox jumps")
+    assert overlap_length("abc", "xyz", min_overlap=1) == 0
+    assert overlap_length("short end", "end of it", min_overlap=20) == 0
+
+
+def test_unique_docs_by_chunk_id_then_text():
+    docs = [doc("one", chunk_id="a"), doc("two", chunk_id="a"), doc("three"), doc(" three "), doc("  ")]
+    assert [d.page_content for d in unique_docs(docs)] == ["one", "three"]
+
+
+def test_trim_overlaps_cuts_shared_spans_at_either_end():
+    shared = "shared overlap text spanning chunks"
+    kept = trim_overlaps([doc(f"first part. {shared}"), doc(f"{shared} second part.")], min_overlap=10)
+    assert [d.page_content for d in kept] == [f"first part. {shared}", "second part."]
+
+
+def test_trim_overlaps_drops_contained_chunks():
+    kept = trim_overlaps([doc(A + B, rank=1), doc(B, rank=2)])
+    assert [(d.page_content, d.metadata["rank"]) for d in kept] == [((A + B).strip(), 1)]
+
+
+def test_trim_overlaps_merges_into_the_better_rank_and_rechecks_the_rest():
+    merged = A + "and " + C + "and " + B
+    kept = trim_overlaps([doc(A, rank=1), doc(C, rank=2), doc(merged, rank=3), doc(B, rank=4)])
+    assert [(d.page_content, d.metadata["rank"]) for d in kept] == [(merged.strip(), 1)]
+
+
+def test_pack_keeps_rank_order_within_budget():
+    assembler = ContextAssembler(None, reranker=None)
+    assembler.tokenizer.encoding = None   # 4 characters per token
+    texts = ["a" * 40, "b" * 80, "c" * 20]   # 10, 20 and 5 tokens, + 1 separator each
+    assert assembler.pack(texts, 20) == ([0, 2], ["a" * 40, "c" * 20], 17)
+    indices, kept, used = assembler.pack(["x" * 400, "y" * 8], 11)
+    assert indices == [0] and kept == ["x" * 40] and used == 11
+    assert assembler.pack(texts, 0) == ([], [], 0)
+
+
+def test_mmr_order_trades_relevance_for_diversity():
+    vectors = [[1, 0], [1, 0.01], [0, 1]]
+    assert mmr_order([1.0, 0.99, 0.5], vectors, lambda_mult=1.0) == [0, 1, 2]
+    assert mmr_order([1.0, 0.99, 0.5], vectors, lambda_mult=0.5) == [0, 2, 1]
+
+
+def test_rerank_keeps_retriever_scores_as_relevance(embeddings):
+    assembler = ContextAssembler(embeddings, mmr_lambda=0.9)
+    docs = [doc(f"text {i} about something", score=s) for i, s in enumerate([0.2, 1.4, 0.9, 0.5])]
+    assert [d.metadata["score"] for d in assembler.rerank("question", docs)] == [1.4, 0.9, 0.5, 0.2]
+
+
+def test_rerank_without_scores_ranks_by_query_similarity(embeddings):
+    assembler = ContextAssembler(embeddings, mmr_lambda=1.0)
+    docs = [doc("unrelated words"), doc("the question"), doc("other text")]
+    assert assembler.rerank("the question", docs)[0].page_content == "the question"
@@ -0,0 +1,48 @@
+import multiprocessing, os, time
+import pytest
+import document_loading
+from document_loading import iter_documents
+
+fork_only = pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                               reason="workers must inherit the patched loader")
+
+
+@pytest.fixture
+def folder(tmp_path):
+    for name in ("a.txt", "b.txt", "bad.txt", "c.txt", "d.txt", "skip.md"):
+        (tmp_path / name).write_text(f"contents of {name}")
+    return tmp_path
+
+
+def sources(docs):
+    return sorted(os.path.basename(doc.metadata["source"]) for doc in docs)
+
+
+def test_loads_every_supported_file_in_a_pool(folder):
+    assert sources(iter_documents(str(folder), workers=2)) == ["a.txt", "b.txt", "bad.txt", "c.txt", "d.txt"]
+
+
+@fork_only
+def test_a_crashing_worker_only_loses_its_own_file(folder, monkeypatch):
+    load_file = document_loading.load_file
+
+    def crash_on_bad(path):
+        if path.endswith("bad.txt"):
+            os._exit(1)
+        return load_file(path)
+    monkeypatch.setattr(document_loading, "load_file", crash_on_bad)
+    assert sources(iter_documents(str(folder), workers=2)) == ["a.txt", "b.txt", "c.txt", "d.txt"]
+
+
+@pytest.mark.parametrize("workers", [1, pytest.param(2, marks=fork_only)])
+def test_slow_files_time_out(folder, monkeypatch, workers):
+    load_file = document_loading.load_file
+
+    def hang_on_bad(path):
+        if path.endswith("bad.txt"):
+            time.sleep(30)
+        return load_file(path)
+    monkeypatch.setattr(document_loading, "load_file", hang_on_bad)
+    start = time.perf_counter()
+    assert sources(iter_documents(str(folder), workers=workers, timeout=0.5)) == ["a.txt", "b.txt", "c.txt", "d.txt"]
+    assert time.perf_counter() - start < 10
@@ -0,0 +1,48 @@
+import asyncio
+from benchmark import FakeEmbeddings
+from embedding_cache import CachedEmbeddings
+
+
+class CountingEmbeddings(FakeEmbeddings):
+    def __init__(self):
+        super().__init__(size=4)
+        self.batches = []
+
+    def embed_documents(self, texts):
+        self.batches.append(list(texts))
+        return super().embed_documents(texts)
+
+
+def test_misses_are_deduplicated_into_one_batch(tmp_path):
+    inner = CountingEmbeddings()
+    cached = CachedEmbeddings(inner, str(tmp_path / "vectors.sqlite"))
+    first = cached.embed_documents(["a", "b", "a"])
+    assert inner.batches == [["a", "b"]]
+    assert first[0] == first[2] and len(first[0]) == 4
+
+    assert cached.embed_documents(["b", "c"])[0] == first[1]
+    assert inner.batches[-1] == ["c"]
+    stats = cached.stats()
+    assert stats["document"]["hits"] == 1 and stats["document"]["misses"] == 4
+    assert stats["entries"] == 3 and stats["bytes"] == 3 * 16
+
+
+def test_query_and_document_vectors_are_cached_separately(tmp_path):
+    cached = CachedEmbeddings(CountingEmbeddings(), str(tmp_path / "vectors.sqlite"))
+    cached.embed_documents(["a"])
+    cached.embed_query("a")
+    asyncio.run(cached.aembed_query("a"))
+    stats = cached.stats()
+    assert stats["query"]["hits"] == 1 and stats["query"]["misses"] == 1
+    assert stats["entries"] == 2
+
+
+def test_evicts_least_recently_used_vectors(tmp_path):
+    inner = CountingEmbeddings()
+    cached = CachedEmbeddings(inner, str(tmp_path / "vectors.sqlite"), max_bytes=40)
+    cached.embed_documents(["a", "b"])
+    cached.embed_documents(["a"])            # a is now more recent than b
+    cached.embed_documents(["c"])
+    assert cached.stats()["bytes"] == 32
+    cached.embed_documents(["a", "b", "c"])
+    assert inner.batches[-1] == ["b"]
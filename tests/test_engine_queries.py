@@ -0,0 +1,41 @@
+import asyncio
+import pytest
+from langchain_core.documents import Document
+
+
+@pytest.fixture
+def engine(make_engine):
+    engine = make_engine()
+    pages = [Document(page_content=f"Entity{i} is stored in the graph database next to Entity{i + 1}.",
+                      metadata={"source": f"uploads/doc_{i}.txt"}) for i in range(5)]
+    engine.build_vectorstore(engine.split_documents(pages))
+    return engine
+
+
+def test_async_query_matches_sync_query(engine):
+    answer = engine.query("Where is Entity1 stored?", use_cache=False)
+    assert asyncio.run(engine.query_async("Where is Entity1 stored?", use_cache=False)) == answer
+
+
+def test_async_hybrid_retrieval_matches_sync(make_engine):
+    from benchmark import FakeDriver
+    engine = make_engine(FakeDriver(latency=0))
+    engine.build_vectorstore(engine.split_documents([Document(page_content="Entity1 lives in the graph.",
+                                                              metadata={"source": "uploads/a.txt"})]))
+    sync = engine.retriever.retrieve("Entity1?", k_vector=1)
+    result = asyncio.run(engine.retriever.aretrieve("Entity1?", k_vector=1))
+    assert [d.page_content for d in result.docs] == [d.page_content for d in sync.docs]
+    assert result.graph_context == sync.graph_context
+
+
+def test_streamed_tokens_add_up_to_the_answer_and_are_cached(engine):
+    answer = engine.query("Where is Entity2 stored?", use_cache=False)
+    metadata, tokens = engine.query_stream("Where is Entity2 stored?")
+    streamed = "".join(tokens)
+    assert not metadata["cached"] and metadata["docs"]
+    assert streamed.split() == answer.split()
+
+    metadata, tokens = engine.query_stream("Where is Entity2 stored?")
+    assert metadata["cached"] and list(tokens) == [streamed]
+    # The chunks behind a cached answer are still shown
+    assert metadata["docs"]
@@ -0,0 +1,80 @@
+import threading
+from entity_neighbourhoods import NeighbourhoodIndex
+from graph_retrieval import expand_entities
+from test_graph_retrieval import EDGES, GraphDriver, GraphTx
+
+
+class HotGraphTx(GraphTx):
+    """GraphTx that also answers the top-entities query, hottest first."""
+
+    def __init__(self, edges, seeds, top):
+        super().__init__(edges, seeds)
+        self.top = top
+
+    def run(self, query, **params):
+        if "AS mentions" in query:
+            return [Record(name=name, mentions=len(self.top) - i, degree=len(self.adjacency.get(name, [])))
+                    for i, name in enumerate(self.top[:params["limit"]])]
+        return super().run(query, **params)
+
+
+class Record(dict):
+    def data(self):
+        return dict(self)
+
+
+def make_index(top=("apple",), hops=2, fanout=25):
+    tx = HotGraphTx(EDGES, ["apple"], list(top))
+    return NeighbourhoodIndex(GraphDriver(tx), top_n=10, hops=hops, fanout=fanout), tx
+
+
+def test_lookup_matches_live_expansion():
+    index, tx = make_index()
+    assert index.refresh() == 1
+    assert index.lookup(["apple", "swift"], hops=2, fanout=25) == {"apple": [["iphone", "mac"], ["ios", "macos"]]}
+    assert index.lookup(["apple"], hops=3, fanout=25) == {}
+    assert index.lookup(["apple"], hops=2, fanout=5) == {}
+    assert index.entity_stats("apple") == {"mentions": 1, "degree": 2}
+
+    live = expand_entities(tx, "apple", hops=2)
+    tx.queries.clear()
+    assert expand_entities(tx, "apple", hops=2, neighbourhoods=index) == live
+    assert not any("AS names" in q or "AS neighbours" in q for q in tx.queries)
+
+
+def test_incremental_refresh_only_recomputes_touched_neighbourhoods():
+    index, tx = make_index(top=("apple", "swift"))
+    assert index.refresh() == 2
+    assert index.refresh({"macos"}) == 1
+    assert index.refresh({"unknown"}) == 0
+    assert index.lookup(["swift"], hops=1, fanout=25) == {"swift": [["ios"]]}
+
+
+def test_name_table_keeps_only_live_entries():
+    index, tx = make_index(top=("apple", "swift"))
+    index.refresh()
+    tx.top = ["swift"]
+    index.refresh({"apple"})
+    names, ids, entries = index.table
+    assert set(entries) == {"swift"}
+    assert set(names) == set(ids) == {"ios", "iphone"}
+    assert index.lookup(["swift"], hops=2, fanout=25) == {"swift": [["ios"], ["iphone"]]}
+
+
+def test_clear_drops_a_refresh_already_running():
+    index, tx = make_index()
+    started, release = threading.Event(), threading.Event()
+    run = tx.run
+
+    def slow_run(query, **params):
+        started.set()
+        release.wait(5)
+        return run(query, **params)
+    tx.run = slow_run
+
+    index.schedule()
+    assert started.wait(5)
+    index.clear()
+    release.set()
+    index.wait(5)
+    assert index.entries == {} and index.refreshes == 0
@@ -0,0 +1,91 @@
+import extraction
+from benchmark import FakeMessage
+
+
+class FlakyLLM:
+    """Fails the first `failures` calls, then replies with one triple."""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise TimeoutError("rate limited")
+        return FakeMessage('[{"subject": "A", "relation": "knows", "object": "B"}]')
+
+
+def patch(monkeypatch, llm):
+    delays = []
+    monkeypatch.setattr(extraction, "default_llm", llm)
+    monkeypatch.setattr(extraction.time, "sleep", delays.append)
+    monkeypatch.setattr(extraction.random, "random", lambda: 0.5)
+    return delays
+
+
+def test_retries_with_exponential_backoff(monkeypatch):
+    llm = FlakyLLM(failures=2)
+    delays = patch(monkeypatch, llm)
+    triples = extraction.extract_triples("c1", "text", retries=3, backoff=1.0, use_cache=False)
+    assert triples == [{"subject": "A", "relation": "knows", "object": "B"}]
+    assert llm.calls == 3
+    assert delays == [1.5, 3.0]
+
+
+def test_gives_up_after_retries(monkeypatch):
+    llm = FlakyLLM(failures=10)
+    delays = patch(monkeypatch, llm)
+    assert extraction.extract_triples("c1", "text", retries=2, backoff=0.5, use_cache=False) is None
+    assert llm.calls == 3
+    assert delays == [0.75, 1.5]
+
+
+def test_extract_concurrently_yields_every_chunk(monkeypatch):
+    patch(monkeypatch, FlakyLLM(failures=0))
+    items = [(f"c{i}", f"text {i}") for i in range(20)]
+    results = dict(extraction.extract_concurrently(items, max_workers=3))
+    assert sorted(results) == sorted(chunk_id for chunk_id, _ in items)
+    assert all(triples and triples[0]["subject"] == "A" for triples in results.values())
+
+
+def test_uses_the_given_llm_and_keys_the_cache_by_it(monkeypatch, workdir):
+    from extraction_cache import ExtractionCache
+    default = FlakyLLM(failures=0)
+    patch(monkeypatch, default)
+    cache = ExtractionCache(path=str(workdir / "triples.db"))
+    monkeypatch.setattr(extraction, "get_cache", lambda: cache)
+
+    class OtherLLM(FlakyLLM):
+        model_name = "other-model"
+
+    other = OtherLLM(failures=0)
+    extraction.extract_triples("c1", "text", llm=other)
+    extraction.extract_triples("c1", "text", llm=other)
+    assert other.calls == 1 and default.calls == 0
+    # Same text through the default model is a different cache entry
+    extraction.extract_triples("c1", "text")
+    assert default.calls == 1
+
+
+def test_engine_extracts_with_its_own_llm(make_engine, monkeypatch):
+    from benchmark import FakeDriver, FakeLLM
+    from langchain_core.documents import Document
+
+    class CountingLLM(FakeLLM):
+        calls = 0
+
+        def invoke(self, messages):
+            CountingLLM.calls += 1
+            return super().invoke(messages)
+
+    monkeypatch.setattr(extraction, "default_llm", FlakyLLM(failures=100))
+    engine = make_engine(FakeDriver(latency=0))
+    engine.schema_ready = True
+    engine.llm = CountingLLM(latency=0.001)
+    engine.extraction_cache.clear()
+    chunks = engine.split_documents([Document(page_content="Here Entity1 works with Entity2.",
+                                              metadata={"source": "uploads/a.txt"})])
+    engine.store_in_neo4j_bulk(chunks, max_workers=1)
+    engine.store_in_neo4j(chunks)
+    assert CountingLLM.calls == 1   # the second store hits the cache keyed by this model
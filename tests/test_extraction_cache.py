@@ -0,0 +1,42 @@
+import os, subprocess, sys
+from conftest import ROOT
+from extraction_cache import ExtractionCache
+
+
+def test_get_put_and_hit_rate(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "cache.sqlite"))
+    key = ExtractionCache.make_key("text", "prompt", "model")
+    assert cache.get(key) is None
+    cache.put(key, [{"subject": "A", "relation": "knows", "object": "B"}])
+    assert cache.get(key) == [{"subject": "A", "relation": "knows", "object": "B"}]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert ExtractionCache.make_key("text", "prompt", "other model") != key
+
+
+def test_evicts_least_recently_used_with_a_running_total(tmp_path):
+    payload = ["x" * 96]   # 100 bytes of JSON
+    cache = ExtractionCache(str(tmp_path / "cache.sqlite"), max_bytes=350)
+    for key in "abc":
+        cache.put(key, payload)
+    cache.put("a", payload)           # replacing a key doesn't grow the total
+    assert cache.stats()["bytes"] == 300
+    cache.get("b")                    # b is now more recent than c
+    cache.put("d", payload)
+    assert cache.get("c") is None
+    assert all(cache.get(key) == payload for key in "abd")
+    assert cache.stats()["bytes"] == 300
+
+    reopened = ExtractionCache(str(tmp_path / "cache.sqlite"), max_bytes=350)
+    assert reopened.stats()["bytes"] == 300
+    reopened.clear()
+    assert reopened.stats()["bytes"] == 0
+
+
+def test_importing_extraction_does_not_create_the_cache(tmp_path):
+    script = ("import sys, benchmark; "
+              "benchmark.install_config(None, benchmark.FakeEmbeddings(), benchmark.FakeLLM()); "
+              "import extraction")
+    subprocess.run([sys.executable, "-c", script], cwd=tmp_path, check=True,
+                   env=dict(os.environ, PYTHONPATH=ROOT))
+    assert not (tmp_path / ".cache").exists()
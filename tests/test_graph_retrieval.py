@@ -0,0 +1,138 @@
+import asyncio
+from graph_retrieval import (_next_level, expand_entities, expand_entities_async, fulltext_query, graph_paths,
+                             related_documents_async)
+
+EDGES = [("apple", "iphone"), ("apple", "mac"), ("iphone", "ios"), ("mac", "macos"), ("ios", "swift")]
+
+
+class GraphTx:
+    """Answers the seed, expansion and neighbour statements from an in-memory edge list."""
+
+    def __init__(self, edges, seeds):
+        self.adjacency = {}
+        for a, b in edges:
+            self.adjacency.setdefault(a, []).append(b)
+            self.adjacency.setdefault(b, []).append(a)
+        self.seeds = seeds
+        self.queries = []
+
+    def run(self, query, **params):
+        self.queries.append(query)
+        if "fulltext" in query:
+            return [{"name": name} for name in self.seeds[:params["limit"]]]
+        neighbours = {name: self.adjacency.get(name, [])[:params["fanout"]] for name in params["frontier"]}
+        if "AS neighbours" in query:
+            return [{"name": name, "neighbours": names} for name, names in neighbours.items()]
+        return Single({"names": list(dict.fromkeys(n for names in neighbours.values() for n in names))})
+
+
+class Single(list):
+    def __init__(self, record):
+        super().__init__([record])
+
+    def single(self):
+        return self[0]
+
+
+class GraphDriver:
+    def __init__(self, tx):
+        self.tx = tx
+
+    def session(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute_read(self, fn, *args):
+        return fn(self.tx, *args)
+
+
+def test_fulltext_query_quotes_lowercased_terms_and_drops_stopwords():
+    assert fulltext_query("How is Apple AND Microsoft related, OR NOT?") == '"apple" OR "microsoft" OR "related"'
+
+
+def test_fulltext_query_keeps_special_characters_inside_quotes():
+    assert fulltext_query('C++ "quoted" a\\b') == '"c++" OR "quoted" OR "a\\\\b"'
+    assert fulltext_query("the and of ?") == ""
+
+
+def test_next_level_merges_hot_levels_before_expanded_names():
+    hot = {"apple": [["iphone", "mac"], ["ios"]]}
+    reached, frontier = _next_level(hot, 0, ["ipad", "iphone", "ipad"], {"apple"}, room=10)
+    assert reached == ["iphone", "mac", "ipad"]
+    # Hot names are covered by their precomputed later levels
+    assert frontier == ["ipad"]
+
+
+def test_next_level_respects_room_and_seen():
+    reached, frontier = _next_level({}, 0, ["a", "b", "c"], {"b"}, room=1)
+    assert (reached, frontier) == (["a"], ["a"])
+
+
+def test_expand_entities_is_bounded_by_hops_and_fanout():
+    tx = GraphTx(EDGES, ["apple"])
+    assert expand_entities(tx, "apple", hops=1) == ["apple", "iphone", "mac"]
+    assert expand_entities(tx, "apple", hops=2, fanout=1) == ["apple", "iphone"]
+
+
+def test_graph_paths_walks_a_bounded_bfs():
+    driver = GraphDriver(GraphTx(EDGES, ["apple"]))
+    assert graph_paths(driver, "apple", hops=2) == [
+        ["apple", "iphone"], ["apple", "mac"], ["apple", "iphone", "ios"], ["apple", "mac", "macos"]]
+    assert graph_paths(driver, "apple", hops=3, limit=3) == [["apple", "iphone"], ["apple", "mac"],
+                                                             ["apple", "iphone", "ios"]]
+    # As in expand_entities, the fan-out cap counts neighbours that were already visited
+    assert graph_paths(driver, "apple", hops=3, fanout=1) == [["apple", "iphone"]]
+
+
+class AsyncResult:
+    def __init__(self, records):
+        self.records = list(records)
+
+    def __aiter__(self):
+        async def iterate():
+            for record in self.records:
+                yield record
+        return iterate()
+
+    async def single(self):
+        return self.records[0]
+
+
+class AsyncGraphTx(GraphTx):
+    async def run(self, query, **params):
+        return AsyncResult(super().run(query, **params))
+
+
+class AsyncGraphDriver(GraphDriver):
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute_read(self, fn, *args):
+        return await fn(self.tx, *args)
+
+
+def test_async_expansion_sends_the_same_queries_as_sync():
+    sync_tx, async_tx = GraphTx(EDGES, ["apple"]), AsyncGraphTx(EDGES, ["apple"])
+    names = expand_entities(sync_tx, "apple", hops=3, fanout=2)
+    assert asyncio.run(expand_entities_async(async_tx, "apple", hops=3, fanout=2)) == names
+    assert async_tx.queries == sync_tx.queries
+
+
+def test_related_documents_async_uses_the_shared_bfs():
+    class DocsTx(AsyncGraphTx):
+        async def run(self, query, **params):
+            if "AS doc_name" in query:
+                self.queries.append(query)
+                return AsyncResult([{"doc_name": "a.txt", "related_entities": params["names"][:2]}])
+            return await super().run(query, **params)
+
+    driver = AsyncGraphDriver(DocsTx(EDGES, ["apple"]))
+    assert asyncio.run(related_documents_async(driver, "apple", hops=1)) == [("a.txt", ["apple", "iphone"])]
@@ -0,0 +1,60 @@
+import json, os
+from ingest_manifest import IngestManifest
+from vector_index import folder_snapshot
+
+
+def record_all(manifest, current, version="m1"):
+    for filename, record in current.items():
+        manifest.record(filename, record, chunks=1, model_version=version)
+
+
+def test_diff_reports_added_modified_and_removed(tmp_path):
+    folder = tmp_path / "docs"
+    folder.mkdir()
+    for name in ("a.txt", "b.txt", "c.txt", "notes.md"):
+        (folder / name).write_text(name)
+    manifest = IngestManifest(str(tmp_path / "manifest.json"))
+    added, modified, removed, current = manifest.diff(str(folder), "m1")
+    assert (added, modified, removed) == (["a.txt", "b.txt", "c.txt"], [], [])
+    record_all(manifest, current)
+    manifest.save()
+
+    (folder / "b.txt").write_text("changed b")
+    (folder / "c.txt").unlink()
+    (folder / "d.txt").write_text("d")
+    reloaded = IngestManifest(str(tmp_path / "manifest.json"))
+    added, modified, removed, _ = reloaded.diff(str(folder), "m1")
+    assert (added, modified, removed) == (["d.txt"], ["b.txt"], ["c.txt"])
+
+
+def test_diff_ignores_touched_but_identical_files_and_flags_model_changes(tmp_path):
+    folder = tmp_path / "docs"
+    folder.mkdir()
+    (folder / "a.txt").write_text("same")
+    manifest = IngestManifest(str(tmp_path / "manifest.json"))
+    record_all(manifest, manifest.diff(str(folder), "m1")[3])
+
+    os.utime(folder / "a.txt", (1, 1))
+    assert manifest.diff(str(folder), "m1")[:3] == ([], [], [])
+    assert manifest.diff(str(folder), "m2")[:3] == ([], ["a.txt"], [])
+
+
+def test_sync_ingests_changes_and_stamps_the_index_with_the_synced_folder(make_engine, workdir):
+    engine = make_engine()
+    folder = workdir / "other"   # not the engine's uploads folder
+    folder.mkdir()
+    for i in range(3):
+        (folder / f"doc_{i}.txt").write_text(f"Document {i} talks about topic {i}.")
+
+    assert engine.sync_uploads(str(folder), workers=1)["added"] == ["doc_0.txt", "doc_1.txt", "doc_2.txt"]
+    assert engine.sync_uploads(str(folder), workers=1) == {"added": [], "modified": [], "removed": []}
+
+    (folder / "doc_1.txt").unlink()
+    assert engine.sync_uploads(str(folder), workers=1)["removed"] == ["doc_1.txt"]
+    assert os.path.join(str(folder), "doc_1.txt") not in engine.index_manager
+
+    root = str(workdir / "index")
+    with open(os.path.join(root, "CURRENT")) as f:
+        version = f.read().strip()
+    with open(os.path.join(root, version, "manifest.json")) as f:
+        assert json.load(f)["files"] == folder_snapshot(str(folder))
@@ -0,0 +1,61 @@
+import pytest
+from benchmark import FakeDriver
+from ingest_pipeline import PipelineError
+from rag_engine import engine as engine_module
+
+
+@pytest.fixture
+def uploads(workdir):
+    folder = workdir / "uploads"
+    folder.mkdir()
+    for i in range(4):
+        (folder / f"doc_{i}.txt").write_text(f"Here Entity{i} is linked to Entity{i + 1} in document {i}.")
+    return folder
+
+
+@pytest.fixture
+def engine(make_engine, monkeypatch):
+    engine = make_engine(FakeDriver(latency=0))
+    engine.schema_ready = True
+    engine.refreshes = []
+    monkeypatch.setattr(engine, "refresh_neighbourhoods", lambda touched=None, wait=False: engine.refreshes.append(touched))
+    return engine
+
+
+def test_one_extraction_pool_and_one_refresh_per_run(engine, uploads, monkeypatch):
+    pools = []
+    extract_concurrently = engine_module.extract_concurrently
+
+    def counting(items, *args, **kwargs):
+        pools.append(1)
+        yield from extract_concurrently(items, *args, **kwargs)
+    monkeypatch.setattr(engine_module, "extract_concurrently", counting)
+    version = engine.answer_cache.version
+
+    stats = engine.ingest_streaming(str(uploads), workers=1, batch_size=1)
+    assert stats["batches"] == 4 and stats["triples"] == 4
+    assert len(pools) == 1
+    assert engine.answer_cache.version == version + 1
+    assert engine.refreshes == [{f"Entity{i}" for i in range(5)}]
+    assert not engine.index_manager.streaming
+    assert len(engine.index_manager.doc_hashes) == 4
+
+
+def test_a_failed_run_drops_partly_streamed_documents(engine, uploads, monkeypatch):
+    embed = engine.embeddings.embed_documents
+    calls = []
+
+    def fail_on_third_batch(texts):
+        calls.append(texts)
+        if len(calls) == 3:
+            raise ConnectionError("embedding service down")
+        return embed(texts)
+    monkeypatch.setattr(engine.embeddings, "embed_documents", fail_on_third_batch)
+    version = engine.answer_cache.version
+
+    with pytest.raises(PipelineError):
+        engine.ingest_streaming(str(uploads), workers=1, batch_size=1)
+    assert not engine.index_manager.streaming
+    assert not engine.index_manager.doc_hashes and not engine.index_manager.doc_chunks
+    assert engine.answer_cache.version == version + 1
+    assert len(engine.refreshes) == 1
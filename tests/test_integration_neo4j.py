@@ -0,0 +1,84 @@
+import pytest
+from langchain_core.documents import Document
+
+pytest.importorskip("neo4j")
+pytest.importorskip("testcontainers.neo4j")
+
+# ---------------------------
+# Against a real Neo4j (testcontainers)
+# ---------------------------
+
+
+@pytest.fixture(scope="module")
+def neo4j_driver():
+    from benchmark import start_testcontainer
+    try:
+        container, driver = start_testcontainer()
+    except Exception as e:
+        pytest.skip(f"Neo4j container unavailable: {e}")
+    try:
+        yield driver
+    finally:
+        driver.close()
+        container.stop()
+
+
+@pytest.fixture
+def engine(make_engine, neo4j_driver):
+    with neo4j_driver.session() as session:
+        session.run("MATCH (n) DETACH DELETE n").consume()
+    return make_engine(neo4j_driver)
+
+
+def count(engine, query):
+    with engine.driver.session() as session:
+        return session.run(query).single()[0]
+
+
+def document(name, text):
+    return Document(page_content=text, metadata={"source": f"uploads/{name}"})
+
+
+def test_ingest_writes_entities_and_mentions(engine):
+    chunks = engine.split_documents([document("a.txt", "Here Entity1 works with Entity2 and Entity3.")])
+    engine.store_in_neo4j(chunks, bulk=True)
+
+    assert count(engine, "MATCH (e:Entity) RETURN count(e)") == 3
+    assert count(engine, "MATCH (:Chunk)-[m:MENTIONS]->(:Entity) RETURN count(m)") == 3
+    assert count(engine, "MATCH (c:Chunk) RETURN count(c)") == len(chunks)
+
+
+def test_deleting_a_document_keeps_entities_another_document_mentions(engine):
+    chunks = engine.split_documents([document("a.txt", "Here Entity1 works with Entity2."),
+                                     document("b.txt", "Here Entity2 works with Entity3.")])
+    engine.store_in_neo4j(chunks, bulk=True)
+
+    engine.delete_doc("uploads/a.txt")
+    with engine.driver.session() as session:
+        names = {record["name"] for record in session.run("MATCH (e:Entity) RETURN e.name AS name")}
+        documents = [record["name"] for record in session.run("MATCH (d:Document) RETURN d.name AS name")]
+    assert names == {"Entity2", "Entity3"}
+    assert documents == ["uploads/b.txt"]
+    assert count(engine, "MATCH (c:Chunk) RETURN count(c)") == 1
+
+
+def test_expanded_search_scores_only_graph_neighbours_by_proximity(make_engine, neo4j_driver):
+    from neo4j_vectors import expanded_search
+    with neo4j_driver.session() as session:
+        session.run("MATCH (n) DETACH DELETE n").consume()
+    engine = make_engine(neo4j_driver, neo4j_vectors=True)
+    chunks = engine.split_documents([document("a.txt", "Here Entity1 works with Entity2."),
+                                     document("b.txt", "Here Entity2 works with Entity3."),
+                                     document("c.txt", "Here Entity3 works with Entity4.")])
+    engine.store_in_neo4j(chunks, bulk=True)
+    engine.build_vectorstore(chunks)
+    with neo4j_driver.session() as session:
+        session.run("CALL db.awaitIndexes()").consume()
+
+    docs = expanded_search(neo4j_driver, engine.embeddings.embed_query(chunks[0].page_content),
+                           k_vector=1, k_graph=2, hops=1)
+    hit, neighbours = docs[0], docs[1:]
+    assert hit.metadata["source"] == "uploads/a.txt"
+    assert hit.metadata["graph_score"] == 0.0 and hit.metadata["score"] == hit.metadata["vector_score"]
+    assert neighbours and all(d.metadata["vector_score"] == 0.0 and d.metadata["graph_score"] > 0 for d in neighbours)
+    assert "uploads/a.txt" not in {d.metadata["source"] for d in neighbours}
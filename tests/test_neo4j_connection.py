@@ -0,0 +1,47 @@
+from benchmark import FakeDriver
+from neo4j_connection import InstrumentedDriver, pool_settings, pool_metrics
+
+
+def test_pool_settings_precedence(monkeypatch):
+    monkeypatch.setenv("NEO4J_MAX_POOL_SIZE", "20")
+    monkeypatch.setenv("NEO4J_KEEP_ALIVE", "false")
+    settings = pool_settings(fetch_size=250, user_agent="tests")
+    assert settings["max_connection_pool_size"] == 20
+    assert settings["keep_alive"] is False
+    assert settings["fetch_size"] == 250
+    assert settings["user_agent"] == "tests"
+    assert pool_settings(max_connection_pool_size=5)["max_connection_pool_size"] == 5
+
+
+def test_metrics_fall_back_to_session_counts():
+    driver = InstrumentedDriver(FakeDriver(latency=0), max_pool_size=4)
+    with driver.session():
+        with driver.session():
+            metrics = driver.metrics()
+    assert metrics["in_use"] == 2
+    assert metrics["utilization"] == 0.5
+    assert metrics["sessions_peak"] == 2
+    assert driver.metrics()["in_use"] == 0
+
+
+def test_pool_metrics_reads_pool_internals():
+    class Config:
+        max_connection_pool_size = 10
+
+    class Pool:
+        pool_config = Config()
+        connections = {"db:7687": [object()] * 3}
+
+        def in_use_connection_count(self, address):
+            return 2
+
+    class Driver:
+        _pool = Pool()
+
+    metrics = pool_metrics(InstrumentedDriver(Driver()))
+    assert metrics["max_pool_size"] == 10
+    assert metrics["servers"]["db:7687"] == {"in_use": 2, "idle": 1, "utilization": 0.2}
+
+
+def test_pool_metrics_without_counts():
+    assert pool_metrics(object()) == {}
@@ -0,0 +1,55 @@
+import pytest
+from langchain_core.documents import Document
+from benchmark import FakeDriver
+from rag_engine import TripleWriteError, triple_rows
+
+
+class FailingTripleDriver(FakeDriver):
+    """Accepts every statement except the MENTIONS writes of TRIPLE_QUERY."""
+
+    def run(self, query, params):
+        if ":MENTIONS]" in query:
+            raise RuntimeError("constraint violation")
+        return super().run(query, params)
+
+
+def chunks():
+    return [Document(page_content=f"Here Entity{i} works with Entity{i + 1} on the graph",
+                     metadata={"source": "uploads/a.txt", "chunk_id": f"a_{i}"}) for i in range(3)]
+
+
+def test_triples_link_stored_chunks_without_creating_chunks(make_engine):
+    driver = FakeDriver(latency=0)
+    engine = make_engine(driver)
+    engine.schema_ready = True
+    engine.store_in_neo4j(chunks(), bulk=True)
+    assert set(driver.graph.doc_of_chunk) == {"a_0", "a_1", "a_2"}
+    assert driver.graph.mentions["Entity1"] == {"a_0", "a_1"}
+
+    engine.write_triples([{"subj": "X", "obj": "Y", "rel": "KNOWS", "chunk_id": "missing"}])
+    assert set(driver.graph.doc_of_chunk) == {"a_0", "a_1", "a_2"}
+    assert driver.graph.mentions["X"] == set() and driver.graph.neighbours["X"] == {"Y"}
+
+
+def test_triple_rows_cleans_relation_types_and_skips_incomplete_triples():
+    rows = triple_rows("a_0", [{"subject": "A", "relation": "works with", "object": "B"},
+                               {"subject": "A", "object": "C"},
+                               {"subject": "A", "relation": "knows"}])
+    assert rows == [{"subj": "A", "obj": "B", "rel": "WORKS_WITH", "chunk_id": "a_0"},
+                    {"subj": "A", "obj": "C", "rel": "RELATED_TO", "chunk_id": "a_0"}]
+
+
+@pytest.mark.parametrize("bulk", [True, False])
+def test_failed_triple_writes_are_raised(make_engine, bulk):
+    engine = make_engine(FailingTripleDriver(latency=0))
+    with pytest.raises(TripleWriteError) as error:
+        engine.store_in_neo4j(chunks(), bulk=bulk)
+    assert error.value.failures
+    assert "constraint violation" in str(error.value)
+
+
+def test_successful_bulk_store_counts_chunks_and_triples(make_engine):
+    engine = make_engine(FakeDriver(latency=0))
+    # 3 chunk rows + one Entity{i} -> Entity{i+1} triple per chunk
+    assert engine.store_in_neo4j(chunks(), bulk=True) == 6
+
@@ -0,0 +1,64 @@
+import asyncio
+import pytest
+from langchain_core.documents import Document
+from benchmark import FakeDriver
+from rag_engine.retrievers import (RETRIEVERS, GraphRetriever, HybridRetriever, Retrieval, VectorRetriever,
+                                   build_retriever, format_graph_context)
+
+
+@pytest.fixture
+def engine(make_engine):
+    engine = make_engine(FakeDriver(latency=0))
+    engine.schema_ready = True
+    pages = [Document(page_content=f"Here Entity{i} is linked to Entity{i + 1} in the graph.",
+                      metadata={"source": f"uploads/doc_{i}.txt"}) for i in range(3)]
+    chunks = engine.split_documents(pages)
+    engine.build_vectorstore(chunks)
+    engine.store_in_neo4j_bulk(chunks, max_workers=1)
+    return engine
+
+
+def test_build_retriever_by_name(engine):
+    for name, cls in RETRIEVERS.items():
+        assert isinstance(build_retriever(name, engine), cls)
+    with pytest.raises(ValueError, match="Unknown retriever"):
+        build_retriever("bm25", engine)
+
+
+def test_use_retriever_checks_the_backend(make_engine):
+    engine = make_engine()
+    with pytest.raises(ValueError, match="needs a Neo4j driver"):
+        engine.use_retriever("graph")
+    engine = make_engine(FakeDriver(latency=0))
+    with pytest.raises(ValueError, match="neo4j_vectors=True"):
+        engine.use_retriever("neo4j_vector")
+    assert isinstance(engine.use_retriever("hybrid"), HybridRetriever)
+
+
+def test_retrieval_is_empty():
+    assert Retrieval().is_empty()
+    assert Retrieval(docs=[Document(page_content="  ")], graph_context="\n").is_empty()
+    assert not Retrieval(graph_context="doc.txt mentions: a").is_empty()
+
+
+def test_format_graph_context():
+    assert format_graph_context([("a.txt", ["x", "y"]), ("b.txt", ["z"])]) == "a.txt mentions: x, y\nb.txt mentions: z"
+
+
+def test_vector_retriever_returns_chunks_only(engine):
+    retrieval = VectorRetriever(engine).retrieve("Where is Entity1?", k_vector=2)
+    assert len(retrieval.docs) == 2 and retrieval.graph_context == ""
+
+
+def test_graph_retriever_finds_documents_through_entities(engine):
+    retrieval = GraphRetriever(engine).retrieve("What is Entity1 linked to?", hops=1)
+    assert not retrieval.docs
+    assert "uploads/doc_0.txt mentions:" in retrieval.graph_context
+    assert "uploads/doc_1.txt mentions:" in retrieval.graph_context
+
+
+def test_hybrid_retriever_combines_both(engine):
+    retrieval = HybridRetriever(engine).retrieve("What is Entity1 linked to?", k_vector=1, hops=1)
+    assert len(retrieval.docs) == 1 and "mentions:" in retrieval.graph_context
+    assert asyncio.run(HybridRetriever(engine).aretrieve("What is Entity1 linked to?", k_vector=1, hops=1)
+                       ).graph_context == retrieval.graph_context
@@ -0,0 +1,48 @@
+import socket, urllib.request
+import pytest
+import tracing
+from tracing import PrometheusExporter, collect_timings, configure_from_env, span
+
+
+@pytest.fixture(autouse=True)
+def no_exporters():
+    tracing.clear_exporters()
+    yield
+    tracing.clear_exporters()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_spans_feed_timings_and_exporters():
+    exporter = tracing.add_exporter(PrometheusExporter())
+    with collect_timings() as timings:
+        with span("retrieve", k=3) as attributes:
+            attributes.update(docs=2)
+        with pytest.raises(ValueError), span("llm"):
+            raise ValueError("boom")
+    assert set(timings) == {"retrieve", "llm"}
+    text = exporter.render()
+    assert 'graph_rag_span_duration_seconds_count{span="retrieve"} 1' in text
+    assert 'graph_rag_span_errors_total{span="llm"} 1' in text
+
+
+def test_configure_from_env_serves_prometheus_on_the_given_port(monkeypatch):
+    port = free_port()
+    monkeypatch.setenv("RAG_TRACING", f"logging, prometheus:{port}, unknown")
+    exporters = configure_from_env()
+    assert [type(e).__name__ for e in exporters] == ["LoggingExporter", "PrometheusExporter"]
+    with span("answer_cache"):
+        pass
+    body = urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5).read().decode()
+    assert 'graph_rag_span_duration_seconds_count{span="answer_cache"} 1' in body
+    # Configured once per process
+    assert configure_from_env() == exporters
+
+
+def test_a_bad_port_keeps_the_exporter(monkeypatch):
+    monkeypatch.setenv("RAG_TRACING", "prometheus:notaport")
+    assert [type(e).__name__ for e in configure_from_env()] == ["PrometheusExporter"]
@@ -0,0 +1,59 @@
+import os
+from langchain_core.documents import Document
+from vector_index import VectorIndexManager, assign_chunk_ids
+
+
+def chunks(doc_name, *texts):
+    return assign_chunk_ids([Document(page_content=text, metadata={"source": doc_name}) for text in texts])
+
+
+def stored_texts(manager):
+    return sorted(doc.page_content for doc in manager.vectorstore.docstore._dict.values())
+
+
+def test_assign_chunk_ids_numbers_chunks_per_document():
+    docs = [Document(page_content=t, metadata={"source": s}) for t, s in [("1", "a"), ("2", "b"), ("3", "a")]]
+    assert [d.metadata["chunk_id"] for d in assign_chunk_ids(docs)] == ["a_0", "b_0", "a_1"]
+
+    counters = {}
+    assign_chunk_ids(docs[:1], counters)
+    later = assign_chunk_ids([Document(page_content="4", metadata={"source": "a"})], counters)
+    assert later[0].metadata["chunk_id"] == "a_1"
+
+
+def test_upsert_skips_unchanged_and_replaces_changed_documents(embeddings):
+    manager = VectorIndexManager(embeddings)
+    assert manager.update(chunks("a", "one", "two") + chunks("b", "three")) == 3
+    assert manager.upsert_document("a", chunks("a", "one", "two")) == 0
+    assert manager.upsert_document("a", chunks("a", "uno")) == 1
+    assert stored_texts(manager) == ["three", "uno"]
+    assert manager.doc_chunks["a"] == ["a_0"]
+
+
+def test_delete_document_removes_its_vectors(embeddings):
+    manager = VectorIndexManager(embeddings)
+    manager.update(chunks("a", "one", "two") + chunks("b", "three"))
+    assert manager.delete_document("a") == 2
+    assert "a" not in manager
+    assert stored_texts(manager) == ["three"]
+    assert manager.delete_document("a") == 0
+
+
+def test_save_and_load_keep_versions_and_reject_stale_indexes(embeddings, tmp_path):
+    root = str(tmp_path / "index")
+    files = {"a.txt": {"size": 1, "mtime": 1.0}}
+    manager = VectorIndexManager(embeddings)
+    manager.update(chunks("a", "one", "two"))
+    for _ in range(3):
+        manager.save(root, files, keep=2)
+    assert sorted(os.listdir(root)) == ["CURRENT", "v0002", "v0003"]
+
+    loaded = VectorIndexManager(embeddings)
+    assert loaded.load(root, files)
+    assert loaded.doc_chunks == manager.doc_chunks and loaded.doc_hashes == manager.doc_hashes
+    assert stored_texts(loaded) == ["one", "two"]
+
+    assert not VectorIndexManager(embeddings).load(root, {"a.txt": {"size": 2, "mtime": 1.0}})
+    other = type(embeddings)(size=8)
+    assert not VectorIndexManager(other).load(root, files)
+    assert not VectorIndexManager(embeddings).load(str(tmp_path / "missing"), files)
@@ -0,0 +1,200 @@
+import contextvars, functools, logging, os, threading, time
+from contextlib import contextmanager
+
+# ---------------------------
+# Lightweight spans
+# ---------------------------
+# with span("graph_retrieval", hops=3): ...
+# Every finished span goes to the registered exporters; collect_timings()
+# additionally gathers a per-request {span name: seconds} breakdown.
+logger = logging.getLogger("graph_rag.tracing")
+
+_exporters = []
+_timings = contextvars.ContextVar("timings", default=None)
+
+
+class Span:
+    def __init__(self, name, start, duration, attributes, error=None):
+        self.name = name
+        self.start = start            # wall-clock seconds since epoch
+        self.duration = duration      # seconds
+        self.attributes = attributes
+        self.error = error
+
+
+def add_exporter(exporter):
+    _exporters.append(exporter)
+    return exporter
+
+
+def clear_exporters():
+    _exporters.clear()
+
+
+@contextmanager
+def span(name, **attributes):
+    start_wall = time.time()
+    start = time.perf_counter()
+    error = None
+    try:
+        yield attributes
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        timings = _timings.get()
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + duration
+        record = Span(name, start_wall, duration, attributes, error)
+        for exporter in _exporters:
+            try:
+                exporter.export(record)
+            except Exception as e:
+                logger.warning("Span exporter %s failed: %s", type(exporter).__name__, e)
+
+
+def traced(name):
+    """Decorator form of span() for whole functions."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def collect_timings():
+    """Yields a dict filled with the total seconds spent in each span inside the block."""
+    timings = {}
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+# ---------------------------
+# Exporters
+# ---------------------------
+class LoggingExporter:
+    def __init__(self, level=logging.INFO):
+        self.level = level
+
+    def export(self, record):
+        attrs = " ".join(f"{k}={v}" for k, v in record.attributes.items())
+        status = f" error={record.error}" if record.error else ""
+        logger.log(self.level, "span %s %.1fms %s%s", record.name, record.duration * 1000, attrs, status)
+
+
+class PrometheusExporter:
+    """Aggregates spans into a latency histogram rendered in the Prometheus text format."""
+
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self, metric="graph_rag_span_duration_seconds"):
+        self.metric = metric
+        self.lock = threading.Lock()
+        self.series = {}   # span name -> [bucket counts..., count, sum, errors]
+
+    def export(self, record):
+        with self.lock:
+            series = self.series.setdefault(record.name, [0] * len(self.BUCKETS) + [0, 0.0, 0])
+            for i, bound in enumerate(self.BUCKETS):
+                if record.duration <= bound:
+                    series[i] += 1
+            series[-3] += 1
+            series[-2] += record.duration
+            if record.error:
+                series[-1] += 1
+
+    def render(self):
+        lines = [
+            f"# HELP {self.metric} Time spent in each RAG pipeline stage.",
+            f"# TYPE {self.metric} histogram",
+        ]
+        errors = [f"# TYPE {self.metric.replace('_duration_seconds', '_errors_total')} counter"]
+        with self.lock:
+            for name, series in sorted(self.series.items()):
+                for bound, count in zip(self.BUCKETS, series):
+                    lines.append(f'{self.metric}_bucket{{span="{name}",le="{bound}"}} {count}')
+                lines.append(f'{self.metric}_bucket{{span="{name}",le="+Inf"}} {series[-3]}')
+                lines.append(f'{self.metric}_count{{span="{name}"}} {series[-3]}')
+                lines.append(f'{self.metric}_sum{{span="{name}"}} {series[-2]:.6f}')
+                errors.append(f'{self.metric.replace("_duration_seconds", "_errors_total")}{{span="{name}"}} {series[-1]}')
+        return "\n".join(lines + errors) + "\n"
+
+    def serve(self, port=9464):
+        """Serves render() on http://0.0.0.0:<port>/metrics from a daemon thread."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = exporter.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("0.0.0.0", port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+class OpenTelemetryExporter:
+    """Re-emits spans through the OpenTelemetry API (requires opentelemetry-api/sdk)."""
+
+    def __init__(self, tracer_name="graph_rag"):
+        from opentelemetry import trace
+        self.trace = trace
+        self.tracer = trace.get_tracer(tracer_name)
+
+    def export(self, record):
+        start_ns = int(record.start * 1e9)
+        otel_span = self.tracer.start_span(record.name, start_time=start_ns,
+                                           attributes={k: str(v) for k, v in record.attributes.items()})
+        if record.error:
+            otel_span.set_status(self.trace.Status(self.trace.StatusCode.ERROR, record.error))
+        otel_span.end(end_time=start_ns + int(record.duration * 1e9))
+
+
+EXPORTERS = {
+    "logging": LoggingExporter,
+    "prometheus": PrometheusExporter,
+    "otel": OpenTelemetryExporter,
+}
+
+
+def configure_from_env(var="RAG_TRACING"):
+    """
+    Registers exporters named in e.g. RAG_TRACING=logging,prometheus (once per
+    process). prometheus:PORT also serves /metrics on that port.
+    """
+    if _exporters:
+        return list(_exporters)
+    for entry in filter(None, (n.strip() for n in os.environ.get(var, "").split(","))):
+        name, _, port = entry.partition(":")
+        try:
+            exporter = add_exporter(EXPORTERS[name]())
+        except KeyError:
+            logger.warning("Unknown tracing exporter '%s'", name)
+            continue
+        except ImportError as e:
+            logger.warning("Tracing exporter '%s' unavailable: %s", name, e)
+            continue
+        if port and name == "prometheus":
+            try:
+                exporter.serve(int(port))
+                logger.info("Serving Prometheus metrics on :%s/metrics", port)
+            except (ValueError, OSError) as e:
+                logger.warning("Could not serve Prometheus metrics on '%s': %s", port, e)
+        elif port:
+            logger.warning("Tracing exporter '%s' takes no port", name)
+    return list(_exporters)
@@ -0,0 +1,221 @@
+import hashlib, json, os, pickle, shutil, threading
+from langchain_community.vectorstores import FAISS
+
+# ---------------------------
+# Incremental FAISS index
+# ---------------------------
+def document_hash(chunks):
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk.page_content.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def assign_chunk_ids(chunks, counters=None):
+    # Number chunks per document so ids stay stable when other files change.
+    # Pass the same `counters` dict across calls when splitting page by page.
+    counters = {} if counters is None else counters
+    for chunk in chunks:
+        doc_name = chunk.metadata.get("source", "unknown")
+        idx = counters.get(doc_name, 0)
+        chunk.metadata["chunk_id"] = f"{doc_name}_{idx}"
+        counters[doc_name] = idx + 1
+    return chunks
+
+
+def folder_snapshot(folder_path="uploads"):
+    """Size and mtime of every loadable file, used to tell whether a saved index is stale."""
+    snapshot = {}
+    if not os.path.isdir(folder_path):
+        return snapshot
+    for filename in sorted(os.listdir(folder_path)):
+        if filename.endswith((".pdf", ".txt")):
+            stat = os.stat(os.path.join(folder_path, filename))
+            snapshot[filename] = {"size": stat.st_size, "mtime": stat.st_mtime}
+    return snapshot
+
+
+def embeddings_id(embeddings):
+    return getattr(embeddings, "model", None) or getattr(embeddings, "model_name", None) or type(embeddings).__name__
+
+
+def group_by_source(chunks):
+    groups = {}
+    for chunk in chunks:
+        groups.setdefault(chunk.metadata.get("source", "unknown"), []).append(chunk)
+    return groups
+
+
+class VectorIndexManager:
+    """
+    Keeps one FAISS store up to date document by document. For every document it
+    remembers the vector ids of its chunks and a hash of their text, so only new
+    or changed documents are embedded and deleted documents have their vectors
+    removed.
+    """
+
+    def __init__(self, embeddings):
+        self.embeddings = embeddings
+        self.vectorstore = None
+        self.doc_chunks = {}   # doc_name -> [vector ids]
+        self.doc_hashes = {}   # doc_name -> hash of chunk texts
+        self.streaming = {}    # doc_name -> running hash while chunks arrive in batches
+        self.lock = threading.Lock()
+
+    def __contains__(self, doc_name):
+        return doc_name in self.doc_chunks
+
+    def upsert_document(self, doc_name, chunks):
+        """Embeds `chunks` for `doc_name` unless they are unchanged; returns the number embedded."""
+        digest = document_hash(chunks)
+        if self.doc_hashes.get(doc_name) == digest:
+            return 0
+
+        self.delete_document(doc_name)
+        ids = [chunk.metadata.get("chunk_id") or f"{doc_name}_{i}" for i, chunk in enumerate(chunks)]
+        if self.vectorstore is None:
+            self.vectorstore = FAISS.from_documents(chunks, self.embeddings, ids=ids)
+        else:
+            self.vectorstore.add_documents(chunks, ids=ids)
+        self.doc_chunks[doc_name] = ids
+        self.doc_hashes[doc_name] = digest
+        return len(ids)
+
+    def update(self, chunks):
+        """Upserts every document present in `chunks`; returns the number of chunks embedded."""
+        embedded = 0
+        for doc_name, doc_chunks in group_by_source(chunks).items():
+            embedded += self.upsert_document(doc_name, doc_chunks)
+        return embedded
+
+    def add_embedded(self, chunks, vectors):
+        """
+        Adds already-embedded chunks as they stream in. The first batch of a document
+        replaces any vectors it had; call finish_streaming() once all batches are in.
+        """
+        with self.lock:
+            by_doc = {}
+            for chunk, vector in zip(chunks, vectors):
+                by_doc.setdefault(chunk.metadata.get("source", "unknown"), []).append((chunk, vector))
+
+            for doc_name, pairs in by_doc.items():
+                if doc_name not in self.streaming:
+                    self.delete_document(doc_name)
+                    self.streaming[doc_name] = hashlib.sha256()
+                    self.doc_chunks[doc_name] = []
+
+                offset = len(self.doc_chunks[doc_name])
+                ids = [chunk.metadata.get("chunk_id") or f"{doc_name}_{offset + i}" for i, (chunk, _) in enumerate(pairs)]
+                text_embeddings = [(chunk.page_content, vector) for chunk, vector in pairs]
+                metadatas = [chunk.metadata for chunk, _ in pairs]
+                if self.vectorstore is None:
+                    self.vectorstore = FAISS.from_embeddings(text_embeddings, self.embeddings, metadatas=metadatas, ids=ids)
+                else:
+                    self.vectorstore.add_embeddings(text_embeddings, metadatas=metadatas, ids=ids)
+
+                for chunk, _ in pairs:
+                    self.streaming[doc_name].update(chunk.page_content.encode("utf-8"))
+                    self.streaming[doc_name].update(b"\0")
+                self.doc_chunks[doc_name].extend(ids)
+
+    def finish_streaming(self):
+        with self.lock:
+            for doc_name, digest in self.streaming.items():
+                self.doc_hashes[doc_name] = digest.hexdigest()
+            self.streaming = {}
+
+    def abort_streaming(self):
+        """Drops documents whose batches were still streaming, so they are embedded again next time."""
+        with self.lock:
+            for doc_name in self.streaming:
+                self.delete_document(doc_name)
+            self.streaming = {}
+
+    def delete_document(self, doc_name):
+        ids = self.doc_chunks.pop(doc_name, None)
+        self.doc_hashes.pop(doc_name, None)
+        if ids and self.vectorstore is not None:
+            self.vectorstore.delete(ids)
+        return len(ids or [])
+
+    def reset(self):
+        self.vectorstore = None
+        self.doc_chunks = {}
+        self.doc_hashes = {}
+        self.streaming = {}
+
+    # ---------------------------
+    # Persistence
+    # ---------------------------
+    def save(self, root, files, keep=2):
+        """
+        Writes the index, docstore and a manifest to a new `root/vNNNN` directory,
+        points `root/CURRENT` at it and prunes all but the newest `keep` versions.
+        """
+        os.makedirs(root, exist_ok=True)
+        versions = sorted(d for d in os.listdir(root) if d.startswith("v") and d[1:].isdigit())
+        version = f"v{int(versions[-1][1:]) + 1 if versions else 1:04d}"
+        path = os.path.join(root, version)
+        os.makedirs(path)
+
+        if self.vectorstore is not None:
+            self.vectorstore.save_local(path)
+        manifest = {
+            "version": version,
+            "embeddings": embeddings_id(self.embeddings),
+            "files": files,
+            "docs": {name: {"ids": ids, "hash": self.doc_hashes[name]} for name, ids in self.doc_chunks.items()},
+        }
+        with open(os.path.join(path, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+        # Swap the pointer atomically so readers never see a half-written version
+        tmp_pointer = os.path.join(root, "CURRENT.tmp")
+        with open(tmp_pointer, "w", encoding="utf-8") as f:
+            f.write(version)
+        os.replace(tmp_pointer, os.path.join(root, "CURRENT"))
+
+        for old in (versions + [version])[:-keep]:
+            shutil.rmtree(os.path.join(root, old), ignore_errors=True)
+        print(f"💾 Saved vector index {version} ({len(self.doc_chunks)} documents)")
+        return path
+
+    def load(self, root, files, mmap=True):
+        """
+        Loads the version named in `root/CURRENT` if its manifest matches `files`
+        and the current embeddings model. Returns False when the caller should
+        rebuild instead.
+        """
+        try:
+            with open(os.path.join(root, "CURRENT"), encoding="utf-8") as f:
+                path = os.path.join(root, f.read().strip())
+            with open(os.path.join(path, "manifest.json"), encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if manifest["files"] != files or manifest["embeddings"] != embeddings_id(self.embeddings):
+            print("♻️ Saved vector index is out of date, rebuilding")
+            return False
+        if not manifest["docs"]:
+            return False
+
+        self.vectorstore = self._load_faiss(path, mmap)
+        self.doc_chunks = {name: doc["ids"] for name, doc in manifest["docs"].items()}
+        self.doc_hashes = {name: doc["hash"] for name, doc in manifest["docs"].items()}
+        print(f"📂 Loaded vector index {manifest['version']} ({len(self.doc_chunks)} documents)")
+        return True
+
+    def _load_faiss(self, path, mmap):
+        if mmap:
+            try:
+                import faiss
+                # Memory-mapped read where the index type supports it; plain read otherwise
+                index = faiss.read_index(os.path.join(path, "index.faiss"), faiss.IO_FLAG_MMAP)
+                with open(os.path.join(path, "index.pkl"), "rb") as f:
+                    docstore, index_to_docstore_id = pickle.load(f)
+                return FAISS(self.embeddings, index, docstore, index_to_docstore_id)
+            except Exception as e:
+                print(f"⚠️ Memory-mapped load failed, falling back to load_local: {e}")
+        return FAISS.load_local(path, self.embeddings, allow_dangerous_deserialization=True)